@@ -1,102 +1,266 @@
-from typing import Dict, Any
+"""
+business_map.py
+
+ASCII map of the business for the CLI and the GUI map dialog.
+
+The map is a grid of rooms laid out by config.BUSINESS_MAP_LAYOUT. Each kind of
+room has a key method, which picks the few state values the room shows, and a
+cell method, which turns those values into lines of text and a CLI color.
+BusinessMap keeps each room's last key and text, and refresh() re-renders only
+the rooms whose key changed. A row of the map is rebuilt only when one of its
+rooms changed, and the whole map only when a row did. The plain and colored
+variants are built from the same cached cells, and the status block is cached
+the same way.
+"""
+
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
 from colorama import Fore, Style
+import config
+
+Key = Tuple[Any, ...]
+Position = Tuple[int, int] # (row, column) in the layout
+
+MAP_COLOR = Fore.CYAN # Frame and rooms without a color of their own
+TITLE = "BUSINESS TYCOON"
+
+
+class _Room:
+    """Cached rendering of one map cell."""
+
+    __slots__ = ("kind", "key_fn", "cell_fn", "key", "lines", "color", "version", "box_version", "box_height", "box")
+
+    def __init__(self, kind: str, key_fn: Callable[[Any], Key], cell_fn: Callable[[Key], Tuple[List[str], str]]):
+        self.kind = kind # Room kind without its ":N" argument ("" for a gap)
+        self.key_fn = key_fn
+        self.cell_fn = cell_fn
+        self.key: Optional[Key] = None
+        self.lines: List[str] = []
+        self.color = MAP_COLOR
+        self.version = 0
+        self.box_version = -1
+        self.box_height = -1
+        self.box: Tuple[List[str], List[str]] = ([], []) # Plain and colored box lines for box_version at box_height
+
 
 class BusinessMap:
-    def __init__(self, game_state: Dict[str, Any]):
+    """Cell-based business map; only rooms whose underlying state changed are re-rendered."""
+
+    def __init__(self, game_state: Any, layout: Optional[Sequence[Sequence[str]]] = None,
+                 cell_width: Optional[int] = None, employee_slots: Optional[int] = None):
         self.game_state = game_state
+        self.layout = [list(row) for row in (layout if layout is not None else config.BUSINESS_MAP_LAYOUT)]
+        self.cell_width = cell_width if cell_width is not None else config.BUSINESS_MAP_CELL_WIDTH
+        self.employee_slots = employee_slots if employee_slots is not None else config.BUSINESS_MAP_EMPLOYEE_SLOTS
+        columns = max((len(row) for row in self.layout), default=0)
+        self.inner_width = max(len(TITLE), columns * (self.cell_width + 3) - 1)
+        self.rooms: Dict[Position, _Room] = {}
+        for row, kinds in enumerate(self.layout):
+            for column, kind in enumerate(kinds):
+                self.rooms[(row, column)] = self._make_room(kind)
+        self.renders = 0 # Rooms rendered so far, for profiling
+        self._rows: Dict[int, Tuple[Tuple[int, ...], List[str], List[str]]] = {} # row -> (room versions, plain, colored)
+        self._maps: Dict[bool, Tuple[Tuple[int, ...], str]] = {} # colored? -> (room versions, map text)
+        self._status: Dict[bool, Tuple[Key, str]] = {} # colored? -> (status key, status text)
+
+    def _make_room(self, kind: str) -> _Room:
+        if not kind:
+            return _Room("", lambda state: (), lambda key: ([], ""))
+        name, _, argument = kind.partition(":")
+        key_fn = getattr(self, f"_{name}_key", None)
+        cell_fn = getattr(self, f"_{name}_cell", None)
+        if key_fn is None or cell_fn is None:
+            raise ValueError(f"Unknown business map room: {kind!r}")
+        if argument:
+            number = int(argument)
+            return _Room(name, lambda state: key_fn(state, number), cell_fn)
+        return _Room(name, key_fn, cell_fn)
+
+    # --- Rooms: key (what the room shows) and cell (how it shows it) ---
+    def _office_key(self, state: Any) -> Key:
+        return (state.day, len(state.company))
+
+    def _office_cell(self, key: Key) -> Tuple[List[str], str]:
+        day, branches = key
+        return ["Office", f"Day {day}"] + ([f"+{branches} branch"] if branches else []), MAP_COLOR
+
+    def _storage_key(self, state: Any) -> Key:
+        return (state.inventory.total_units(), state.storage_capacity)
+
+    def _storage_cell(self, key: Key) -> Tuple[List[str], str]:
+        used, capacity = key
+        color = Fore.RED if used >= capacity else Fore.YELLOW if used >= capacity * 0.8 else Fore.GREEN
+        return ["Storage", f"{used}/{capacity}"], color
+
+    def _market_key(self, state: Any) -> Key:
+        trend = state.market_trend
+        outlook = "Booming" if trend > config.MARKET_BOOM_THRESHOLD else "Declining" if trend < config.MARKET_DECLINE_THRESHOLD else "Steady"
+        return (outlook, round(state.current_market_demand, 2))
+
+    def _market_cell(self, key: Key) -> Tuple[List[str], str]:
+        outlook, demand = key
+        color = {"Booming": Fore.GREEN, "Declining": Fore.RED}.get(outlook, MAP_COLOR)
+        return ["Market", outlook, f"x{demand:.2f}"], color
+
+    def _research_key(self, state: Any) -> Key:
+        return (state.active_research_project, state.research_progress)
+
+    def _research_cell(self, key: Key) -> Tuple[List[str], str]:
+        project, progress = key
+        spec = config.RESEARCH_PROJECTS_SPECS.get(project) if project else None
+        if spec is None:
+            return ["Research", "Idle"], MAP_COLOR
+        return ["Research", spec["name"], f"{progress}/{spec['duration']} days"], Fore.MAGENTA
+
+    def _employees_key(self, state: Any) -> Key:
+        return (len(state.employees),)
+
+    def _employees_cell(self, key: Key) -> Tuple[List[str], str]:
+        count, = key
+        if count > self.employee_slots:
+            return ["Employees", f"■ x{count}"], MAP_COLOR # Too many to draw one icon each
+        marks = ["■"] * count + ["□"] * (self.employee_slots - count)
+        per_line = max(1, (self.cell_width + 1) // 2)
+        return ["Employees"] + [" ".join(marks[i:i + per_line]) for i in range(0, len(marks), per_line)], MAP_COLOR
+
+    def _upgrades_key(self, state: Any) -> Key:
+        upgrades = state.upgrades
+        return (bool(upgrades['automation']), upgrades['marketing'], upgrades['storage'])
+
+    def _upgrades_cell(self, key: Key) -> Tuple[List[str], str]:
+        automation, marketing, storage = key
+        status = (["AUTO"] if automation else []) + ([f"MKT {marketing}"] if marketing > 0 else []) + \
+                 ([f"STR {storage}"] if storage > 0 else [])
+        return ["Upgrades"] + (status or ["NONE"]), MAP_COLOR
+
+    def _branch_key(self, state: Any, number: int) -> Key:
+        branches = state.company.branches
+        if number > len(branches):
+            return (number,)
+        branch = branches[number - 1]
+        return (number, branch.name, branch.inventory.total_units(), len(branch.employees), round(branch.reputation))
+
+    def _branch_cell(self, key: Key) -> Tuple[List[str], str]:
+        if len(key) == 1:
+            return [f"Lot {key[0]}", "(vacant)"], Style.DIM
+        _, name, units, staff, reputation = key
+        return [name, f"{units} units", f"{staff} staff", f"Rep {reputation}"], Fore.GREEN
+
+    # --- Rendering ---
+    def refresh(self) -> List[Position]:
+        """Re-render the rooms whose state changed since the last call; returns their positions."""
+        changed = []
+        state = self.game_state
+        for position, room in self.rooms.items():
+            key = room.key_fn(state)
+            if key != room.key:
+                room.key = key
+                room.lines, room.color = room.cell_fn(key)
+                room.version += 1
+                self.renders += 1
+                changed.append(position)
+        return changed
+
+    def cell(self, position: Position) -> Tuple[List[str], str]:
+        """The cached lines and CLI color of the room at `position` (as of the last refresh)."""
+        room = self.rooms[position]
+        return room.lines, room.color
+
+    def _box(self, room: _Room, height: int) -> Tuple[List[str], List[str]]:
+        if room.box_version != room.version or room.box_height != height:
+            width = self.cell_width
+            if room.key == ():
+                plain = [" " * (width + 2)] * (height + 2)
+                room.box = (plain, plain)
+            else:
+                body = [f"│{line[:width]:<{width}}│" for line in room.lines]
+                body += [f"│{'':{width}}│"] * (height - len(body))
+                plain = [f"┌{'─' * width}┐"] + body + [f"└{'─' * width}┘"]
+                room.box = (plain, [f"{room.color}{line}{Style.RESET_ALL}" for line in plain])
+            room.box_version, room.box_height = room.version, height
+        return room.box
+
+    def _row_lines(self, row: int) -> Tuple[List[str], List[str]]:
+        rooms = [self.rooms[(row, column)] for column in range(len(self.layout[row]))]
+        versions = tuple(room.version for room in rooms)
+        cached = self._rows.get(row)
+        if cached is not None and cached[0] == versions:
+            return cached[1], cached[2]
+        height = max((len(room.lines) for room in rooms), default=0)
+        boxes = [self._box(room, height) for room in rooms]
+        plain, colored = [], []
+        for line in range(height + 2):
+            text = " ".join(box[0][line] for box in boxes)
+            padding = " " * (self.inner_width - len(text))
+            plain.append(f"│ {text}{padding} │")
+            colored.append(f"{MAP_COLOR}│ {Style.RESET_ALL}" + " ".join(box[1][line] for box in boxes) +
+                           f"{padding}{MAP_COLOR} │{Style.RESET_ALL}")
+        self._rows[row] = (versions, plain, colored)
+        return plain, colored
+
+    def _render_map(self, colored: bool) -> str:
+        self.refresh()
+        versions = tuple(room.version for room in self.rooms.values())
+        cached = self._maps.get(colored)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+        width = self.inner_width + 2
+        frame = lambda line: f"{MAP_COLOR}{line}{Style.RESET_ALL}" if colored else line
+        lines = [frame(f"┌{'─' * width}┐"), frame(f"│{TITLE:^{width}}│"), frame(f"├{'─' * width}┤")]
+        for row in range(len(self.layout)):
+            if row:
+                lines.append(frame(f"│{'':{width}}│"))
+            lines.extend(self._row_lines(row)[1 if colored else 0])
+        lines.append(frame(f"└{'─' * width}┘"))
+        text = "\n" + "\n".join(lines)
+        self._maps[colored] = (versions, text)
+        return text
 
     def generate_map(self) -> str:
-        """Generate the ASCII map with current game state."""
-        map_template = """
-┌──────────────────────────┐
-│     BUSINESS TYCOON      │
-├──────────────────────────┤
-│┌─────────┐  ┌─────────┐ │
-││{office:<9}│  │{storage:<9}│ │
-│└─────────┘  └─────────┘ │
-│                         │
-│┌─────────┐  ┌─────────┐ │
-││{market:<9}│  │{research:<9}│ │
-│└─────────┘  └─────────┘ │
-│                         │
-│ {employees:<11} ┌─────────┐ │
-│ Employees    │{upgrades:<9}│ │
-│              └─────────┘ │
-└──────────────────────────┘"""
-        return map_template.format(
-            office=self.get_office_status(),
-            storage=self.get_storage_status(),
-            market=self.get_market_status(),
-            research=self.get_research_status(),
-            employees=self.get_employees_status(),
-            upgrades=self.get_upgrades_status()
-        )
-
-    def get_office_status(self) -> str:
-        """Get the office status display."""
-        return "Office"
-
-    def get_storage_status(self) -> str:
-        """Get the storage status with capacity."""
-        used = sum(self.game_state['inventory'].values())
-        capacity = self.game_state['storage_capacity']
-        return f"{used}/{capacity}"
-
-    def get_market_status(self) -> str:
-        """Get the market status display."""
-        return "Market"
-
-    def get_research_status(self) -> str:
-        """Get the research status display."""
-        return "Research"
-
-    def get_employees_status(self) -> str:
-        """Get the employee status with icons."""
-        count = len(self.game_state['employees'])
-        return "■ " * count + "□ " * (3 - count)  # Max 3 employees
-
-    def get_upgrades_status(self) -> str:
-        """Get the upgrades status display."""
-        upgrades = self.game_state['upgrades']
-        status = []
-        if upgrades['automation']:
-            status.append("AUTO")
-        if upgrades['marketing'] > 0:
-            status.append(f"MKT {upgrades['marketing']}")
-        if upgrades['storage'] > 0:
-            status.append(f"STR {upgrades['storage']}")
-        return "\n".join(status) if status else "NONE"
+        """Return the plain ASCII map for the current game state."""
+        return self._render_map(colored=False)
 
-    def get_map_with_status(self) -> str:
-        """Return the map with additional status information."""
-        map_art = self.generate_map()
-        status = f"""
+    def _status_block(self, colored: bool) -> str:
+        state = self.game_state
+        key = (state.day, state.money, state.reputation, state.loan, state.inventory.total_units(), state.storage_capacity,
+               len(state.employees), bool(state.upgrades['automation']), state.upgrades['marketing'])
+        cached = self._status.get(colored)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        day, money, reputation, loan, used, capacity, employees, automation, marketing = key
+        if colored:
+            reset = Style.RESET_ALL
+            status = f"""
+{Fore.CYAN}Current Status:{reset}
+--------------
+Day: {day}
+Money: {Fore.GREEN}${money}{reset}
+Reputation: {Fore.YELLOW}{reputation}{reset}
+Loan: {Fore.RED}${loan}{reset}
+
+Storage Usage: {used}/{capacity}
+Employees: {employees}
+Automation: {Fore.GREEN if automation else Fore.RED}{"Enabled" if automation else "Disabled"}{reset}
+Marketing Level: {marketing}"""
+        else:
+            status = f"""
 Current Status:
 --------------
-Day: {self.game_state['day']}
-Money: ${self.game_state['money']}
-Reputation: {self.game_state['reputation']}
-Loan: ${self.game_state.get('loan', 0)}
+Day: {day}
+Money: ${money}
+Reputation: {reputation}
+Loan: ${loan}
 
-Storage Usage: {sum(self.game_state['inventory'].values())}/{self.game_state['storage_capacity']}
-Employees: {len(self.game_state['employees'])}
-Automation: {"Enabled" if self.game_state['upgrades']['automation'] else "Disabled"}
-Marketing Level: {self.game_state['upgrades']['marketing']}"""
-        return f"{map_art}{status}"
+Storage Usage: {used}/{capacity}
+Employees: {employees}
+Automation: {"Enabled" if automation else "Disabled"}
+Marketing Level: {marketing}"""
+        self._status[colored] = (key, status)
+        return status
+
+    def get_map_with_status(self) -> str:
+        """Return the map with additional status information."""
+        return self.generate_map() + self._status_block(colored=False)
 
     def get_cli_colored_map(self) -> str:
         """Return the map with colorama colors for CLI display."""
-        map_art = self.generate_map()
-        status = f"""
-{Fore.CYAN}Current Status:{Style.RESET_ALL}
---------------
-Day: {self.game_state['day']}
-Money: {Fore.GREEN}${self.game_state['money']}{Style.RESET_ALL}
-Reputation: {Fore.YELLOW}{self.game_state['reputation']}{Style.RESET_ALL}
-Loan: {Fore.RED}${self.game_state.get('loan', 0)}{Style.RESET_ALL}
-
-Storage Usage: {sum(self.game_state['inventory'].values())}/{self.game_state['storage_capacity']}
-Employees: {len(self.game_state['employees'])}
-Automation: {Fore.GREEN if self.game_state['upgrades']['automation'] else Fore.RED}{"Enabled" if self.game_state['upgrades']['automation'] else "Disabled"}{Style.RESET_ALL}
-Marketing Level: {self.game_state['upgrades']['marketing']}"""
-        return f"{Fore.CYAN}{map_art}{Style.RESET_ALL}{status}" 
\ No newline at end of file
+        return self._render_map(colored=True) + self._status_block(colored=True)
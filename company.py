@@ -0,0 +1,330 @@
+"""
+company.py
+
+Multi-location companies.
+
+A Company owns any number of Branches. Each branch has its own lot inventory,
+storage capacity, workforce, local demand and reputation, and runs a bulk
+work order every day. BranchTickScheduler advances every branch by one day.
+For very large companies it splits the branches into contiguous partitions,
+one per worker process. Each worker keeps its partition between ticks, so a
+tick only sends the day out and the small per-branch results back. The
+branches come back to the main process only when the company needs them
+(opening, closing or hiring at a branch, saving).
+
+Company-level totals (stock, staff, payroll, storage, reputation, income) are
+kept up to date from the per-branch deltas each tick returns, so reading them
+never walks the branches. Branch randomness is keyed on (seed, branch_id,
+day), so a tick gives the same result in-process and in a worker.
+"""
+
+import multiprocessing
+import random
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+import config
+from inventory import LotInventory
+from workforce import Workforce
+from work_rules import work_units
+
+TOTAL_FIELDS = ("units", "employees", "payroll", "storage_capacity", "reputation")
+
+
+class Branch:
+    """One location: its own inventory, storage, staff, local demand and reputation."""
+
+    def __init__(self, branch_id: int, name: str, day: int = 0):
+        self.branch_id = branch_id
+        self.name = name
+        self.opened_day = day
+        self.inventory = LotInventory(config.SUPPLY_PRICES.keys())
+        self.storage_capacity = config.BRANCH_STORAGE_CAPACITY
+        self.employees = Workforce()
+        self.local_demand = 1.0
+        self.reputation = float(config.INITIAL_REPUTATION)
+        self.daily_units = config.BRANCH_DAILY_WORK_UNITS
+        self.reorder_point = config.BRANCH_REORDER_POINT
+        self.reorder_units = config.BRANCH_REORDER_UNITS
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The values this branch contributes to the company totals."""
+        return {
+            "units": sum(self.inventory.values()),
+            "employees": len(self.employees),
+            "payroll": self.employees.daily_payroll(),
+            "storage_capacity": self.storage_capacity,
+            "reputation": self.reputation,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "branch_id": self.branch_id, "name": self.name, "opened_day": self.opened_day,
+            "inventory_lots": self.inventory.to_dict(), "storage_capacity": self.storage_capacity,
+            "employees": self.employees.to_list(), "local_demand": self.local_demand,
+            "reputation": self.reputation, "daily_units": self.daily_units,
+            "reorder_point": self.reorder_point, "reorder_units": self.reorder_units,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Branch":
+        branch = cls(data["branch_id"], data["name"], data.get("opened_day", 0))
+        branch.inventory = LotInventory.from_dict(data.get("inventory_lots", {}), config.SUPPLY_PRICES.keys())
+        branch.storage_capacity = data.get("storage_capacity", branch.storage_capacity)
+        branch.employees = Workforce.from_list(data.get("employees", []))
+        branch.local_demand = data.get("local_demand", 1.0)
+        branch.reputation = data.get("reputation", branch.reputation)
+        branch.daily_units = data.get("daily_units", branch.daily_units)
+        branch.reorder_point = data.get("reorder_point", branch.reorder_point)
+        branch.reorder_units = data.get("reorder_units", branch.reorder_units)
+        return branch
+
+
+def tick_branch(branch: Branch, day: int, market_demand: float, seed: int,
+                automation_bonus: float = 1.0, rep_loss_reduction: int = 0) -> Dict[str, Any]:
+    """
+    Advance one branch by one day and return its cash flow and the change in its totals.
+
+    The branch drifts its local demand, restocks basic supplies when stock falls to the
+    reorder point, works through up to daily_units supplies under the same rules as the
+    main location (work_rules.work_units, with the owner's automation bonus and marketing
+    reduction) and pays its staff.
+    """
+    rng = np.random.default_rng([seed, branch.branch_id, day])
+    before = branch.snapshot()
+
+    drift = rng.uniform(-config.BRANCH_DEMAND_DRIFT, config.BRANCH_DEMAND_DRIFT)
+    branch.local_demand = float(np.clip(branch.local_demand + drift, config.MARKET_TREND_MIN, config.MARKET_TREND_MAX))
+
+    purchases = 0
+    stock = before["units"]
+    if stock <= branch.reorder_point:
+        restock = min(branch.reorder_units, branch.storage_capacity - stock)
+        if restock > 0:
+            unit_cost = config.SUPPLY_PRICES["basic_supplies"]
+            branch.inventory.add("basic_supplies", restock, unit_cost, day)
+            purchases = restock * unit_cost
+            stock += restock
+
+    units = min(branch.daily_units, stock)
+    income = 0
+    cogs = 0
+    if units > 0:
+        employee_bonus = 1 + branch.employees.productivity() * config.EMPLOYEE_PRODUCTIVITY_BONUS_PER_EMPLOYEE
+        worked = work_units(branch.inventory, units, (market_demand, branch.local_demand, automation_bonus, employee_bonus),
+                            rep_loss_reduction, rng)
+        units, income, cogs = worked["units"], worked["income"], worked["cogs"]
+        branch.reputation -= worked["reputation_loss"]
+    branch.reputation = min(100.0, max(0.0, branch.reputation + config.BRANCH_DAILY_REPUTATION_RECOVERY))
+
+    payroll = branch.employees.daily_payroll()
+    after = branch.snapshot()
+    return {
+        "branch_id": branch.branch_id,
+        "units_worked": units,
+        "income": income,
+        "cogs": cogs,
+        "purchases": purchases,
+        "payroll": payroll,
+        "net": income - purchases - payroll,
+        "delta": {field: after[field] - before[field] for field in TOTAL_FIELDS},
+    }
+
+
+def _partition_worker(conn: Any, branches: List[Branch], seed: int) -> None:
+    """Worker process loop: owns one partition of branches and ticks it on request."""
+    while True:
+        message = conn.recv()
+        if message[0] == "tick":
+            _, day, market_demand, automation_bonus, rep_loss_reduction = message
+            conn.send([tick_branch(branch, day, market_demand, seed, automation_bonus, rep_loss_reduction)
+                       for branch in branches])
+        elif message[0] == "collect":
+            conn.send(branches)
+            return
+
+
+class Company:
+    """A set of branches plus company totals maintained from per-branch deltas."""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.branches: List[Branch] = []
+        self._positions: Dict[int, int] = {} # branch_id -> index into self.branches
+        self._next_branch_id = 1
+        self.totals: Dict[str, Any] = {field: 0 for field in TOTAL_FIELDS}
+        self.totals.update({"lifetime_income": 0, "lifetime_net": 0})
+        self._held_by: Optional["BranchTickScheduler"] = None # Set while worker processes hold the live branches
+
+    def __len__(self) -> int:
+        return len(self.branches)
+
+    @property
+    def reputation(self) -> float:
+        """Average branch reputation (0 with no branches)."""
+        return self.totals["reputation"] / len(self.branches) if self.branches else 0.0
+
+    def _add_totals(self, values: Dict[str, Any], sign: int = 1) -> None:
+        for field in TOTAL_FIELDS:
+            self.totals[field] += sign * values[field]
+
+    def sync(self) -> None:
+        """Bring the live branches back from worker processes, if they are out."""
+        if self._held_by is not None:
+            self._held_by.collect(self)
+
+    def get_branch(self, branch_id: int) -> Branch:
+        self.sync()
+        return self.branches[self._positions[branch_id]]
+
+    def open_branch(self, name: Optional[str] = None, day: int = 0) -> Branch:
+        self.sync()
+        branch_id = self._next_branch_id
+        self._next_branch_id += 1
+        branch = Branch(branch_id, name or f"Branch {branch_id}", day)
+        self._positions[branch_id] = len(self.branches)
+        self.branches.append(branch)
+        self._add_totals(branch.snapshot())
+        return branch
+
+    def close_branch(self, branch_id: int) -> bool:
+        """Close a branch in O(1) by swapping the last branch into its slot."""
+        self.sync()
+        position = self._positions.pop(branch_id, None)
+        if position is None:
+            return False
+        self._add_totals(self.branches[position].snapshot(), -1)
+        last = self.branches.pop()
+        if position < len(self.branches):
+            self.branches[position] = last
+            self._positions[last.branch_id] = position
+        return True
+
+    def hire_at(self, branch_id: int) -> None:
+        branch = self.get_branch(branch_id)
+        before = branch.snapshot()
+        branch.employees.hire()
+        self._apply_delta(before, branch.snapshot())
+
+    def _apply_delta(self, before: Dict[str, Any], after: Dict[str, Any]) -> None:
+        for field in TOTAL_FIELDS:
+            self.totals[field] += after[field] - before[field]
+
+    def apply_results(self, results: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Fold one tick's branch results into the totals and return the day's company cash flow."""
+        day_totals = {"income": 0, "cogs": 0, "purchases": 0, "payroll": 0, "net": 0, "units_worked": 0}
+        for result in results:
+            for key in day_totals:
+                day_totals[key] += result[key]
+            for field, change in result["delta"].items():
+                self.totals[field] += change
+        self.totals["lifetime_income"] += day_totals["income"]
+        self.totals["lifetime_net"] += day_totals["net"]
+        return day_totals
+
+    def recompute_totals(self) -> Dict[str, Any]:
+        """Walk every branch and rebuild the totals (for loading and consistency checks)."""
+        self.sync()
+        totals = {field: 0 for field in TOTAL_FIELDS}
+        for branch in self.branches:
+            for field, value in branch.snapshot().items():
+                totals[field] += value
+        self.totals.update(totals)
+        return totals
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Copies and pickles take the live branches, never the worker handles
+        self.sync()
+        state = self.__dict__.copy()
+        state["_held_by"] = None
+        return state
+
+    # --- Persistence ---
+    def to_dict(self) -> Dict[str, Any]:
+        self.sync()
+        return {
+            "seed": self.seed,
+            "next_branch_id": self._next_branch_id,
+            "lifetime_income": self.totals["lifetime_income"],
+            "lifetime_net": self.totals["lifetime_net"],
+            "branches": [branch.to_dict() for branch in self.branches],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Company":
+        company = cls(data.get("seed"))
+        company.branches = [Branch.from_dict(branch_data) for branch_data in data.get("branches", [])]
+        company._positions = {branch.branch_id: idx for idx, branch in enumerate(company.branches)}
+        company._next_branch_id = data.get("next_branch_id", len(company.branches) + 1)
+        company.recompute_totals()
+        company.totals["lifetime_income"] = data.get("lifetime_income", 0)
+        company.totals["lifetime_net"] = data.get("lifetime_net", 0)
+        return company
+
+
+class BranchTickScheduler:
+    """
+    Advances every branch of a company by one day.
+
+    With processes > 1 and at least processes * min_branches_per_process branches,
+    the branches are split into one contiguous partition per worker process and stay
+    there between ticks; otherwise they are ticked in-process.
+    """
+
+    def __init__(self, processes: Optional[int] = None, min_branches_per_process: Optional[int] = None):
+        self.processes = processes if processes is not None else config.COMPANY_TICK_PROCESSES
+        self.min_branches_per_process = (min_branches_per_process if min_branches_per_process is not None
+                                         else config.COMPANY_MIN_BRANCHES_PER_PROCESS)
+        self._workers: List[Tuple[Any, multiprocessing.Process]] = []
+
+    def _use_pool(self, branch_count: int) -> bool:
+        return self.processes > 1 and branch_count >= self.processes * self.min_branches_per_process
+
+    def tick(self, company: Company, day: int, market_demand: float,
+             automation_bonus: float = 1.0, rep_loss_reduction: int = 0) -> Dict[str, int]:
+        """Tick every branch for `day` and return the company's cash flow for the day."""
+        if not self._use_pool(len(company.branches)):
+            company.sync()
+            results = [tick_branch(branch, day, market_demand, company.seed, automation_bonus, rep_loss_reduction)
+                       for branch in company.branches]
+            return company.apply_results(results)
+
+        if company._held_by is not self:
+            company.sync()
+            self._distribute(company)
+        for conn, _ in self._workers:
+            conn.send(("tick", day, market_demand, automation_bonus, rep_loss_reduction))
+        results: List[Dict[str, Any]] = []
+        for conn, _ in self._workers:
+            results.extend(conn.recv())
+        return company.apply_results(results)
+
+    def _distribute(self, company: Company) -> None:
+        """Start one worker per contiguous partition of the company's branches."""
+        size = -(-len(company.branches) // self.processes)
+        for start in range(0, len(company.branches), size):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_partition_worker, daemon=True,
+                                              args=(child_conn, company.branches[start:start + size], company.seed))
+            process.start()
+            self._workers.append((parent_conn, process))
+        company._held_by = self
+
+    def collect(self, company: Company) -> None:
+        """Fetch the live branches back from the workers (in partition order) and stop them."""
+        branches: List[Branch] = []
+        for conn, _ in self._workers:
+            conn.send(("collect",))
+        for conn, process in self._workers:
+            branches.extend(conn.recv())
+            process.join()
+        self._workers = []
+        company.branches = branches
+        company._held_by = None
+
+    def close(self, company: Optional[Company] = None) -> None:
+        """Stop any workers, returning their branches to `company` first if given."""
+        if company is not None and company._held_by is self:
+            self.collect(company)
+        for conn, process in self._workers:
+            process.terminate()
+        self._workers = []
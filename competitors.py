@@ -0,0 +1,147 @@
+"""
+competitors.py
+
+Array-backed competitor population used by EventManager.
+
+Each competitor has a market share, an aggression level (0-1), cash and a
+strategy (index into config.COMPETITOR_EFFECTS, -1 for random actions). All
+per-day work - market pressure, share redistribution, cash flow and picking
+which competitor acts - is done with NumPy array operations, so a population
+of thousands of rivals costs about the same per day as the original two.
+"""
+
+import json
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import numpy as np
+import config
+
+ACTION_TYPES: Tuple[str, ...] = tuple(config.COMPETITOR_EFFECTS.keys())
+RANDOM_STRATEGY = -1
+
+
+class CompetitorPopulation:
+    """Parallel arrays describing every competitor in the market."""
+
+    def __init__(self, names: Sequence[str], market_share: Sequence[float], aggression: Sequence[float],
+                 cash: Sequence[float], strategy: Sequence[int]):
+        self.names: List[str] = list(names)
+        self.market_share = np.asarray(market_share, dtype=np.float64).copy()
+        self.aggression = np.clip(np.asarray(aggression, dtype=np.float64), 0.0, 1.0)
+        self.cash = np.asarray(cash, dtype=np.float64).copy()
+        self.strategy = np.asarray(strategy, dtype=np.int64).copy()
+        # Total share is preserved by redistribution, so demand only depends on this constant
+        self.total_share = float(self.market_share.sum())
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    # --- Construction ---
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> "CompetitorPopulation":
+        """Build a population from competitor dicts (config.COMPETITORS format)."""
+        return cls(
+            [r["name"] for r in records],
+            [r.get("market_share", 0.0) for r in records],
+            # "aggressive" is the legacy boolean field
+            [r.get("aggression", 1.0 if r.get("aggressive") else 0.0) for r in records],
+            [r.get("cash", 0.0) for r in records],
+            [_strategy_index(r.get("strategy")) for r in records]
+        )
+
+    @classmethod
+    def from_config(cls, rng: Optional[np.random.Generator] = None) -> "CompetitorPopulation":
+        """Build the population from config (or COMPETITORS_DATA_FILE) plus any generated rivals."""
+        if config.COMPETITORS_DATA_FILE:
+            with open(config.COMPETITORS_DATA_FILE, "r") as f:
+                population = cls.from_records(json.load(f))
+        else:
+            population = cls.from_records(config.COMPETITORS)
+        if config.COMPETITOR_GENERATED_COUNT > 0:
+            generated = cls.generate(config.COMPETITOR_GENERATED_COUNT, config.COMPETITOR_GENERATED_TOTAL_SHARE,
+                                     rng if rng is not None else np.random.default_rng())
+            population = population.concat(generated)
+        return population
+
+    @classmethod
+    def generate(cls, count: int, total_share: float, rng: np.random.Generator) -> "CompetitorPopulation":
+        """Generate count small rivals splitting total_share between them."""
+        shares = rng.dirichlet(np.ones(count)) * total_share
+        aggression = rng.beta(2.0, 5.0, size=count)
+        cash = rng.lognormal(mean=8.0, sigma=1.0, size=count)
+        strategy = rng.integers(RANDOM_STRATEGY, len(ACTION_TYPES), size=count)
+        names = [f"Rival #{i + 1}" for i in range(count)]
+        return cls(names, shares, aggression, cash, strategy)
+
+    def concat(self, other: "CompetitorPopulation") -> "CompetitorPopulation":
+        """Return a population containing both sets of competitors."""
+        return CompetitorPopulation(
+            self.names + other.names,
+            np.concatenate([self.market_share, other.market_share]),
+            np.concatenate([self.aggression, other.aggression]),
+            np.concatenate([self.cash, other.cash]),
+            np.concatenate([self.strategy, other.strategy])
+        )
+
+    # --- Daily update ---
+    def effective_aggression(self) -> np.ndarray:
+        """Aggression of competitors that can still fund it (broke competitors stop pushing)."""
+        return self.aggression * (self.cash > 0)
+
+    def market_pressure(self) -> float:
+        """Share-weighted market trend pressure from aggressive competitors."""
+        weighted = float(np.dot(self.effective_aggression(), self.market_share))
+        return config.AGGRESSIVE_COMPETITOR_MARKET_PRESSURE * weighted / config.COMPETITOR_REFERENCE_SHARE
+
+    def step(self) -> None:
+        """Advance one day: shift share toward aggressive competitors and update cash."""
+        if not self.names or self.total_share <= 0:
+            return
+        active_aggression = self.effective_aggression()
+        mean_aggression = float(np.dot(active_aggression, self.market_share)) / self.total_share
+        self.market_share *= 1.0 + config.COMPETITOR_SHARE_SHIFT_RATE * (active_aggression - mean_aggression)
+        self.market_share *= self.total_share / self.market_share.sum()
+        self.cash += (self.market_share * config.COMPETITOR_DAILY_REVENUE_PER_SHARE
+                      - active_aggression * config.COMPETITOR_DAILY_AGGRESSION_COST)
+
+    def draw_actions(self, days: int, rng: np.random.Generator) -> List[Optional[Dict[str, str]]]:
+        """Draw competitor actions for the next `days` days in one vectorized pass."""
+        return self.actions_from_uniforms(rng.random(days), rng.random(days), rng.random(days))
+
+    def actions_from_uniforms(self, act_rolls: np.ndarray, pick_rolls: np.ndarray,
+                              action_rolls: np.ndarray) -> List[Optional[Dict[str, str]]]:
+        """
+        Turn per-day uniform rolls into competitor actions.
+        A day has an action when its act roll is below COMPETITOR_ACTION_CHANCE; the acting
+        competitor is picked in proportion to market share among competitors with cash.
+        """
+        acts = act_rolls < config.COMPETITOR_ACTION_CHANCE
+        weights = self.market_share * (self.cash > 0)
+        cumulative = np.cumsum(weights)
+        if not self.names or cumulative[-1] <= 0:
+            return [None] * len(act_rolls)
+        picks = np.searchsorted(cumulative, pick_rolls * cumulative[-1], side="right")
+        picks = np.minimum(picks, len(self.names) - 1)
+        strategies = self.strategy[picks]
+        random_actions = np.minimum((action_rolls * len(ACTION_TYPES)).astype(np.int64), len(ACTION_TYPES) - 1)
+        action_idx = np.where(strategies == RANDOM_STRATEGY, random_actions, strategies)
+
+        actions: List[Optional[Dict[str, str]]] = []
+        for acted, pick, action in zip(acts.tolist(), picks.tolist(), action_idx.tolist()):
+            actions.append({"competitor": self.names[pick], "action": ACTION_TYPES[action]} if acted else None)
+        return actions
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Export the population as competitor dicts (config.COMPETITORS format)."""
+        return [
+            {"name": name, "market_share": float(share), "aggression": float(aggr), "cash": float(cash),
+             "strategy": ACTION_TYPES[strat] if strat != RANDOM_STRATEGY else None}
+            for name, share, aggr, cash, strat in zip(self.names, self.market_share, self.aggression,
+                                                      self.cash, self.strategy.tolist())
+        ]
+
+
+def _strategy_index(strategy: Optional[str]) -> int:
+    """Map a strategy name to its index in ACTION_TYPES (None means random actions)."""
+    if strategy is None:
+        return RANDOM_STRATEGY
+    return ACTION_TYPES.index(strategy)
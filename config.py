@@ -15,6 +15,28 @@ WIN_CONDITION_MONEY = 1000
 MAX_LOAN_TOTAL = 1000 # Overall cap on how much loan principal a player can have
 ANNUAL_LOAN_INTEREST_RATE = 0.10 # 10% annual
 
+# === Loan Products ===
+# Annual rate = ANNUAL_LOAN_INTEREST_RATE * difficulty loan_interest_modifier * rate_multiplier.
+# A term of 0 is an open credit line: interest is added to the balance daily and the player
+# repays whenever they like. Scheduled loans collect a payment from cash every
+# payment_interval_days and the remaining balance on the last day of the term.
+LOAN_PRODUCTS = {
+    "credit_line": {
+        "name": "Credit Line", "rate_multiplier": 1.0, "term_days": 0, "payment_interval_days": 0,
+        "description": "Repay any time. Interest is added to the balance daily."
+    },
+    "installment_loan": {
+        "name": "Installment Loan", "rate_multiplier": 0.9, "term_days": 28, "payment_interval_days": 7,
+        "description": "Four equal weekly payments are taken from your cash."
+    },
+    "term_loan": {
+        "name": "30-Day Term Loan", "rate_multiplier": 0.8, "term_days": 30, "payment_interval_days": 30,
+        "description": "Lowest rate. The full balance is taken from your cash on day 30."
+    }
+}
+DEFAULT_LOAN_PRODUCT = "credit_line"
+LOAN_PREVIEW_DAYS = 7 # Idle days simulated on a forked game state before a loan is confirmed
+
 # === Supplies ===
 # Prices player PAYS for supplies
 SUPPLY_PRICES = {
@@ -28,6 +50,9 @@ SUPPLY_USAGE_EFFECTS = {
     "premium_supplies": {"income_multiplier": 1.5, "description": "High-quality supplies, 50% income bonus."},
     "equipment": {"income_multiplier": 1.3, "description": "Reusable equipment, 30% income bonus per use."}
 }
+SUPPLY_CONSUMPTION_ORDER = ["premium_supplies", "basic_supplies", "equipment"] # Work uses the first type in stock
+INVENTORY_COSTING_METHOD = "fifo" # "fifo" (oldest lot's price) or "average" (running average cost)
+SUPPLY_SHELF_LIFE_DAYS = {} # e.g. {"basic_supplies": 30}; lots older than this spoil. Types not listed never spoil
 
 # === Work Action ===
 BASE_WORK_INCOME_MIN = 40
@@ -35,6 +60,8 @@ BASE_WORK_INCOME_MAX = 80
 REPUTATION_LOSS_WORK_MIN = 3
 REPUTATION_LOSS_WORK_MAX = 8
 
+WORK_BATCH_REPUTATION_FACTOR = 0.1 # Share of the summed per-unit reputation loss a bulk work order costs
+
 # === Rest Action ===
 BASE_REPUTATION_GAIN_REST = 10
 MARKETING_REST_BONUS_PER_LEVEL = 2
@@ -44,6 +71,20 @@ EMPLOYEE_HIRE_COST = 0 # Cost to hire (can be > 0 if we want a hiring fee)
 EMPLOYEE_DAILY_SALARY = 150
 EMPLOYEE_PRODUCTIVITY_BONUS_PER_EMPLOYEE = 0.4 # 40% boost per employee
 MAX_EMPLOYEES = 3 # Visual limit on map, can be a gameplay limit too
+EMPLOYEE_BASE_SKILL = 1.0 # Productivity multiplier of a new hire
+EMPLOYEE_SKILL_SPREAD = 0.0 # New hires get BASE_SKILL +/- up to this much; 0 makes every hire identical
+EMPLOYEE_BASE_MORALE = 1.0
+
+# === Branches (see company.py) ===
+BRANCH_OPEN_COST = 600
+BRANCH_STORAGE_CAPACITY = 50
+BRANCH_DAILY_WORK_UNITS = 5 # Supply units a branch works through each day
+BRANCH_REORDER_POINT = 5 # A branch restocks basic supplies when its stock falls to this
+BRANCH_REORDER_UNITS = 10
+BRANCH_DEMAND_DRIFT = 0.05 # Max daily change of a branch's local demand multiplier
+BRANCH_DAILY_REPUTATION_RECOVERY = 2.0
+COMPANY_TICK_PROCESSES = 0 # Worker processes for ticking branches; 0 or 1 ticks in-process
+COMPANY_MIN_BRANCHES_PER_PROCESS = 500 # Smaller companies are ticked in-process even if processes > 1
 
 # === Upgrades (Direct Purchases) ===
 # game_state.upgrades dictionary stores current level or boolean status
@@ -83,26 +124,57 @@ MARKET_BOOM_THRESHOLD = 1.2
 MARKET_DECLINE_THRESHOLD = 0.8
 
 SPECIAL_EVENT_CHANCE = 0.2 # Chance for a special event to occur each day (from EventManager)
+MARKET_ROLL_BLOCK_DAYS = 64 # Live market rolls are drawn from the EventManager's seed in blocks of this many days
+MARKET_TRAJECTORY_BLOCK_DAYS = 365 # Days generated per block by market_trajectory.MarketTrajectory
 
 COMPETITOR_ACTION_CHANCE = 0.3
 COMPETITOR_EFFECTS = {
-    "price_war": {"message_template": "{} started a price war!", "market_trend_effect": -0.2},
-    "marketing_campaign": {"message_template": "{} launched a major marketing campaign!", "market_trend_effect": -0.1},
-    "expansion": {"message_template": "{} expanded their business!", "market_trend_effect": -0.15}
+    "price_war": {"message_template": "{competitor} started a price war!", "market_trend_effect": -0.2},
+    "marketing_campaign": {"message_template": "{competitor} launched a major marketing campaign!", "market_trend_effect": -0.1},
+    "expansion": {"message_template": "{competitor} expanded their business!", "market_trend_effect": -0.15}
 }
 
+# Competitor population (see competitors.CompetitorPopulation)
+# aggression: 0.0-1.0; a fully aggressive competitor holding COMPETITOR_REFERENCE_SHARE of the
+#   market adds the full AGGRESSIVE_COMPETITOR_MARKET_PRESSURE each day (pressure is share-weighted).
+# strategy: a COMPETITOR_EFFECTS key the competitor always plays, or None for a random action.
+COMPETITORS = [
+    {"name": "SmallBiz Inc.", "market_share": 0.2, "aggression": 0.0, "cash": 5000, "strategy": None},
+    {"name": "MegaCorp", "market_share": 0.4, "aggression": 1.0, "cash": 20000, "strategy": None}
+]
+COMPETITORS_DATA_FILE = None # Optional JSON list of competitor entries replacing COMPETITORS
+COMPETITOR_REFERENCE_SHARE = 0.4
+COMPETITOR_GENERATED_COUNT = 0 # Extra small rivals generated on top of COMPETITORS
+COMPETITOR_GENERATED_TOTAL_SHARE = 0.2 # Market share split between the generated rivals
+COMPETITOR_SHARE_SHIFT_RATE = 0.002 # Daily share moved toward more aggressive competitors
+COMPETITOR_DAILY_REVENUE_PER_SHARE = 1000 # Cash a competitor earns per unit of market share per day
+COMPETITOR_DAILY_AGGRESSION_COST = 150 # Cash a fully aggressive competitor burns per day
+COMPETITOR_ACTION_BLOCK_DAYS = 64 # Competitor actions are drawn in blocks of this many days
+
 # EventManager Random Events (bonus, penalty, opportunity, employee_event)
+# Compiled once into alias samplers by event_sampler.EventTable.
+# "effect" selects how GameState applies the event (defaults to "type"), so data files can
+# add any number of new event types that reuse the four built-in effects.
+# If the chances sum to less than 1.0 the remainder means "no event"; above 1.0 they are
+# treated as relative weights.
 RANDOM_EVENT_TYPES_CHANCES = [
-    {"type": "bonus", "chance": 0.4, "min_amount": 20, "max_amount": 50},
-    {"type": "penalty", "chance": 0.3, "min_amount": 10, "max_amount": 30},
-    {"type": "opportunity", "chance": 0.2, "market_boost": 0.3},
-    {"type": "employee_event", "chance": 0.1}
+    {"type": "bonus", "chance": 0.4, "min_amount": 20, "max_amount": 50,
+     "message_template": "SPECIAL EVENT: You received a bonus of ${amount}!"},
+    {"type": "penalty", "chance": 0.3, "min_amount": 10, "max_amount": 30,
+     "message_template": "SPECIAL EVENT: You had to pay ${amount} in unexpected costs!"},
+    {"type": "opportunity", "chance": 0.2, "market_boost": 0.3,
+     "message_template": "SPECIAL EVENT: Market prices are especially favorable tomorrow!"},
+    {"type": "employee_event", "chance": 0.1,
+     "message_template": "SPECIAL EVENT: {message}"}
 ]
+# Employee sub-events are drawn uniformly unless an entry has a "chance" weight
 EMPLOYEE_SUB_EVENTS = [
     {"effect": "productivity_boost", "name": "High Morale", "value": 1.5, "duration": 2, "message": "Employee morale is high! Productivity boosted!"},
     {"effect": "productivity_drop", "name": "Employee Strike", "value": 0.5, "duration": 1, "message": "Employees are on strike! Productivity halved!"},
     {"effect": "training_pay", "name": "Training Seminar", "value": 1.2, "duration": 3, "message": "Employees attended a training seminar! Slightly boosted productivity."}
 ]
+# Optional JSON file with "random_events" and/or "employee_sub_events" lists replacing the tables above
+RANDOM_EVENTS_DATA_FILE = None
 
 # === Research Projects ===
 # Managed by EventManager, effects applied in GameState
@@ -132,9 +204,42 @@ RESEARCH_PROJECTS_SPECS = {
 }
 
 # === UI & Display ===
+UNDO_HISTORY_LIMIT = 200 # Undo steps kept; older steps are forgotten
+VIEW_UPDATE_MIN_INTERVAL = 0.05 # Seconds between batched status updates delivered to the GUI
+CLI_DIFF_SCREEN = False # CLI repaints only the changed status/menu lines in place (also: main.py --diff-screen)
+CLI_VERBOSITY = "full" # "full", "summary" or "quiet": how auto work/rest and waited days are reported (see day_summary.py)
+SUMMARY_INTERVAL_DAYS = 30 # "summary" verbosity prints an aggregated line at least this often
+SUMMARY_REPUTATION_ALERT = 20 # Below full verbosity, report at once when reputation falls under this
+GUI_HEARTBEAT_INTERVAL_MS = 100 # Lag monitor heartbeat; how late it fires is how long the mainloop was blocked
+GUI_LATENCY_WINDOW = 500 # Samples kept per lag monitor measurement
+GUI_LAG_OVERLAY_REFRESH_MS = 1000 # Lag overlay (F3) and lag log refresh period
+NOTIFICATION_LOG_CAPACITY = 500 # GUI notification feed keeps this many entries
+NOTIFICATION_AGGREGATE_LOOKBACK = 5 # Recent entries a repeated message can be folded into
+NOTIFICATION_VISIBLE_ROWS = 8 # Rows (label widgets) in the GUI notification feed
+# Business map rooms, row by row (see business_map.py). Rooms: "office", "storage", "market",
+# "research", "employees", "upgrades", and "branch:N" for the Nth open branch.
+BUSINESS_MAP_LAYOUT = [
+    ["office", "storage", "market"],
+    ["research", "employees", "upgrades"],
+    ["branch:1", "branch:2", "branch:3"],
+]
+BUSINESS_MAP_CELL_WIDTH = 11 # Inner width of a room, in characters
+BUSINESS_MAP_EMPLOYEE_SLOTS = 5 # Employee icons drawn on the map before it switches to a count
+GUI_MAP_FRAME_MS = 33 # The live GUI business map redraws at most once per frame of this length
 # (Could add CLI colors, GUI theme preferences here later)
 FIGLET_FONT = "slant"
 
+# === Scenario Regression Gate (see scenarios.py) ===
+SCENARIO_BASELINE_FILE = "scenario_baseline.json"
+SCENARIO_THROUGHPUT_TOLERANCE = 0.3 # Fail when days per calibration loop drops more than this fraction below the baseline
+SCENARIO_CALIBRATION_ITERATIONS = 300000 # Size of the fixed loop scenario throughput is measured against
+SCENARIO_LEDGER_CHECKS = 300 # Random loan ledgers checked for accrue_days and repay correctness before the scenarios run
+
+# === Profiling (see profiling.py) ===
+PROFILE_SAMPLE_INTERVAL = 0.001 # Seconds between call-stack samples for the collapsed-stack output
+MEMORY_TRACE_FRAMES = 25 # tracemalloc frames kept per allocation (enough to reach game code from library calls)
+MEMORY_GROWTH_FLAG_KIB = 256 # memory_report flags a subsystem that grew steadily by more than this
+
 # === For Future Difficulty Settings ===
 DIFFICULTY_LEVELS = {
     "easy": {
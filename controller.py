@@ -1,22 +1,44 @@
 import os
 import random
-from time import sleep
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Union
+
+from colorama import Fore, Style
 
 from game_state import GameState
 from view import View
-from game_events import EventManager
+from engine import GameEngine
+from history import UndoHistory
+from event_bus import EventBus
+from event_messages import EventMessage
+from day_summary import DaySummary, FULL, SUMMARY
+from profiling import phase, ACTION, RENDER
 import config
 
+# Main menu choices that change the game, with the label shown when they are undone
+UNDOABLE_CHOICES = {
+    "1": "buy supplies", "2": "work", "3": "manage employees", "4": "upgrades", "5": "loans",
+    "6": "rest", "9": "research", "10": "wait", "11": "bulk work order", "12": "branches"
+}
+
 class GameController:
     """Controller class in MVC architecture to handle game flow."""
     
-    def __init__(self, game_state: GameState, view: View):
+    def __init__(self, game_state: GameState, view: View, seed: Optional[int] = None, verbosity: Optional[str] = None):
         self.game_state = game_state
         self.view = view
-        self.event_manager = EventManager()
-        self.game_state.market_trend = self.event_manager.market_trend
+        self.engine = GameEngine(game_state, seed=seed)
+        self.event_manager = self.engine.event_manager
+        # Model changes reach the views through this bus instead of views polling the model
+        self.bus = EventBus(config.VIEW_UPDATE_MIN_INTERVAL)
+        self.game_state.bus = self.bus
+        self.event_manager.bus = self.bus
+        self.history = UndoHistory(self.engine)
         self.queued_next_day_action = None
+        self.resume_day = False # Set by undo/redo: the restored day's market is already set
+        # Below FULL verbosity, days the player does not act on (auto work/rest, waiting) are aggregated
+        self.verbosity = verbosity if verbosity is not None else config.CLI_VERBOSITY
+        self.day_summary = DaySummary(game_state)
+        self.suppressing = False # True while the current day's messages go to day_summary instead of the view
     
     def start_game(self) -> None:
         """Start the game and handle main game loop."""
@@ -26,25 +48,36 @@ class GameController:
             load_choice = self.view.get_input("Would you like to load your saved game? (y/n): ", ["y", "n"])
             if load_choice == "y":
                 if self.game_state.load_game():
+                    self.history.clear()
                     self.view.show_message("Game loaded successfully!", "success")
                 else:
                     self.view.show_message("Failed to load game.", "error")
         
         while not self.game_state.is_game_over():
-            market_data = self.event_manager.update_market()
-            self.game_state.market_trend = self.event_manager.market_trend
-            self.game_state.current_market_demand = market_data.get("market_demand", 1.0)
-            
-            self.view.display_status(self.game_state)
+            if self.resume_day:
+                market_data = self.engine.market_data
+                self.resume_day = False
+            else:
+                market_data = self.engine.begin_day()
+
+            # Auto work/rest days are summarized instead of shown when verbosity is below FULL
+            self.suppressing = self.verbosity != FULL and (
+                self.queued_next_day_action == 'rest' or
+                (self.queued_next_day_action == 'work' and sum(self.game_state.inventory.values()) > 0))
+            if not self.suppressing:
+                self.report_day_summary() # The player is back in control: report the aggregated days first
+                with phase(RENDER):
+                    self.view.display_status(self.game_state)
             
-            if market_data.get("market_message"):
-                self.view.display_market_message(market_data["market_message"])
+            market_message = market_data.get("market_message")
+            if market_message is not None:
+                if self.suppressing:
+                    self.day_summary.suppress()
+                else:
+                    self.view.display_market_message(market_message.text(), market_message.message_type)
             
-            if market_data.get("competitor_action"):
-                action_details = market_data["competitor_action"]
-                message, effect = self.event_manager.handle_competitor_action(action_details)
-                self.view.show_message(f"COMPETITOR NEWS: {message}", "warning")
-                self.game_state.apply_competitor_effect(effect)
+            if market_data.get("competitor_message") is not None:
+                self.say(market_data["competitor_message"])
             
             # --- QoL: Work/Rest Again logic --- 
             # If a repeat action was queued, this variable will be set in the *previous* iteration.
@@ -53,10 +86,11 @@ class GameController:
             # self.queued_next_day_action = None # Initialize in __init__
 
             action_repeated_for_today = False
+            days_already_advanced = False
             if hasattr(self, 'queued_next_day_action') and self.queued_next_day_action:
                 if self.queued_next_day_action == 'work':
                     if sum(self.game_state.inventory.values()) > 0: # Re-check condition
-                        self.view.show_message(f"Automatically working for Day {self.game_state.day}...", "info", delay=0.2)
+                        self.say(f"Automatically working for Day {self.game_state.day}...", "info", delay=0.2)
                         if self.handle_work(): # handle_work now asks if we want to queue *another* repeat
                             self.queued_next_day_action = 'work' # Re-queue if they said yes again
                         else:
@@ -66,7 +100,7 @@ class GameController:
                         self.view.show_message("Cannot auto-work: No supplies!", "warning")
                         self.queued_next_day_action = None
                 elif self.queued_next_day_action == 'rest':
-                    self.view.show_message(f"Automatically resting for Day {self.game_state.day}...", "info", delay=0.2)
+                    self.say(f"Automatically resting for Day {self.game_state.day}...", "info", delay=0.2)
                     if self.handle_rest(): # handle_rest now asks if we want to queue *another* repeat
                         self.queued_next_day_action = 'rest' # Re-queue
                     else:
@@ -77,24 +111,37 @@ class GameController:
                     self.queued_next_day_action = None
             
             if not action_repeated_for_today and not self.game_state.is_game_over():
-                self.view.display_menu()
-                choice = self.view.get_input("\nWhat would you like to do? (1-9): ", 
-                                         ["1", "2", "3", "4", "5", "6", "7", "8", "9"])
+                with phase(RENDER):
+                    self.view.display_menu()
+                choice = self.view.get_input("\nWhat would you like to do? (1-14): ", 
+                                         ["1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12", "13", "14"])
                 
-                if choice == "1": self.handle_buy_supplies()
-                elif choice == "2": 
-                    if self.handle_work(): self.queued_next_day_action = 'work' 
-                    else: self.queued_next_day_action = None
-                elif choice == "3": self.handle_employees()
-                elif choice == "4": self.handle_upgrades()
-                elif choice == "5": self.handle_loans()
-                elif choice == "6": 
-                    if self.handle_rest(): self.queued_next_day_action = 'rest'
-                    else: self.queued_next_day_action = None
-                elif choice == "7": self.handle_save_game()
-                elif choice == "8": 
-                    if self.handle_quit_game(): break
-                elif choice == "9": self.handle_start_research()
+                # Undo steps cover the whole day: the action and the end-of-day processing after it.
+                # The step is kept only if the action changed the game (not for a cancelled menu).
+                undo_step = self.history.begin(f"Day {self.game_state.day}: {UNDOABLE_CHOICES[choice]}") \
+                    if choice in UNDOABLE_CHOICES else None
+
+                with phase(ACTION):
+                    if choice == "1": self.handle_buy_supplies()
+                    elif choice == "2": 
+                        if self.handle_work(): self.queued_next_day_action = 'work' 
+                        else: self.queued_next_day_action = None
+                    elif choice == "3": self.handle_employees()
+                    elif choice == "4": self.handle_upgrades()
+                    elif choice == "5": self.handle_loans()
+                    elif choice == "6": 
+                        if self.handle_rest(): self.queued_next_day_action = 'rest'
+                        else: self.queued_next_day_action = None
+                    elif choice == "7": self.handle_save_game()
+                    elif choice == "8": 
+                        if self.handle_quit_game(): break
+                    elif choice == "9": self.handle_start_research()
+                    elif choice == "10": days_already_advanced = self.handle_wait()
+                    elif choice == "11": self.handle_work_batch()
+                    elif choice == "12": self.handle_branches()
+                    elif choice in ("13", "14"): days_already_advanced = self.handle_undo_redo(choice == "13")
+                if undo_step is not None:
+                    self.history.commit(undo_step)
                 
                 # If any other action was chosen, clear any queued work/rest
                 if choice not in ['2', '6']:
@@ -103,34 +150,54 @@ class GameController:
                  pass # Loop will terminate
 
             # Daily processing happens AFTER the action for the current day
-            if not self.game_state.is_game_over():
-                if market_data.get("special_event"):
-                    random_event_details = self.event_manager.get_random_event()
-                    event_type = random_event_details.get("type", "none")
-                    if event_type != "none":
-                        self.view.show_message(random_event_details["message"])
-                        self.game_state.apply_random_event_effect(random_event_details)
-                
-                interest = self.game_state.apply_daily_interest()
-                if interest > 0:
-                    self.view.show_message(f"Daily loan interest: ${interest}", "error")
-                
-                self.game_state.advance_day()
-                
-                if self.event_manager.active_research:
-                    research_status = self.event_manager.update_research()
-                    self.game_state.active_research_project = self.event_manager.active_research 
-                    if research_status.get("status") == "completed":
-                        completed_project_key = research_status.get("project")
-                        if completed_project_key:
-                            project_name = self.event_manager.research_projects_data[completed_project_key]['name']
-                            self.view.show_message(f"RESEARCH COMPLETE: '{project_name}'! Effects applied.", "success")
-                            self.game_state.apply_research_completion(completed_project_key)
-                            self.game_state.active_research_project = None 
-                sleep(0.5)
+            if not self.game_state.is_game_over() and not days_already_advanced:
+                for message in self.engine.end_day():
+                    self.say(message)
+                if self.suppressing:
+                    self.record_day(self.engine.day_report) # Days shown in full are not summarized again
+                else:
+                    self.view.pause(0.5)
         
+        self.suppressing = False
+        self.report_day_summary()
         self.view.display_game_over(self.game_state, self.game_state.is_win())
 
+    def say(self, message: Union[str, EventMessage], message_type: str = "info", delay: float = 0.0) -> None:
+        """
+        Show a day's message, or just count it when the day is being summarized.
+        An EventMessage brings its own type and is only formatted when shown.
+        """
+        if self.suppressing:
+            self.day_summary.suppress()
+        elif isinstance(message, EventMessage):
+            self.view.show_message(message.text(), message.message_type, delay=delay)
+        else:
+            self.view.show_message(message, message_type, delay=delay)
+
+    def record_day(self, report: Dict[str, Any]) -> None:
+        """Add a suppressed day's (or a waited window's) facts to the running summary and report it when due."""
+        if self.verbosity == FULL:
+            return
+        self.day_summary.record(report)
+        if DaySummary.significant(report, self.game_state) or (
+                self.verbosity == SUMMARY and self.day_summary.days >= config.SUMMARY_INTERVAL_DAYS):
+            self.report_day_summary()
+
+    def report_day_summary(self) -> None:
+        if self.day_summary.days > 0:
+            self.view.show_message(self.day_summary.line(), "info")
+        self.day_summary.reset()
+
+    def handle_undo_redo(self, undo: bool) -> bool:
+        """Undo or redo one day's action. Always returns True: undoing is not a day's action, so the day does not end."""
+        label = self.history.undo() if undo else self.history.redo()
+        if label is None:
+            self.view.show_message(f"Nothing to {'undo' if undo else 'redo'}.", "warning")
+        else:
+            self.view.show_message(f"{'Undid' if undo else 'Redid'}: {label}", "info")
+        self.resume_day = True
+        return True
+
     def handle_save_game(self):
         if self.game_state.save_game():
             self.view.show_message("Game saved successfully!", "success")
@@ -203,10 +270,12 @@ class GameController:
         next_day_action_taken = False
 
         if income > 0:
-            self.view.show_message(f"You earned ${income}!", "success")
-            employee_cost = len(self.game_state.employees) * config.EMPLOYEE_DAILY_SALARY
+            self.say(f"You earned ${income}!", "success")
+            last_work = self.game_state.last_work
+            self.say(f"Supplies used cost ${last_work['cogs']} (margin {last_work['margin'] * 100:.0f}%).", "info")
+            employee_cost = self.game_state.employees.daily_payroll()
             if employee_cost > 0:
-                self.view.show_message(f"Paid ${employee_cost} in employee salaries.", "warning")
+                self.say(f"Paid ${employee_cost} in employee salaries.", "warning")
             
             # Check if can work again (has supplies)
             if sum(self.game_state.inventory.values()) > 0 and not self.game_state.is_game_over():
@@ -214,11 +283,44 @@ class GameController:
                 if repeat_choice == 'y':
                     next_day_action_taken = True 
                     # The actual work for next day will happen in the next loop iteration after daily processing
-                    self.view.show_message("Scheduled to work next day...", "info")
+                    self.say("Scheduled to work next day...", "info")
         else:
             self.view.show_message("You need supplies to work!", "error")
         return next_day_action_taken
     
+    def handle_work_batch(self) -> None:
+        """Handle a bulk work order that uses many supply units in one day."""
+        total_supplies = sum(self.game_state.inventory.values())
+        if total_supplies <= 0:
+            self.view.show_message("You need supplies to work!", "error")
+            return
+
+        amount_input = self.view.get_number_input(
+            f"How many supply units should this order use? (1-{total_supplies}, or 'max'): ",
+            1, total_supplies, allow_max_str=True
+        )
+        units = total_supplies if amount_input == "max" else amount_input
+        if not isinstance(units, int) or units <= 0:
+            self.view.show_message("No work done.", "info")
+            return
+
+        result = self.game_state.work_batch(units)
+        self.view.show_message(f"Bulk order used {result['units']} units and earned ${result['income']}!", "success")
+        self.view.show_message(f"Supplies used cost ${result['cogs']} (margin {result['margin'] * 100:.0f}%). Reputation -{result['reputation_loss']}.", "info")
+        if result["payroll"] > 0:
+            self.view.show_message(f"Paid ${result['payroll']} in employee salaries.", "warning")
+
+    def handle_branches(self) -> None:
+        """Handle opening branches."""
+        self.view.display_branch_menu(self.game_state)
+        choice = self.view.get_input("Choose an action (1-2): ", ["1", "2"])
+        if choice == "1":
+            branch = self.game_state.open_branch()
+            if branch:
+                self.view.show_message(f"Opened {branch.name}! It restocks and works on its own each day.", "success")
+            else:
+                self.view.show_message(f"You need ${config.BRANCH_OPEN_COST} to open a branch!", "error")
+
     def handle_employees(self) -> None:
         """Handle employee management."""
         self.view.display_employee_menu(self.game_state)
@@ -272,6 +374,16 @@ class GameController:
             else:
                 self.view.show_message("Failed to purchase upgrade for an unknown reason.", "error")
     
+    def preview_loan(self, amount: int, product_key: str) -> bool:
+        """Show a what-if preview of the next few days with and without the loan; returns whether to go ahead."""
+        days = config.LOAN_PREVIEW_DAYS
+        with_loan = self.engine.preview(days, lambda state: state.take_loan(amount, product_key))
+        without_loan = self.engine.preview(days)
+        self.view.show_message(
+            f"Preview of the next {days} idle days: money ${with_loan['money']} with the loan "
+            f"(${without_loan['money']} without), loan balance ${with_loan['loan']}.", "info")
+        return self.view.get_input("Take this loan? (y/n): ", ["y", "n"]) == "y"
+
     def handle_loans(self) -> None:
         """Handle loan management."""
         self.view.display_loan_menu(self.game_state) # Displays current loan, rates, and safe loan recommendation
@@ -283,6 +395,10 @@ class GameController:
             if max_loan_player_can_take <= 0:
                 self.view.show_message("You've reached your maximum loan limit!", "error")
                 return
+
+            product_key = self.view.display_loan_products()
+            if product_key is None:
+                return
                 
             safe_loan_to_take = self.game_state.get_safe_loan_amount()
             prompt_detail = f" (max ${max_loan_player_can_take})"
@@ -312,8 +428,12 @@ class GameController:
                          self.view.show_message("Loan cancelled.", "info")
                          return
 
-                if self.game_state.take_loan(amount_to_take):
-                    self.view.show_message(f"Loan of ${amount_to_take} received!", "success")
+                if not self.preview_loan(amount_to_take, product_key):
+                    self.view.show_message("Loan cancelled.", "info")
+                    return
+
+                if self.game_state.take_loan(amount_to_take, product_key):
+                    self.view.show_message(f"{config.LOAN_PRODUCTS[product_key]['name']} of ${amount_to_take} received!", "success")
                 else:
                     self.view.show_message("Failed to process loan. Ensure amount is positive and within limits.", "error")
             elif amount_input != "max":
@@ -358,7 +478,7 @@ class GameController:
     def handle_rest(self) -> bool: # Returns True if a repeat action was taken for the next day cycle
         """Handle the rest action."""
         rep_gain = self.game_state.rest()
-        self.view.show_message(f"You rested and improved your reputation by {rep_gain} points.", "success")
+        self.say(f"You rested and improved your reputation by {rep_gain} points.", "success")
         next_day_action_taken = False
 
         # Check if can rest again (always possible unless game is over by other means)
@@ -366,16 +486,38 @@ class GameController:
             repeat_choice = self.view.get_input(f"Rest again for Day {self.game_state.day + 1}? (y/n): ", ["y", "n"])
             if repeat_choice == 'y':
                 next_day_action_taken = True
-                self.view.show_message("Scheduled to rest next day...", "info")
+                self.say("Scheduled to rest next day...", "info")
         return next_day_action_taken
 
+    def handle_wait(self) -> bool:
+        """Handle waiting several days in one step. Returns True if days were advanced."""
+        days = self.view.get_number_input("How many days would you like to wait? (1-365): ", 1, 365)
+        if not isinstance(days, int) or days <= 0:
+            return False
+        summary = self.wait_days(days)
+        self.view.show_message(f"You waited {summary['days']} day(s). It is now Day {self.game_state.day}.", "info")
+        return True
+
+    def wait_days(self, days: int) -> Dict[str, Any]:
+        """Skip ahead `days` days through the engine and show what happened along the way."""
+        summary = self.engine.advance_days(days)
+        if self.verbosity != FULL:
+            # The whole window becomes one summary line
+            self.day_summary.suppress(len(summary["messages"]))
+            self.record_day(summary)
+            self.report_day_summary()
+            return summary
+        for message in summary["messages"]:
+            self.view.show_message(message.text(), message.message_type)
+        return summary
+
     def handle_start_research(self) -> None:
         """Handle starting a new research project."""
         research_choice_key = self.view.display_research_menu(
             config.RESEARCH_PROJECTS_SPECS,
             self.game_state.completed_research,
-            self.event_manager.active_research,
-            self.event_manager.research_progress
+            self.game_state.active_research_project,
+            self.game_state.research_progress
         )
 
         if not research_choice_key: # Player chose to go back
@@ -385,8 +527,8 @@ class GameController:
             self.view.show_message("This research project has already been completed.", "warning")
             return
 
-        if self.event_manager.active_research is not None:
-            self.view.show_message(f"Research for '{self.event_manager.research_projects_data[self.event_manager.active_research]['name']}' is already in progress.", "warning")
+        if self.game_state.active_research_project is not None:
+            self.view.show_message(f"Research for '{self.event_manager.research_projects_data[self.game_state.active_research_project]['name']}' is already in progress.", "warning")
             return
 
         project_details = self.event_manager.research_projects_data.get(research_choice_key)
@@ -399,9 +541,8 @@ class GameController:
             self.view.show_message(f"Not enough money to start research for '{project_details['name']}'. Cost: ${cost}", "error")
             return
 
-        # Start the research
-        self.game_state.money -= cost
-        self.event_manager.active_research = research_choice_key
-        self.game_state.active_research_project = research_choice_key # Sync to GameState for saving
-        self.event_manager.research_progress = 0 # Reset progress for the new project
+        # Start the research; GameState schedules its completion
+        if not self.game_state.start_research(research_choice_key):
+            self.view.show_message("Failed to start research.", "error")
+            return
         self.view.show_message(f"Research started for '{project_details['name']}'! It will take {project_details['duration']} days.", "success") 
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+day_summary.py
+
+Aggregated reporting for long CLI runs (the "summary" and "quiet" verbosity
+levels).
+
+While the player auto-works, auto-rests or waits, the controller does not
+show each day's status block, menu and messages. It hands each day's facts
+from GameEngine.day_report (or an advance_days summary) to DaySummary, which
+keeps running totals: money and reputation deltas, random events by type,
+competitor moves, interest paid and research completed. line() renders them
+as one summary line, and significant() says whether the facts must be reported
+right away (research done, a missed loan payment, reputation running low).
+"""
+
+from collections import Counter
+from typing import Dict, Any, List
+import config
+
+# Verbosity levels (config.CLI_VERBOSITY)
+FULL = "full" # Every day's status, menu and messages
+SUMMARY = "summary" # Aggregated line every SUMMARY_INTERVAL_DAYS days and on significant events
+QUIET = "quiet" # Aggregated line only on significant events and when control returns to the player
+VERBOSITY_LEVELS = (FULL, SUMMARY, QUIET)
+
+
+class DaySummary:
+    """Running totals for a stretch of days whose per-day output was suppressed."""
+
+    def __init__(self, game_state: Any):
+        self.game_state = game_state
+        self.reset()
+
+    def reset(self) -> None:
+        self.start_day = self.game_state.day
+        self.start_money = self.game_state.money
+        self.start_reputation = self.game_state.reputation
+        self.days = 0
+        self.events: Counter = Counter()
+        self.competitor_moves = 0
+        self.interest = 0
+        self.loan_paid = 0
+        self.loan_missed = 0
+        self.research: List[str] = []
+        self.suppressed_messages = 0
+
+    def record(self, report: Dict[str, Any]) -> None:
+        """Add one day's (or one skipped window's) facts: days, interest, event_types, competitor_actions, fired."""
+        self.days += report.get("days", 1)
+        self.interest += report.get("interest", 0)
+        self.events.update(report.get("event_types", ()))
+        self.competitor_moves += report.get("competitor_actions", 0)
+        for effect in report.get("fired", ()):
+            if effect["kind"] == "research_complete" and effect.get("project"):
+                self.research.append(config.RESEARCH_PROJECTS_SPECS[effect["project"]]["name"])
+            elif effect["kind"] == "loan_due":
+                self.loan_paid += effect.get("paid", 0)
+                self.loan_missed += effect.get("missed", 0)
+
+    def suppress(self, count: int = 1) -> None:
+        """Count `count` messages that were not shown."""
+        self.suppressed_messages += count
+
+    @staticmethod
+    def significant(report: Dict[str, Any], game_state: Any) -> bool:
+        """Whether a day's facts should be reported immediately rather than in the next periodic line."""
+        for effect in report.get("fired", ()):
+            if effect["kind"] == "research_complete" or effect.get("missed", 0) > 0:
+                return True
+        return game_state.reputation < config.SUMMARY_REPUTATION_ALERT or game_state.is_game_over()
+
+    def line(self) -> str:
+        state = self.game_state
+        end_day = self.start_day + self.days
+        span = f"Days {self.start_day}-{end_day - 1}:" if self.days > 1 else f"Day {self.start_day}:"
+        parts = [f"money {state.money - self.start_money:+} (${state.money})",
+                 f"reputation {state.reputation - self.start_reputation:+} ({state.reputation})"]
+        if self.events:
+            parts.append("events " + ", ".join(f"{event_type} x{count}" for event_type, count in sorted(self.events.items())))
+        if self.competitor_moves:
+            parts.append(f"competitor moves x{self.competitor_moves}")
+        if self.interest:
+            parts.append(f"interest paid ${self.interest}")
+        if self.loan_paid or self.loan_missed:
+            parts.append(f"loan payments ${self.loan_paid}" + (f" (missed ${self.loan_missed})" if self.loan_missed else ""))
+        if self.research:
+            parts.append("research done: " + ", ".join(self.research))
+        if self.suppressed_messages:
+            parts.append(f"{self.suppressed_messages} messages hidden")
+        return span + " " + " | ".join(parts)
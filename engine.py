@@ -0,0 +1,238 @@
+"""
+engine.py
+
+Headless day driver shared by GameController, TycoonGUI and simulations.
+
+GameEngine owns the daily processing that used to live inline in the
+controller loop (market update, competitor news, special events, loan
+interest, loan payments, advancing the day) and adds advance_days() for skipping ahead over
+idle stretches. It never talks to a view: every method returns the messages
+it produced as EventMessage records, which the caller formats only if it
+displays them.
+"""
+
+import random
+from typing import Callable, Dict, Any, List, Optional
+import config
+
+from game_state import GameState
+from game_events import EventManager
+from company import BranchTickScheduler
+from event_messages import EventMessage
+from profiling import Profiler, phase, MARKET, ACTION, EVENTS, BRANCHES, INTEREST, RESEARCH
+
+
+class GameEngine:
+    """Runs the per-day game simulation for one GameState."""
+
+    def __init__(self, game_state: GameState, event_manager: Optional[EventManager] = None, seed: Optional[int] = None):
+        if seed is not None:
+            random.seed(seed) # GameState rolls work income and reputation with the random module
+        self.game_state = game_state
+        self.event_manager = event_manager if event_manager is not None else EventManager(seed=seed)
+        self.game_state.market_trend = self.event_manager.market_trend
+        self.market_data: Dict[str, Any] = {}
+        # Facts about the day in progress (competitor move, events, interest, fired effects) for summaries
+        self.day_report: Dict[str, Any] = {}
+        self.branch_scheduler = BranchTickScheduler()
+
+    def fork(self) -> "GameEngine":
+        """
+        Return an engine over copy-on-write forks of the game state and event manager.
+
+        The fork ticks its branches in-process and never touches the parent's state,
+        market or competitor RNG, so it can be run ahead for what-if previews.
+        """
+        child = object.__new__(GameEngine)
+        child.game_state = self.game_state.fork()
+        child.event_manager = self.event_manager.fork()
+        child.market_data = dict(self.market_data)
+        child.day_report = {}
+        child.branch_scheduler = BranchTickScheduler(processes=0)
+        return child
+
+    def preview(self, days: int, action: Optional[Callable[[GameState], Any]] = None) -> Dict[str, Any]:
+        """
+        Run a fork `days` idle days ahead, optionally after applying `action` to its state,
+        and return where the business would end up. The live game is left untouched,
+        including the random module state.
+        """
+        random_state = random.getstate()
+        try:
+            fork = self.fork()
+            result = action(fork.game_state) if action is not None else None
+            summary = fork.advance_days(days)
+        finally:
+            random.setstate(random_state)
+        state = fork.game_state
+        return {
+            "days": days,
+            "action_result": result,
+            "money": state.money,
+            "reputation": state.reputation,
+            "loan": state.loan,
+            "interest": summary["interest"],
+            "money_change": state.money - self.game_state.money,
+            "messages": summary["messages"],
+        }
+
+    def begin_day(self) -> Dict[str, Any]:
+        """Update the market for today and apply competitor actions. Returns today's market data."""
+        with phase(MARKET):
+            market_data = self.event_manager.update_market()
+            self.game_state.set_market_conditions(self.event_manager.market_trend, market_data.get("market_demand", 1.0))
+
+        market_data["competitor_message"] = None
+        if market_data.get("competitor_action"):
+            with phase(EVENTS):
+                message, effect = self.event_manager.handle_competitor_action(market_data["competitor_action"])
+                market_data["competitor_message"] = message
+                self.game_state.apply_competitor_effect(effect)
+
+        self.market_data = market_data
+        self.day_report = {"days": 1, "competitor_actions": int(bool(market_data.get("competitor_action"))),
+                           "event_types": [], "interest": 0, "fired": []}
+        return market_data
+
+    def end_day(self) -> List[EventMessage]:
+        """Run end-of-day processing (special event, interest, scheduled effects) and advance the day."""
+        messages: List[EventMessage] = []
+        if self.market_data.get("special_event"):
+            with phase(EVENTS):
+                random_event_details = self.event_manager.get_random_event()
+                if random_event_details.get("type", "none") != "none":
+                    messages.append(self.event_manager.event_message(random_event_details))
+                    self.game_state.apply_random_event_effect(random_event_details)
+                    self.day_report.setdefault("event_types", []).append(random_event_details["type"])
+
+        messages.extend(self._tick_branches(1))
+
+        with phase(INTEREST):
+            interest = self.game_state.apply_daily_interest()
+        if interest > 0:
+            messages.append(EventMessage("loan_interest", "error", {"interest": interest}))
+
+        # Scheduled effects (research completion, event expiry) fire inside advance_day
+        with phase(RESEARCH):
+            fired = self.game_state.advance_day()
+            messages.extend(self._effect_messages(fired))
+        self.day_report["interest"] = interest
+        self.day_report["fired"] = fired
+        self.market_data = {}
+        return messages
+
+    def advance_days(self, days: int) -> Dict[str, Any]:
+        """
+        Spend `days` days idle, starting with the rest of today, in one call.
+
+        Market steps for the window are run without messages, the special events that
+        fall in the window are drawn in bulk, and GameState.advance_days compounds loan
+        interest in closed form between event days and scheduled effects. The last day's
+        market and competitor action are applied before it is played, so the state ends
+        with the market a day-by-day run would leave.
+        """
+        days = max(0, days)
+        events_by_offset: Dict[int, List[Dict[str, Any]]] = {}
+        with phase(EVENTS):
+            if self.market_data.get("special_event"):
+                todays_event = self.event_manager.get_random_event()
+                if todays_event.get("type", "none") != "none":
+                    events_by_offset[0] = [todays_event]
+
+        # Today's market is already set; the window needs one market step per following day
+        with phase(MARKET):
+            market = self.event_manager.advance_market(max(0, days - 1))
+        with phase(EVENTS):
+            later_events = self.event_manager.get_random_events_for_days(market["special_event_days"], market["trajectory_start"],
+                                                                         market["special_event_rolls"])
+        for offset, events in later_events.items():
+            events_by_offset[offset + 1] = events
+
+        # Compounded interest, window events and scheduled effects up to the window's last day
+        start_day = self.game_state.day
+        with phase(INTEREST):
+            summary = self.game_state.advance_days(days - 1, events_by_offset)
+        if days > 0 and summary["days"] == days - 1 and not self.game_state.is_game_over():
+            if days > 1:
+                # The last day starts like begin_day: its market, then its competitor action
+                self.game_state.set_market_conditions(self.event_manager.market_trend, market["market_demand"])
+                if market["last_competitor_action"]:
+                    _, effect = self.event_manager.handle_competitor_action(market["last_competitor_action"])
+                    self.game_state.apply_competitor_effect(effect)
+            with phase(INTEREST):
+                last_day = self.game_state.advance_days(1, {0: events_by_offset.get(days - 1, [])})
+            summary["days"] += last_day["days"]
+            summary["interest"] += last_day["interest"]
+            summary["fired"].extend(last_day["fired"])
+            summary["events"].extend(last_day["events"])
+        # Branch cash flow only for the days actually played (game over can end the window early)
+        branch_messages = self._tick_branches(summary["days"], start_day)
+        self.market_data = {}
+
+        messages: List[EventMessage] = [self.event_manager.event_message(event) for event in summary["events"]]
+        messages.extend(branch_messages)
+        messages.extend(self._effect_messages(summary["fired"]))
+        if summary["interest"] > 0:
+            messages.append(EventMessage("loan_interest_window", "error", {"days": summary["days"], "interest": summary["interest"]}))
+        summary["competitor_actions"] = market["competitor_actions"]
+        summary["event_types"] = [event["type"] for event in summary["events"]]
+        summary["messages"] = messages
+        return summary
+
+    def simulate(self, days: int, daily_policy: Optional[Callable[[GameState], Any]] = None,
+                 profile: Optional[str] = None) -> None:
+        """
+        Play `days` full days headlessly, calling `daily_policy(game_state)` between the
+        start and the end of each day (idle days if None). Day messages are discarded.
+
+        With `profile` set, the run is profiled and `<profile>.pstats` and
+        `<profile>.folded` (collapsed stacks annotated with game phases) are written.
+        """
+        profiler = Profiler(profile) if profile else None
+        if profiler is not None:
+            profiler.start()
+        try:
+            for _ in range(max(0, days)):
+                self.begin_day()
+                if daily_policy is not None:
+                    with phase(ACTION):
+                        daily_policy(self.game_state)
+                self.end_day()
+        finally:
+            if profiler is not None:
+                profiler.stop()
+
+    def _tick_branches(self, days: int, start_day: Optional[int] = None) -> List[EventMessage]:
+        """Tick every branch once per day for `days` days, starting at start_day (today), and bank the net cash."""
+        if not self.game_state.company.branches or days <= 0:
+            return []
+        start_day = self.game_state.day if start_day is None else start_day
+        company = self.game_state.own("company")
+        automation_bonus, rep_loss_reduction = self.game_state.branch_work_terms()
+        net = 0
+        units = 0
+        with phase(BRANCHES):
+            for offset in range(days):
+                flow = self.branch_scheduler.tick(company, start_day + offset, self.game_state.current_market_demand,
+                                                  automation_bonus, rep_loss_reduction)
+                net += flow["net"]
+                units += flow["units_worked"]
+        self.game_state.money += net
+        payload = {"branches": len(company), "units": units, "days": days, "net": net}
+        return [EventMessage("branches_day" if days == 1 else "branches_window", "success" if net >= 0 else "warning", payload)]
+
+    def _effect_messages(self, fired_effects: List[Dict[str, Any]]) -> List[EventMessage]:
+        messages: List[EventMessage] = []
+        for effect in fired_effects:
+            if effect["kind"] == "research_complete" and effect.get("project"):
+                project_name = self.event_manager.research_projects_data[effect["project"]]['name']
+                messages.append(EventMessage("research_complete", "success", {"name": project_name}))
+            elif effect["kind"] == "supplies_spoiled":
+                messages.append(EventMessage("spoilage", "warning", {"spoiled": effect["spoiled"]}))
+            elif effect["kind"] == "loan_due":
+                product_name = config.LOAN_PRODUCTS[effect["product"]]["name"] if "product" in effect else ""
+                if effect.get("paid", 0) > 0:
+                    messages.append(EventMessage("loan_payment", "info", {"paid": effect["paid"], "product": product_name}))
+                if effect.get("missed", 0) > 0:
+                    messages.append(EventMessage("missed_payment", "error", {"missed": effect["missed"], "product": product_name}))
+        return messages
@@ -0,0 +1,121 @@
+"""
+event_bus.py
+
+Publish/subscribe bus carrying model change events to the views.
+
+GameState and EventManager publish a topic (MONEY, INVENTORY, MARKET, ...)
+whenever the data behind it changes; views subscribe a callback to the topics
+they render. Publishing only counts the change, so a fast-forward that
+changes money a thousand times leaves one pending MONEY entry. flush() then
+calls each subscriber at most once with just the topics it asked for (views
+read the current values from the model), and can be throttled to a minimum
+interval between deliveries.
+"""
+
+import time
+from typing import Dict, Any, Callable, Optional, Tuple
+
+# Change topics
+MONEY = "money"
+REPUTATION = "reputation"
+DAY = "day"
+INVENTORY = "inventory" # Supply counts and storage capacity
+UPGRADES = "upgrades"
+EMPLOYEES = "employees"
+LOANS = "loans"
+RESEARCH = "research"
+MARKET = "market"
+BRANCHES = "branches"
+TOPICS = (MONEY, REPUTATION, DAY, INVENTORY, UPGRADES, EMPLOYEES, LOANS, RESEARCH, MARKET, BRANCHES)
+
+Subscriber = Callable[[Dict[str, int]], None]
+
+
+class EventBus:
+    """Coalescing, throttled change-event bus."""
+
+    def __init__(self, min_interval: float = 0.0):
+        self.min_interval = min_interval # Seconds; flush() does nothing if called sooner after the last delivery
+        self._subscribers: Dict[int, Tuple[frozenset, Subscriber]] = {}
+        self._next_id = 1
+        self._pending: Dict[str, int] = {} # topic -> changes since the last flush
+        self._last_flush = float("-inf")
+        self.published = 0 # Lifetime counts, for profiling
+        self.deliveries = 0
+
+    def subscribe(self, callback: Subscriber, *topics: str) -> int:
+        """Call `callback` with {topic: change count} for the given topics on each flush that has any of them."""
+        unknown = set(topics) - set(TOPICS)
+        if unknown or not topics:
+            raise ValueError(f"Unknown or missing topics: {sorted(unknown)}")
+        subscription_id = self._next_id
+        self._next_id += 1
+        self._subscribers[subscription_id] = (frozenset(topics), callback)
+        return subscription_id
+
+    def unsubscribe(self, subscription_id: int) -> None:
+        self._subscribers.pop(subscription_id, None)
+
+    def publish(self, topic: str) -> None:
+        """Record that `topic` changed. Nothing is delivered until the next flush()."""
+        if topic not in TOPICS:
+            raise ValueError(f"Unknown topic '{topic}'.")
+        self._pending[topic] = self._pending.get(topic, 0) + 1
+        self.published += 1
+
+    def publish_all(self) -> None:
+        """Mark every topic changed (after loading or restoring a whole game)."""
+        for topic in TOPICS:
+            self._pending[topic] = self._pending.get(topic, 0) + 1
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def seconds_until_flush(self) -> float:
+        return max(0.0, self._last_flush + self.min_interval - time.monotonic())
+
+    def flush(self, force: bool = False) -> bool:
+        """
+        Deliver the pending changes, one call per interested subscriber.
+
+        Returns False if the flush was throttled (pending changes are kept for a
+        later flush), True otherwise.
+        """
+        if not self._pending:
+            return True
+        if not force and self.seconds_until_flush() > 0:
+            return False
+        pending, self._pending = self._pending, {}
+        self._last_flush = time.monotonic()
+        for topics, callback in list(self._subscribers.values()):
+            changes = {topic: value for topic, value in pending.items() if topic in topics}
+            if changes:
+                callback(changes)
+                self.deliveries += 1
+        return True
+
+
+class Published:
+    """
+    Attribute that publishes `topic` on its owner's bus whenever it is assigned.
+
+    The value is stored in the instance dict under "_<name>", and the owner's
+    `bus` attribute (None for no bus, e.g. on forks) receives the change.
+    """
+
+    def __init__(self, topic: str):
+        self.topic = topic
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.key = "_" + name
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        return instance.__dict__[self.key]
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        instance.__dict__[self.key] = value
+        bus = instance.__dict__.get("bus")
+        if bus is not None:
+            bus.publish(self.topic)
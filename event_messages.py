@@ -0,0 +1,66 @@
+"""
+event_messages.py
+
+Structured game messages, formatted only when something shows them.
+
+The engine and EventManager describe what happened as EventMessage records:
+a template id, a message type (how views color it) and the values the
+template needs. Templates are registered once: the engine's own below,
+competitor news from config.COMPETITOR_EFFECTS, and random events when an
+EventTable is compiled. Headless runs and suppressed summary days build no
+strings at all; text() formats a record when a view is about to show it.
+"""
+
+from typing import Dict, Any, Callable, Optional, Union
+import config
+
+Template = Union[str, Callable[..., str]] # A str.format template, or a function of the payload
+
+TEMPLATES: Dict[str, Template] = {
+    "market_boom": "The market is booming!",
+    "market_decline": "The market is in decline.",
+    "competitor_unknown": "COMPETITOR NEWS: {competitor} did something unexpected!",
+    "branches_day": "Your {branches} branch(es) worked {units} units today: net ${net}.",
+    "branches_window": "Your {branches} branch(es) worked {units} units over {days} days: net ${net}.",
+    "loan_interest": "Daily loan interest: ${interest}",
+    "loan_interest_window": "Loan interest over {days} days: ${interest}",
+    "research_complete": "RESEARCH COMPLETE: '{name}'! Effects applied.",
+    "spoilage": lambda spoiled: "SPOILAGE: {} went bad and were thrown out.".format(
+        ", ".join(f"{amount} {supply_type.replace('_', ' ').title()}" for supply_type, amount in spoiled.items())),
+    "loan_payment": "LOAN PAYMENT: ${paid} paid on your {product}.",
+    "missed_payment": "MISSED PAYMENT: ${missed} of your {product} stays on the balance.",
+}
+
+for _action, _spec in config.COMPETITOR_EFFECTS.items():
+    TEMPLATES["competitor:" + _action] = "COMPETITOR NEWS: " + _spec["message_template"]
+
+
+def register_template(template_id: str, template: Template) -> None:
+    TEMPLATES[template_id] = template
+
+
+class EventMessage:
+    """A message as a template id, message type and payload; text() formats it on demand."""
+
+    __slots__ = ("template_id", "message_type", "payload")
+
+    def __init__(self, template_id: str, message_type: str = "info", payload: Optional[Dict[str, Any]] = None):
+        self.template_id = template_id
+        self.message_type = message_type
+        self.payload = payload if payload is not None else {}
+
+    def text(self) -> str:
+        template = TEMPLATES[self.template_id]
+        if callable(template):
+            return template(**self.payload)
+        return template.format(**self.payload)
+
+    __str__ = text
+
+    def __repr__(self) -> str:
+        return f"EventMessage({self.template_id!r}, {self.message_type!r}, {self.payload!r})"
+
+
+# Messages without a payload are preallocated
+MARKET_BOOM = EventMessage("market_boom", "success")
+MARKET_DECLINE = EventMessage("market_decline", "error")
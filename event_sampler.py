@@ -0,0 +1,158 @@
+"""
+event_sampler.py
+
+Data-driven random event engine used by EventManager.
+
+The event tables in config.py (or a JSON data file) are compiled once into
+alias-method samplers (Vose), so drawing an event costs O(1) no matter how
+many event types are defined, and batch simulations can draw many events at
+once with sample_many(). Message templates are registered with event_messages
+at compile time; built events carry only the template id and the rolled values.
+"""
+
+import json
+import random
+from typing import Dict, Any, List, Optional, Sequence
+import config
+from event_messages import register_template
+
+NO_EVENT = {"type": "none"}
+
+
+class AliasSampler:
+    """O(1) weighted sampler over a fixed list of outcomes (Vose's alias method)."""
+
+    def __init__(self, outcomes: Sequence[Any], weights: Sequence[float]):
+        if len(outcomes) != len(weights):
+            raise ValueError("outcomes and weights must have the same length.")
+        if not outcomes:
+            raise ValueError("AliasSampler needs at least one outcome.")
+        total = float(sum(weights))
+        if total <= 0 or any(w < 0 for w in weights):
+            raise ValueError("Weights must be non-negative and sum to a positive value.")
+
+        n = len(outcomes)
+        self.outcomes = list(outcomes)
+        self.size = n
+        self.prob = [0.0] * n
+        self.alias = list(range(n))
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Leftovers are 1.0 up to floating point error
+        for i in large + small:
+            self.prob[i] = 1.0
+
+    def index_from_uniform(self, u: float) -> int:
+        """Map one uniform number in [0, 1) to an outcome index."""
+        x = u * self.size
+        column = int(x)
+        if column >= self.size: # Guard against u == 1.0
+            column = self.size - 1
+        return column if (x - column) < self.prob[column] else self.alias[column]
+
+    def sample_from_uniform(self, u: float) -> Any:
+        """Map one uniform number in [0, 1) to an outcome (used with pre-generated rolls)."""
+        return self.outcomes[self.index_from_uniform(u)]
+
+    def sample(self, rng: Any = random) -> Any:
+        """Draw one outcome."""
+        return self.outcomes[self.index_from_uniform(rng.random())]
+
+    def sample_many(self, count: int, rng: Any = random) -> List[Any]:
+        """Draw count outcomes in one pass."""
+        draw = rng.random
+        pick = self.index_from_uniform
+        outcomes = self.outcomes
+        return [outcomes[pick(draw())] for _ in range(count)]
+
+
+class EventTable:
+    """Compiled random event and employee sub-event tables."""
+
+    def __init__(self, event_specs: Sequence[Dict[str, Any]], employee_sub_events: Sequence[Dict[str, Any]]):
+        specs = [dict(spec) for spec in event_specs]
+        for spec in specs:
+            spec["template_id"] = "event:" + spec["type"]
+            default_template = "{message}" if spec.get("effect", spec["type"]) == "employee_event" else ""
+            register_template(spec["template_id"], spec.get("message_template") or default_template)
+        weights = [float(spec.get("chance", 0.0)) for spec in specs]
+        total = sum(weights)
+        if total < 1.0 - 1e-9: # The remaining probability mass means "nothing happens today"
+            specs.append(NO_EVENT)
+            weights.append(1.0 - total)
+        self.event_specs = specs
+        self.event_sampler = AliasSampler(specs, weights)
+
+        self.employee_sub_events = [dict(sub) for sub in employee_sub_events]
+        self.employee_sampler: Optional[AliasSampler] = None
+        if self.employee_sub_events:
+            self.employee_sampler = AliasSampler(
+                self.employee_sub_events,
+                [float(sub.get("chance", 1.0)) for sub in self.employee_sub_events]
+            )
+
+    @classmethod
+    def from_config(cls) -> "EventTable":
+        """Compile the tables from config.py, or from config.RANDOM_EVENTS_DATA_FILE if set."""
+        if config.RANDOM_EVENTS_DATA_FILE:
+            return cls.from_file(config.RANDOM_EVENTS_DATA_FILE)
+        return cls(config.RANDOM_EVENT_TYPES_CHANCES, config.EMPLOYEE_SUB_EVENTS)
+
+    @classmethod
+    def from_file(cls, path: str) -> "EventTable":
+        """Compile the tables from a JSON file with "random_events"/"employee_sub_events" lists."""
+        with open(path, "r") as f:
+            data = json.load(f)
+        return cls(
+            data.get("random_events", config.RANDOM_EVENT_TYPES_CHANCES),
+            data.get("employee_sub_events", config.EMPLOYEE_SUB_EVENTS)
+        )
+
+    def draw_spec(self, rng: Any = random) -> Dict[str, Any]:
+        """Draw an event spec (NO_EVENT when nothing happens)."""
+        return self.event_sampler.sample(rng)
+
+    def build_event(self, spec: Dict[str, Any], rng: Any = random) -> Dict[str, Any]:
+        """Roll the amounts of an event spec into event details for GameState.apply_random_event_effect."""
+        if spec is NO_EVENT or spec.get("type") == "none":
+            return {"type": "none"}
+
+        effect = spec.get("effect", spec["type"])
+        details: Dict[str, Any] = {"type": effect, "name": spec["type"]}
+        if "min_amount" in spec:
+            details["amount"] = rng.randint(spec["min_amount"], spec.get("max_amount", spec["min_amount"]))
+        if "market_boost" in spec:
+            details["market_boost"] = spec["market_boost"]
+        if effect == "employee_event":
+            sub_event = self.employee_sampler.sample(rng) if self.employee_sampler else {}
+            details["event"] = sub_event
+            details["message"] = sub_event.get("message", "Employee morale affected!")
+        details["template_id"] = spec["template_id"] # Formatted with these details when shown
+        return details
+
+    def draw(self, rng: Any = random) -> Dict[str, Any]:
+        """Draw and build one event."""
+        return self.build_event(self.draw_spec(rng), rng)
+
+    def draw_many(self, count: int, rng: Any = random) -> List[Dict[str, Any]]:
+        """Draw and build count events (NO_EVENT rolls are kept so results line up with days)."""
+        return [self.build_event(spec, rng) for spec in self.event_sampler.sample_many(count, rng)]
+
+
+_default_table: Optional[EventTable] = None
+
+def default_event_table() -> EventTable:
+    """Return the table compiled from config, compiling it on first use."""
+    global _default_table
+    if _default_table is None:
+        _default_table = EventTable.from_config()
+    return _default_table
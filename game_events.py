@@ -1,148 +1,219 @@
+import copy
 import random
-from typing import Dict, Any
-from colorama import Fore, Style
+from collections import deque
+from typing import Dict, Any, List, Optional
+import numpy as np
 import config # Import the config file
+from event_sampler import EventTable, default_event_table
+from competitors import CompetitorPopulation
+from market_trajectory import MarketTrajectory, DayRolls, EVENT_ROLLS_PER_DAY
+from event_bus import EventBus, Published, MARKET
+from event_messages import EventMessage, MARKET_BOOM, MARKET_DECLINE
+
+# Message type (how views color it) for random event messages, keyed by event effect
+EVENT_MESSAGE_TYPES = {
+    "bonus": "success",
+    "penalty": "error",
+    "opportunity": "warning",
+    "employee_event": "event"
+}
 
 class EventManager:
-    def __init__(self):
+    market_trend = Published(MARKET) # Assignments publish MARKET on self.bus
+
+    def __init__(self, event_table: Optional[EventTable] = None, seed: Optional[int] = None,
+                 trajectory: Optional[MarketTrajectory] = None):
+        self.bus: Optional[EventBus] = None
         self.market_trend = config.MARKET_TREND_INITIAL
-        self.competitors = [
-            {"name": "SmallBiz Inc.", "market_share": 0.2, "aggressive": False},
-            {"name": "MegaCorp", "market_share": 0.4, "aggressive": True}
-        ]
-        # Research projects are now primarily defined in config.RESEARCH_PROJECTS_SPECS
-        # EventManager will use it for names, costs, durations but won't store its own full copy for effects.
-        self.research_projects_data = config.RESEARCH_PROJECTS_SPECS.copy()
-        # Add a 'completed' flag for EventManager's internal tracking if needed for its own logic,
-        # but GameState.completed_research is the source of truth for player progression.
-        for key in self.research_projects_data:
-            self.research_projects_data[key]['completed'] = False # Initial runtime state
-            
-        self.active_research: Optional[str] = None
-        self.research_progress = 0
+        self.rng = np.random.default_rng(seed)
+        self.competitors = CompetitorPopulation.from_config(self.rng)
+        # Live market rolls (step, special-event roll, event rolls) and competitor actions are drawn
+        # from self.rng in blocks and consumed one day at a time, in the same order by update_market
+        # and advance_market, so skipping N days draws exactly what N daily ticks would
+        self._market_rolls: deque = deque()
+        self._competitor_actions: deque = deque()
+        self._today_event_rolls: Optional[np.ndarray] = None
+        # Research projects are defined in config.RESEARCH_PROJECTS_SPECS; EventManager only reads their
+        # names, so every manager shares that dict (read-only). GameState.completed_research tracks progress.
+        self.research_projects_data = config.RESEARCH_PROJECTS_SPECS
+        # Active research and its completion day are tracked by GameState (see GameState.start_research)
+        # Random events are compiled once from config into O(1) alias samplers
+        self.event_table = event_table if event_table is not None else default_event_table()
+        # Optional pre-generated market rolls; trajectory_day indexes the next day to consume
+        self.trajectory: Optional[MarketTrajectory] = None
+        self.trajectory_day = 0
+        if trajectory is not None:
+            self.use_trajectory(trajectory)
+
+    def fork(self) -> "EventManager":
+        """Return a copy that can roll ahead independently; the event table, trajectory and research specs are shared."""
+        child = copy.copy(self)
+        child.rng = copy.deepcopy(self.rng)
+        child.competitors = copy.deepcopy(self.competitors)
+        child._market_rolls = deque(self._market_rolls)
+        child._competitor_actions = deque(self._competitor_actions)
+        child.bus = None
+        return child
+
+    def restore(self, snapshot: "EventManager") -> None:
+        """Make this manager match an earlier fork, in place; the snapshot itself is left reusable."""
+        bus = self.bus
+        self.__dict__.update(snapshot.fork().__dict__)
+        self.bus = bus
+        if bus is not None:
+            bus.publish(MARKET)
+
+    def use_trajectory(self, trajectory: Optional[MarketTrajectory], start_day: int = 0) -> None:
+        """Consume daily market rolls from a pre-generated trajectory (None goes back to live rolls)."""
+        self.trajectory = trajectory
+        self.trajectory_day = start_day
+        self._market_rolls.clear()
+        self._competitor_actions.clear()
 
     def update_market(self) -> Dict[str, Any]:
         """Update market conditions based on competitor actions."""
-        competitor_influence = sum(c["market_share"] for c in self.competitors)
-        market_pressure = random.uniform(config.MARKET_TREND_DAILY_FLUCTUATION_RANGE[0], config.MARKET_TREND_DAILY_FLUCTUATION_RANGE[1])
-        
-        for competitor in self.competitors:
-            if competitor["aggressive"]:
-                market_pressure += config.AGGRESSIVE_COMPETITOR_MARKET_PRESSURE
+        competitor_influence = self.competitors.total_share
+        if self.trajectory is not None:
+            market_pressure = self.trajectory.value("market_step", self.trajectory_day)
+            special_event = self.trajectory.value("special_event_roll", self.trajectory_day) < config.SPECIAL_EVENT_CHANCE
+        else:
+            market_pressure, special_roll, self._today_event_rolls = self._next_market_roll()
+            special_event = special_roll < config.SPECIAL_EVENT_CHANCE
+        market_pressure += self.competitors.market_pressure()
+        competitor_action = self._next_competitor_action()
+        self.competitors.step()
         
         self.market_trend = max(config.MARKET_TREND_MIN, min(config.MARKET_TREND_MAX, self.market_trend + market_pressure))
         
         events = {
             "market_demand": self.market_trend * (1 - competitor_influence * config.COMPETITOR_INFLUENCE_FACTOR_ON_DEMAND),
-            "special_event": random.random() < config.SPECIAL_EVENT_CHANCE,
-            "market_message": "",
-            "competitor_action": None
+            "special_event": special_event,
+            "market_message": None,
+            "competitor_action": competitor_action
         }
-
-        if random.random() < config.COMPETITOR_ACTION_CHANCE:
-            acting_competitor = random.choice(self.competitors)
-            action_type = random.choice(list(config.COMPETITOR_EFFECTS.keys()))
-            events["competitor_action"] = {
-                "competitor": acting_competitor["name"],
-                "action": action_type
-            }
+        if self.trajectory is not None:
+            self.trajectory_day += 1
 
         if self.market_trend > config.MARKET_BOOM_THRESHOLD:
-            events["market_message"] = f"{Fore.GREEN}The market is booming!{Style.RESET_ALL}"
+            events["market_message"] = MARKET_BOOM
         elif self.market_trend < config.MARKET_DECLINE_THRESHOLD:
-            events["market_message"] = f"{Fore.RED}The market is in decline.{Style.RESET_ALL}"
+            events["market_message"] = MARKET_DECLINE
         return events
 
-    def handle_competitor_action(self, action_details: Dict[str, str]) -> tuple[str, float]:
+    def advance_market(self, days: int) -> Dict[str, Any]:
+        """
+        Run `days` market steps without building per-day messages (for skip-ahead).
+        Returns the day offsets that rolled a special event, the number of competitor
+        actions, the last day's competitor action and the final market demand.
+        """
+        if self.trajectory is not None:
+            start = self.trajectory_day
+            rolls = zip(self.trajectory.slice("market_step", start, days).tolist(),
+                        self.trajectory.slice("special_event_roll", start, days).tolist(), [None] * days)
+        else:
+            start = 0
+            rolls = (self._next_market_roll() for _ in range(days)) # Drawn lazily, in step with competitor actions
+
+        trend = self.market_trend
+        special_event_days: List[int] = []
+        special_event_rolls: List[Optional[np.ndarray]] = []
+        competitor_actions = 0
+        last_action = None
+        for offset, (step, special_roll, event_rolls) in enumerate(rolls):
+            if special_roll < config.SPECIAL_EVENT_CHANCE:
+                special_event_days.append(offset)
+                special_event_rolls.append(event_rolls)
+            # Same order as update_market: pressure, today's competitor action, then the competitor step
+            pressure = step + self.competitors.market_pressure()
+            last_action = self._next_competitor_action()
+            if last_action is not None:
+                competitor_actions += 1
+            self.competitors.step()
+            trend = max(config.MARKET_TREND_MIN, min(config.MARKET_TREND_MAX, trend + pressure))
+            if self.trajectory is not None:
+                self.trajectory_day += 1
+        self.market_trend = trend
+
+        return {
+            "market_demand": trend * (1 - self.competitors.total_share * config.COMPETITOR_INFLUENCE_FACTOR_ON_DEMAND),
+            "special_event_days": special_event_days,
+            "special_event_rolls": special_event_rolls,
+            "competitor_actions": competitor_actions,
+            "last_competitor_action": last_action,
+            "trajectory_start": start
+        }
+
+    def _next_market_roll(self) -> tuple[float, float, np.ndarray]:
+        """Pop today's (market step, special-event roll, event rolls), drawing a new block of days when the buffer runs out."""
+        if not self._market_rolls:
+            block = config.MARKET_ROLL_BLOCK_DAYS
+            low, high = config.MARKET_TREND_DAILY_FLUCTUATION_RANGE
+            steps = self.rng.uniform(low, high, block).tolist()
+            special_rolls = self.rng.random(block).tolist()
+            event_rolls = self.rng.random((block, EVENT_ROLLS_PER_DAY))
+            self._market_rolls.extend(zip(steps, special_rolls, event_rolls))
+        return self._market_rolls.popleft()
+
+    def _next_competitor_action(self) -> Optional[Dict[str, str]]:
+        """Pop today's competitor action, drawing a new block of days when the buffer runs out."""
+        if not self._competitor_actions:
+            block = config.COMPETITOR_ACTION_BLOCK_DAYS
+            if self.trajectory is not None:
+                start = self.trajectory_day
+                self._competitor_actions.extend(self.competitors.actions_from_uniforms(
+                    self.trajectory.slice("competitor_act_roll", start, block),
+                    self.trajectory.slice("competitor_pick_roll", start, block),
+                    self.trajectory.slice("competitor_action_roll", start, block)
+                ))
+            else:
+                self._competitor_actions.extend(self.competitors.draw_actions(block, self.rng))
+        return self._competitor_actions.popleft()
+
+    def handle_competitor_action(self, action_details: Dict[str, str]) -> tuple[EventMessage, float]:
         """Handle competitor actions and their effects."""
-        competitor_name = action_details["competitor"]
+        payload = {"competitor": action_details["competitor"]}
         action_type = action_details["action"]
         effect_spec = config.COMPETITOR_EFFECTS.get(action_type)
         if effect_spec:
-            message = effect_spec["message_template"].format(competitor_name)
-            return message, effect_spec["market_trend_effect"]
-        return f"{competitor_name} did something unexpected!", 0.0
-
-    def update_research(self) -> Dict[str, Any]:
-        """Update research progress and return research status."""
-        if not self.active_research:
-            return {"status": "no_research"}
-            
-        self.research_progress += 1
-        # Use self.research_projects_data which refers to config specs
-        project_config = self.research_projects_data[self.active_research]
-        project_duration = project_config["duration"]
-        
-        if self.research_progress >= project_duration:
-            # The 'completed' flag in self.research_projects_data is just for EventManager's internal reference if needed.
-            # GameState.completed_research is the canonical list of *player completed* projects.
-            # If we want to mark it here for some reason: 
-            # self.research_projects_data[self.active_research]['completed'] = True
-            
-            completed_project_key = self.active_research
-            self.active_research = None
-            self.research_progress = 0
-            return {
-                "status": "completed",
-                "project": completed_project_key
-            }
-            
-        return {
-            "status": "in_progress",
-            "progress": (self.research_progress / project_duration) * 100 if project_duration > 0 else 0
-        }
+            return EventMessage("competitor:" + action_type, "warning", payload), effect_spec["market_trend_effect"]
+        return EventMessage("competitor_unknown", "warning", payload), 0.0
 
     def get_random_event(self) -> Dict[str, Any]:
         """Generate random events that can affect the business."""
-        events = [
-            {"type": "bonus", "chance": 0.4},
-            {"type": "penalty", "chance": 0.3},
-            {"type": "opportunity", "chance": 0.2},
-            {"type": "employee_event", "chance": 0.1}
-        ]
-        
-        roll = random.random()
-        current_threshold = 0
-        
-        for event in events:
-            current_threshold += event["chance"]
-            if roll < current_threshold:
-                return self._generate_event_details(event["type"])
-        
-        return {"type": "none"}
-
-    def _generate_event_details(self, event_type: str) -> Dict[str, Any]:
-        """Generate detailed event information based on event type."""
-        if event_type == "bonus":
-            amount = random.randint(20, 50)
-            return {
-                "type": "bonus",
-                "amount": amount,
-                "message": f"{Fore.GREEN}SPECIAL EVENT: You received a bonus of ${amount}!{Style.RESET_ALL}"
-            }
-        elif event_type == "penalty":
-            amount = random.randint(10, 30)
-            return {
-                "type": "penalty",
-                "amount": amount,
-                "message": f"{Fore.RED}SPECIAL EVENT: You had to pay ${amount} in unexpected costs!{Style.RESET_ALL}"
-            }
-        elif event_type == "opportunity":
-            return {
-                "type": "opportunity",
-                "message": f"{Fore.YELLOW}SPECIAL EVENT: Market prices are especially favorable tomorrow!{Style.RESET_ALL}",
-                "market_boost": 0.3
-            }
-        elif event_type == "employee_event":
-            event = random.choice([
-                {"effect": "productivity", "value": 1.5, "duration": 2},
-                {"effect": "strike", "value": 0.5, "duration": 1},
-                {"effect": "training", "value": 1.2, "duration": 3}
-            ])
-            return {
-                "type": "employee_event",
-                "event": event,
-                "message": f"{Fore.CYAN}SPECIAL EVENT: Employee morale affected!{Style.RESET_ALL}"
-            }
-        
-        return {"type": "none"} 
\ No newline at end of file
+        if self.trajectory is not None:
+            # Replay the rolls reserved for the day update_market just consumed
+            rolls = self.trajectory.event_rng(max(0, self.trajectory_day - 1))
+        elif self._today_event_rolls is not None:
+            rolls = DayRolls(self._today_event_rolls)
+        else:
+            rolls = DayRolls(self.rng.random(EVENT_ROLLS_PER_DAY))
+        return self._generate_event_details(self.event_table.draw_spec(rolls), rolls)
+
+    def get_random_events_for_days(self, day_offsets: List[int], trajectory_start: int = 0,
+                                   event_rolls: Optional[List[np.ndarray]] = None) -> Dict[int, List[Dict[str, Any]]]:
+        """Draw the random events for the given special-event day offsets (see advance_market)."""
+        if self.trajectory is not None:
+            days = [self.trajectory.event_rng(trajectory_start + offset) for offset in day_offsets]
+        elif event_rolls is not None:
+            days = [DayRolls(rolls) for rolls in event_rolls]
+        else:
+            days = [DayRolls(rolls) for rolls in self.rng.random((len(day_offsets), EVENT_ROLLS_PER_DAY))]
+        events = [self._generate_event_details(self.event_table.draw_spec(rolls), rolls) for rolls in days]
+        return {offset: [event] for offset, event in zip(day_offsets, events) if event["type"] != "none"}
+
+    def get_random_events(self, count: int) -> List[Dict[str, Any]]:
+        """Draw count random events at once (for batch simulations). Entries may be {"type": "none"}."""
+        days = [DayRolls(rolls) for rolls in self.rng.random((count, EVENT_ROLLS_PER_DAY))]
+        return [self._generate_event_details(self.event_table.draw_spec(rolls), rolls) for rolls in days]
+
+    def _generate_event_details(self, event_spec: Dict[str, Any], rng: Any = random) -> Dict[str, Any]:
+        """Generate detailed event information from a compiled event spec."""
+        details = self.event_table.build_event(event_spec, rng)
+        if details["type"] != "none":
+            details["message_type"] = EVENT_MESSAGE_TYPES.get(details["type"], "info")
+        return details
+
+    @staticmethod
+    def event_message(details: Dict[str, Any]) -> EventMessage:
+        """The message for a random event from get_random_event(s), formatted from its details when shown."""
+        return EventMessage(details["template_id"], details["message_type"], details)
@@ -1,62 +1,184 @@
+import copy
 import random
 import json
-from typing import Dict, Any, List, Optional
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
 import config # Import the config file
+from scheduler import EffectScheduler
+from loan_ledger import LoanLedger, product_rate
+from workforce import Workforce
+from inventory import LotInventory
+from company import Company, Branch
+from work_rules import work_units, marketing_reduction
+from event_bus import EventBus, Published, MONEY, REPUTATION, DAY, INVENTORY, UPGRADES, EMPLOYEES, LOANS, RESEARCH, MARKET, BRANCHES
+
+# Substructures a fork shares with its parent until either side writes to them (see GameState.fork)
+COPY_ON_WRITE_FIELDS = ("inventory", "prices", "upgrades", "employees", "loans", "completed_research", "company", "scheduler")
+# Bus topic published when a copy-on-write field is written through own()
+FIELD_TOPICS = {"inventory": INVENTORY, "prices": MARKET, "upgrades": UPGRADES, "employees": EMPLOYEES,
+                "loans": LOANS, "completed_research": RESEARCH, "company": BRANCHES}
+
 
 class GameState:
     """
     GameState class represents the Model in MVC architecture.
     Encapsulates all game state and business logic.
     """
+    # Assigning these publishes a change event on self.bus (see event_bus.py)
+    money = Published(MONEY)
+    reputation = Published(REPUTATION)
+    day = Published(DAY)
+    storage_capacity = Published(INVENTORY)
+    market_trend = Published(MARKET)
+    current_market_demand = Published(MARKET)
+    active_research_project = Published(RESEARCH)
+
     def __init__(self):
+        self.bus: Optional[EventBus] = None # Set by the controller; views subscribe to its topics
         # Game state variables from config
         self.money = config.INITIAL_MONEY
         self.reputation = config.INITIAL_REPUTATION
         self.day = config.INITIAL_DAY
-        self.inventory = {
-            "basic_supplies": 0,
-            "premium_supplies": 0,
-            "equipment": 0
-        }
+        self.inventory = LotInventory(["basic_supplies", "premium_supplies", "equipment"])
         self.prices = config.SUPPLY_PRICES.copy() # Use copy if prices can change in-game
         self.upgrades = {
             "automation": False,
             "marketing": 0,  # Level 0-3
             "storage": 0     # Level 0-2
         }
-        self.employees: List[Dict[str, Any]] = []
+        self.employees = Workforce()
         self.market_trend = config.MARKET_TREND_INITIAL
         self.current_market_demand = config.MARKET_TREND_INITIAL
         self.storage_capacity = config.INITIAL_STORAGE_CAPACITY
-        self.loan = 0
-        self.loan_interest = config.ANNUAL_LOAN_INTEREST_RATE
+        self.loans = LoanLedger()
+        self.loan_interest = product_rate(config.DEFAULT_LOAN_PRODUCT) # Rate of the default credit line
         
         # Research related - for future integration with EventManager.research_projects
         self.research_points = 0
         self.active_research_project: Optional[str] = None
         self.completed_research: List[str] = []
         self.research_progress_today = 0 # Tracks progress made today for display
-        self.employee_productivity_modifier = 1.0 # For employee events
-        self.employee_event_duration = 0
-        
-    def save_game(self) -> bool:
-        """Save the current game state to a file."""
-        game_data = {
+        self.last_work: Dict[str, Any] = {} # income, cogs, profit and margin of the latest work action
+        self.research_due_day: Optional[int] = None
+        self.market_boost = 0.0 # Sum of temporary "opportunity" boosts still active
+
+        # Branches beyond the main location; ticked daily by GameEngine
+        self.company = Company()
+
+        # Timed effects (research completion, employee event expiry, market boosts) fire from here
+        self.scheduler = EffectScheduler()
+        self._shared: set = set() # COPY_ON_WRITE_FIELDS still shared with a fork or its parent
+
+    def fork(self) -> "GameState":
+        """
+        Return a cheap copy of this state for what-if simulations.
+
+        Scalars are copied; the substructures in COPY_ON_WRITE_FIELDS are shared
+        with the fork until either side writes to one, which then takes a private
+        copy of just that field (see own()). A fork that only changes money and
+        reputation allocates nothing beyond its attribute dict.
+        """
+        child = object.__new__(GameState)
+        child.__dict__.update(self.__dict__)
+        child.last_work = dict(self.last_work)
+        child.bus = None # What-if forks must not update the views
+        child._shared = set(COPY_ON_WRITE_FIELDS)
+        self._shared = set(COPY_ON_WRITE_FIELDS)
+        return child
+
+    def differs_from(self, snapshot: "GameState") -> bool:
+        """
+        True if this state changed since `snapshot` was forked from it. Copy-on-write
+        fields are compared by identity (writes go through own()), the rest by value.
+        """
+        mine, theirs = self.__dict__, snapshot.__dict__
+        if mine.keys() != theirs.keys():
+            return True
+        for name, value in mine.items():
+            if name in ("bus", "_shared"):
+                continue
+            other = theirs[name]
+            if name in COPY_ON_WRITE_FIELDS:
+                if value is not other:
+                    return True
+            elif value is not other and value != other:
+                return True
+        return False
+
+    def restore(self, snapshot: "GameState") -> None:
+        """Make this state match an earlier fork, in place, so views and the engine keep their reference."""
+        bus = self.bus
+        self.__dict__.clear()
+        self.__dict__.update(snapshot.__dict__)
+        self.last_work = dict(snapshot.last_work)
+        self.bus = bus
+        if bus is not None:
+            bus.publish_all()
+        # The snapshot may be restored again (redo), so both sides copy before writing
+        self._shared = set(COPY_ON_WRITE_FIELDS)
+        snapshot._shared = set(COPY_ON_WRITE_FIELDS)
+
+    def own(self, field: str) -> Any:
+        """Return a copy-on-write field, first taking a private copy if it may be shared with a fork."""
+        if field in self._shared:
+            setattr(self, field, copy.deepcopy(getattr(self, field)))
+            self._shared.discard(field)
+        if self.bus is not None and field in FIELD_TOPICS:
+            self.bus.publish(FIELD_TOPICS[field])
+        return getattr(self, field)
+
+    @property
+    def loan(self) -> int:
+        """Total outstanding balance across all loans."""
+        return self.loans.total_outstanding
+
+    @property
+    def employee_productivity_modifier(self) -> float:
+        """Average employee event modifier across the workforce (1.0 when nobody is on an event)."""
+        return self.employees.summary()["average_event_modifier"]
+
+    @property
+    def employee_event_duration(self) -> int:
+        """Days left on the longest running employee event (0 if none)."""
+        end_day = self.employees.summary()["last_event_end_day"]
+        return max(0, end_day - self.day) if end_day >= 0 else 0
+
+    @property
+    def research_progress(self) -> int:
+        """Days of progress on the active research project."""
+        if not self.active_research_project or self.research_due_day is None:
+            return 0
+        duration = config.RESEARCH_PROJECTS_SPECS[self.active_research_project]["duration"]
+        return max(0, min(duration, duration - (self.research_due_day - self.day)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The saved form of the game state (what save_game writes)."""
+        return {
             "money": self.money,
             "reputation": self.reputation,
             "day": self.day,
-            "inventory": self.inventory,
+            "inventory": dict(self.inventory),
+            "inventory_lots": self.inventory.to_dict(),
             "upgrades": self.upgrades,
-            "employees": self.employees,
+            "employees": self.employees.to_list(),
             "loan": self.loan,
+            "loans": self.loans.to_list(),
             "market_trend": self.market_trend,
             "current_market_demand": self.current_market_demand,
             "storage_capacity": self.storage_capacity,
             # Add research state for saving
             "active_research_project": self.active_research_project,
             "completed_research": self.completed_research,
-            "research_points": self.research_points # If EventManager.research_progress is used for this
+            "research_points": self.research_points, # If EventManager.research_progress is used for this
+            "research_due_day": self.research_due_day,
+            "market_boost": self.market_boost,
+            "scheduled_effects": self.scheduler.to_list(),
+            "company": self.company.to_dict()
         }
+
+    def save_game(self) -> bool:
+        """Save the current game state to a file."""
+        game_data = self.to_dict()
         try:
             with open("savegame.json", "w") as f:
                 json.dump(game_data, f)
@@ -72,10 +194,24 @@ class GameState:
                 self.money = game_data["money"]
                 self.reputation = game_data["reputation"]
                 self.day = game_data["day"]
-                self.inventory = game_data["inventory"]
+                if "inventory_lots" in game_data:
+                    self.inventory = LotInventory.from_dict(game_data["inventory_lots"], game_data["inventory"].keys())
+                else:
+                    # Older saves only stored counts; cost them at today's prices
+                    self.inventory = LotInventory.from_counts(game_data["inventory"], self.prices, self.day)
                 self.upgrades = game_data["upgrades"]
-                self.employees = game_data["employees"]
-                self.loan = game_data.get("loan", 0)
+                self.employees = Workforce.from_list(game_data["employees"])
+                if game_data.get("employee_event_end_day") is not None and self.employees:
+                    # Older saves kept one global employee event; it becomes everyone's event
+                    self.employees.apply_event(slice(0, len(self.employees)), game_data.get("employee_productivity_modifier", 1.0),
+                                               game_data["employee_event_end_day"])
+                if "loans" in game_data:
+                    self.loans = LoanLedger.from_list(game_data["loans"])
+                else:
+                    # Older saves had a single loan; it becomes one credit line
+                    self.loans = LoanLedger()
+                    if game_data.get("loan", 0) > 0:
+                        self.loans.add_loan(game_data["loan"], config.DEFAULT_LOAN_PRODUCT, self.day)
                 self.market_trend = game_data.get("market_trend", 1.0)
                 self.current_market_demand = game_data.get("current_market_demand", 1.0)
                 self.storage_capacity = game_data.get("storage_capacity", 50)
@@ -83,6 +219,16 @@ class GameState:
                 self.active_research_project = game_data.get("active_research_project")
                 self.completed_research = game_data.get("completed_research", [])
                 self.research_points = game_data.get("research_points", 0)
+                self.research_due_day = game_data.get("research_due_day")
+                self.market_boost = game_data.get("market_boost", 0.0)
+                self.scheduler = EffectScheduler.from_list(game_data.get("scheduled_effects", []))
+                self.company = Company.from_dict(game_data["company"]) if "company" in game_data else Company()
+                self._shared = set() # Every field was just rebuilt from the file
+                if self.bus is not None:
+                    self.bus.publish_all()
+                if self.active_research_project and self.research_due_day is None:
+                    # Older saves did not record research progress; restart the project
+                    self._schedule_research(self.active_research_project)
             return True
         except (FileNotFoundError, json.JSONDecodeError, KeyError):
             return False
@@ -101,7 +247,7 @@ class GameState:
             return False
             
         self.money -= cost
-        self.inventory[supply_type] += amount
+        self.own("inventory").add(supply_type, amount, self.prices[supply_type], self.day)
         return True
 
     def work(self) -> int:
@@ -112,42 +258,87 @@ class GameState:
 
         base_income = random.randint(config.BASE_WORK_INCOME_MIN, config.BASE_WORK_INCOME_MAX)
         market_modifier = self.current_market_demand 
-        
-        automation_base_bonus = config.UPGRADE_SPECS["automation"]["income_bonus_multiplier"] if self.upgrades["automation"] else 1.0
-        # Check for research-enhanced automation
-        automation_efficiency_bonus = self.upgrades.get("automation_efficiency", 1.0)
-        automation_bonus = automation_base_bonus * automation_efficiency_bonus
-
-        employee_bonus = (1 + (len(self.employees) * config.EMPLOYEE_PRODUCTIVITY_BONUS_PER_EMPLOYEE)) * self.employee_productivity_modifier
+        automation_bonus, employee_bonus = self._work_bonuses()
         
         income = int(base_income * market_modifier * automation_bonus * employee_bonus)
         
-        supply_used_bonus = 1.0
-        if self.inventory["premium_supplies"] > 0:
-            supply_used_bonus = config.SUPPLY_USAGE_EFFECTS["premium_supplies"]["income_multiplier"]
-            self.inventory["premium_supplies"] -= 1
-        elif self.inventory["basic_supplies"] > 0:
-            supply_used_bonus = config.SUPPLY_USAGE_EFFECTS["basic_supplies"]["income_multiplier"]
-            self.inventory["basic_supplies"] -= 1
-        elif self.inventory["equipment"] > 0:
-            supply_used_bonus = config.SUPPLY_USAGE_EFFECTS["equipment"]["income_multiplier"]
-            self.inventory["equipment"] -= 1
-        else: # Should not happen if total_supplies > 0, but as a safeguard
+        supply_used = next((s for s in config.SUPPLY_CONSUMPTION_ORDER if self.inventory.get(s, 0) > 0), None)
+        if supply_used is None: # Should not happen if total_supplies > 0, but as a safeguard
             return 0
+        supply_used_bonus = config.SUPPLY_USAGE_EFFECTS[supply_used]["income_multiplier"]
+        cogs = self.own("inventory").consume(supply_used, 1)
         
         income = int(income * supply_used_bonus)
+        self.last_work = {
+            "supply_used": supply_used,
+            "income": income,
+            "cogs": cogs,
+            "profit": income - cogs,
+            "margin": (income - cogs) / income if income > 0 else 0.0,
+        }
         self.money += income
         rep_loss = random.randint(config.REPUTATION_LOSS_WORK_MIN, config.REPUTATION_LOSS_WORK_MAX)
         rep_loss_reduction = self.upgrades["marketing"] * config.UPGRADE_SPECS["marketing"]["rep_loss_reduction_per_level"]
         rep_loss = max(1, rep_loss - rep_loss_reduction)
         self.reputation -= rep_loss
         
-        employee_cost = len(self.employees) * config.EMPLOYEE_DAILY_SALARY
+        employee_cost = self.employees.daily_payroll()
         if employee_cost > 0:
             self.money -= employee_cost
         
         return income
 
+    def _work_bonuses(self) -> Tuple[float, float]:
+        """Return the (automation, employee) income multipliers for work."""
+        automation_base_bonus = config.UPGRADE_SPECS["automation"]["income_bonus_multiplier"] if self.upgrades["automation"] else 1.0
+        # Check for research-enhanced automation
+        automation_efficiency_bonus = self.upgrades.get("automation_efficiency", 1.0)
+        automation_bonus = automation_base_bonus * automation_efficiency_bonus
+
+        # Employee events act through the per-employee modifiers in productivity()
+        employee_bonus = 1 + (self.employees.productivity() * config.EMPLOYEE_PRODUCTIVITY_BONUS_PER_EMPLOYEE)
+        return automation_bonus, employee_bonus
+
+    def branch_work_terms(self) -> Tuple[float, int]:
+        """The (automation bonus, reputation loss reduction) the company's upgrades give every branch."""
+        automation_bonus, _ = self._work_bonuses()
+        return automation_bonus, marketing_reduction(self.upgrades["marketing"])
+
+    def work_batch(self, units: int) -> Dict[str, Any]:
+        """
+        Process up to `units` supply units as one bulk work order and return a summary.
+
+        Every unit earns its own income roll, scaled like work() and by the multiplier of
+        the supply it uses; all rolls are drawn in one vectorized pass. Supplies are used in
+        SUPPLY_CONSUMPTION_ORDER. Reputation loss is the summed per-unit loss scaled by
+        WORK_BATCH_REPUTATION_FACTOR, and payroll is charged once for the whole batch.
+        """
+        units = min(units, sum(self.inventory.values()))
+        summary: Dict[str, Any] = {"units": 0, "income": 0, "cogs": 0, "profit": 0, "margin": 0.0,
+                                   "reputation_loss": 0, "payroll": 0, "supplies_used": {}}
+        if units <= 0:
+            return summary
+
+        # Seeded from the random module so seeded runs stay reproducible
+        rng = np.random.default_rng(random.getrandbits(64))
+        automation_bonus, employee_bonus = self._work_bonuses()
+        worked = work_units(self.own("inventory"), units, (self.current_market_demand, automation_bonus, employee_bonus),
+                            marketing_reduction(self.upgrades["marketing"]), rng)
+        income = worked["income"]
+
+        payroll = self.employees.daily_payroll()
+        self.money += income - payroll
+        self.reputation -= worked["reputation_loss"]
+
+        summary.update(worked)
+        summary.update({
+            "profit": income - worked["cogs"],
+            "margin": (income - worked["cogs"]) / income if income > 0 else 0.0,
+            "payroll": payroll,
+        })
+        self.last_work = summary
+        return summary
+
     def rest(self) -> int:
         """Handle resting to recover reputation."""
         rep_gain = config.BASE_REPUTATION_GAIN_REST + \
@@ -164,16 +355,20 @@ class GameState:
         # Using EMPLOYEE_HIRE_COST from config, though currently 0
         if self.money >= config.EMPLOYEE_HIRE_COST: 
             self.money -= config.EMPLOYEE_HIRE_COST 
-            self.employees.append({"salary": config.EMPLOYEE_DAILY_SALARY, "id": random.randint(1000,9999)})
+            self.own("employees").hire()
             return True
         return False
 
     def fire_employee(self) -> bool:
-        """Fire the most recently hired employee."""
-        if self.employees:
-            self.employees.pop()
-            return True
-        return False
+        """Fire the employee in the last roster slot."""
+        return bool(self.employees) and self.own("employees").fire()
+
+    def open_branch(self, name: Optional[str] = None) -> Optional[Branch]:
+        """Pay BRANCH_OPEN_COST and open a new branch. Returns the branch, or None if unaffordable."""
+        if self.money < config.BRANCH_OPEN_COST:
+            return None
+        self.money -= config.BRANCH_OPEN_COST
+        return self.own("company").open_branch(name, self.day)
 
     def purchase_upgrade(self, upgrade_type: str) -> bool:
         """Purchase a business upgrade."""
@@ -197,43 +392,109 @@ class GameState:
             
         self.money -= cost
         if spec["max_level"] == 1:
-            self.upgrades[upgrade_type] = True
+            self.own("upgrades")[upgrade_type] = True
         else:
-            self.upgrades[upgrade_type] = current_level_or_status + 1
+            self.own("upgrades")[upgrade_type] = current_level_or_status + 1
         
         # Apply direct effects like storage capacity increase
         if upgrade_type == "storage":
             self.storage_capacity += spec["storage_increase_per_level"]
         return True
 
-    def take_loan(self, amount: int) -> bool:
-        """Take a loan."""
+    def take_loan(self, amount: int, product_key: Optional[str] = None) -> bool:
+        """Take a loan of the given product (the default credit line if omitted)."""
+        product_key = product_key or config.DEFAULT_LOAN_PRODUCT
         max_loan = config.MAX_LOAN_TOTAL - self.loan
-        if amount <= 0 or amount > max_loan:
+        if product_key not in config.LOAN_PRODUCTS or amount <= 0 or amount > max_loan:
             return False
-            
-        self.loan += amount
+
+        loan_id = self.own("loans").add_loan(amount, product_key, self.day)
+        due_day = self.loans.next_due_day(loan_id, self.day)
+        if due_day is not None:
+            self.own("scheduler").schedule(due_day, "loan_due", loan_id=loan_id)
         self.money += amount
         return True
 
     def repay_loan(self, amount: int) -> bool:
-        """Repay a portion of the loan."""
+        """Repay part of the outstanding loans, oldest loan first."""
         if amount <= 0 or amount > self.loan or amount > self.money:
             return False
-            
-        self.loan -= amount
+
+        self.own("loans").repay(amount)
         self.money -= amount
         return True
 
     def apply_daily_interest(self) -> int:
-        """Apply daily interest to the loan and return the interest amount."""
+        """Apply one day of interest to every loan and return the total interest."""
+        # Interest is not automatically paid from cash, it increases each loan's balance
         if self.loan <= 0:
             return 0
-            
-        interest = int(self.loan * self.loan_interest / 365)
-        self.loan += interest # Interest adds to principal
-        # self.money -= interest # Interest is not automatically paid from cash, it increases loan amount
-        return interest
+        return self.own("loans").accrue_daily()
+
+    def apply_interest_for_days(self, days: int) -> int:
+        """Apply `days` days of daily interest in closed form and return the total interest."""
+        if self.loan <= 0 or days <= 0:
+            return 0
+        return self.own("loans").accrue_days(days)
+
+    def _collect_loan_payment(self, effect: Dict[str, Any]) -> None:
+        """Take a scheduled loan payment from cash. What cash cannot cover stays on the loan."""
+        loan_id = effect["loan_id"]
+        if loan_id not in self.loans:
+            # Repaid early and compacted out of the ledger; nothing is due
+            effect["paid"] = effect["missed"] = 0
+            return
+        effect["product"] = self.loans.product(loan_id)
+        due = self.loans.payment_due(loan_id, self.day)
+        paid = self.own("loans").pay_loan(loan_id, min(due, max(0, self.money)))
+        self.money -= paid
+        effect["paid"] = paid
+        effect["missed"] = due - paid
+        next_due = self.loans.next_due_day(loan_id, self.day)
+        if next_due is not None and self.loans.outstanding(loan_id) > 0:
+            self.own("scheduler").schedule(next_due, "loan_due", loan_id=loan_id)
+
+    def advance_days(self, days: int, events_by_offset: Optional[Dict[int, List[Dict[str, Any]]]] = None) -> Dict[str, Any]:
+        """
+        Skip ahead up to `days` idle days in one call.
+
+        events_by_offset maps a day offset (0 = today) to random events that happen at the
+        end of that day. Only days with events or due scheduled effects are processed one
+        by one; the quiet stretches in between just compound interest in closed form.
+        Stops early if the game ends.
+        """
+        events_by_offset = events_by_offset or {}
+        event_offsets = sorted(offset for offset in events_by_offset if 0 <= offset < days)
+        start_day = self.day
+        summary: Dict[str, Any] = {"days": 0, "interest": 0, "fired": [], "events": []}
+
+        offset = 0
+        next_event_idx = 0
+        while offset < days and not self.is_game_over():
+            # The next day that needs individual processing: an event day, or the day before an effect is due
+            stop = days - 1
+            if next_event_idx < len(event_offsets):
+                stop = min(stop, event_offsets[next_event_idx])
+            next_due = self.scheduler.next_due_day()
+            if next_due is not None:
+                stop = min(stop, max(offset, next_due - start_day - 1))
+
+            quiet_days = stop - offset
+            if quiet_days > 0:
+                summary["interest"] += self.apply_interest_for_days(quiet_days)
+                self.day += quiet_days
+
+            for event in events_by_offset.get(stop, []):
+                self.apply_random_event_effect(event)
+                summary["events"].append(event)
+            if next_event_idx < len(event_offsets) and event_offsets[next_event_idx] == stop:
+                next_event_idx += 1
+            summary["interest"] += self.apply_daily_interest()
+            summary["fired"].extend(self.advance_day())
+            offset = stop + 1
+
+        summary["days"] = self.day - start_day
+        return summary
 
     def handle_special_event(self, event_type: str) -> Dict[str, Any]:
         """Handle a special event and return its effects."""
@@ -256,14 +517,69 @@ class GameState:
             
         return results
 
-    def advance_day(self) -> None:
-        """Advance to the next day and handle daily decay/updates."""
+    def advance_day(self) -> List[Dict[str, Any]]:
+        """Advance to the next day, fire scheduled effects that are now due and return them."""
         self.day += 1
         self.research_progress_today = 0 # Reset for next day
-        if self.employee_event_duration > 0:
-            self.employee_event_duration -=1
-            if self.employee_event_duration == 0:
-                self.employee_productivity_modifier = 1.0 # Reset modifier
+        if self.employees.summary()["on_event"]:
+            self.own("employees").expire_events(self.day)
+        fired = self.process_scheduled_effects()
+        spoiled = self.expire_supplies()
+        if spoiled:
+            fired.append({"kind": "supplies_spoiled", "due_day": self.day, "spoiled": spoiled})
+        return fired
+
+    def expire_supplies(self) -> Dict[str, int]:
+        """Remove supply lots older than their shelf life and return units spoiled per type."""
+        spoiled = {}
+        for supply_type, shelf_life in config.SUPPLY_SHELF_LIFE_DAYS.items():
+            removed = self.own("inventory").expire(supply_type, self.day - shelf_life)
+            if removed:
+                spoiled[supply_type] = removed
+        return spoiled
+
+    def process_scheduled_effects(self) -> List[Dict[str, Any]]:
+        """Apply every scheduled effect due today and return the fired effects."""
+        next_due = self.scheduler.next_due_day()
+        if next_due is None or next_due > self.day:
+            return []
+        fired = self.own("scheduler").pop_due(self.day)
+        for effect in fired:
+            kind = effect["kind"]
+            if kind == "employee_event_end":
+                pass # Only in older saves; employee events now expire per employee in advance_day
+            elif kind == "market_boost_end":
+                self.market_boost = max(0.0, self.market_boost - effect.get("amount", 0.0))
+            elif kind == "research_complete":
+                self.research_due_day = None
+                self.apply_research_completion(effect.get("project"))
+            elif kind == "loan_due":
+                self._collect_loan_payment(effect)
+            # Other kinds are returned untouched for the caller to handle
+        return fired
+
+    def set_market_conditions(self, market_trend: float, market_demand: float) -> None:
+        """Set today's market from EventManager, applying any active temporary boost."""
+        boosted_trend = min(config.MARKET_TREND_MAX, market_trend + self.market_boost)
+        self.market_trend = boosted_trend
+        self.current_market_demand = market_demand * (boosted_trend / market_trend) if market_trend > 0 else market_demand
+
+    def start_research(self, project_key: str) -> bool:
+        """Pay for and start a research project; completion is scheduled for day + duration."""
+        project_spec = config.RESEARCH_PROJECTS_SPECS.get(project_key)
+        if not project_spec or self.active_research_project or project_key in self.completed_research:
+            return False
+        if self.money < project_spec["cost"]:
+            return False
+        self.money -= project_spec["cost"]
+        self._schedule_research(project_key)
+        return True
+
+    def _schedule_research(self, project_key: str) -> None:
+        self.own("scheduler").cancel_kind("research_complete")
+        self.active_research_project = project_key
+        self.research_due_day = self.day + config.RESEARCH_PROJECTS_SPECS[project_key]["duration"]
+        self.scheduler.schedule(self.research_due_day, "research_complete", project=project_key)
 
     def get_income_potential(self) -> int:
         """Calculate potential income based on current stats."""
@@ -272,7 +588,7 @@ class GameState:
             
         base_income = 60  # Average of random 40-80
         automation_bonus = 1.5 if self.upgrades["automation"] else 1.0
-        employee_bonus = (1 + (len(self.employees) * 0.4)) * self.employee_productivity_modifier
+        employee_bonus = 1 + (self.employees.productivity() * 0.4)
         return int(base_income * automation_bonus * employee_bonus)
 
     def get_safe_loan_amount(self) -> int:
@@ -308,12 +624,17 @@ class GameState:
             self.money -= event_details.get("amount", 0)
             self.money = max(0, self.money) # Prevent negative money from this event alone
         elif event_type == "opportunity":
-            self.market_trend = min(config.MARKET_TREND_MAX, self.market_trend + event_details.get("market_boost", 0))
+            boost = event_details.get("market_boost", 0)
+            self.market_trend = min(config.MARKET_TREND_MAX, self.market_trend + boost)
+            # The boost holds through tomorrow and expires the day after
+            self.market_boost += boost
+            self.own("scheduler").schedule(self.day + 2, "market_boost_end", amount=boost)
         elif event_type == "employee_event":
             emp_event = event_details.get("event", {})
-            self.employee_productivity_modifier = emp_event.get("value", 1.0)
-            self.employee_event_duration = emp_event.get("duration", 0)
-            # The message is in event_details["message"]
+            # Affects everyone employed now, replacing their current event; advance_day expires it
+            if self.employees:
+                end_day = self.day + emp_event.get("duration", 0)
+                self.own("employees").apply_event(slice(0, len(self.employees)), emp_event.get("value", 1.0), end_day)
 
     def apply_research_completion(self, project_key: Optional[str]) -> None:
         """Apply benefits of a completed research project."""
@@ -328,12 +649,12 @@ class GameState:
             self.storage_capacity += 75 
             applied_effect = True
         elif project_key == "smart_automation":
-            self.upgrades["automation_efficiency"] = self.upgrades.get("automation_efficiency", 1.0) * 1.1 
+            self.own("upgrades")["automation_efficiency"] = self.upgrades.get("automation_efficiency", 1.0) * 1.1 
             applied_effect = True
         elif project_key == "eco_friendly_practices": # Renamed key in config
             self.reputation = min(100, self.reputation + 10)
             applied_effect = True
         
         if applied_effect:
-            self.completed_research.append(project_key)
+            self.own("completed_research").append(project_key)
             self.active_research_project = None 
\ No newline at end of file
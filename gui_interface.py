@@ -1,8 +1,16 @@
+import time
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog
 from business_map import BusinessMap
+from map_canvas import BusinessMapCanvas
 from game_state import GameState
-from colorama import Fore, Style
+from engine import GameEngine
+from history import UndoHistory
+from lag_monitor import LagMonitor
+from notification_feed import NotificationFeed
+from profiling import phased, ACTION, RENDER, DIALOG
+from event_bus import MONEY, REPUTATION, DAY, INVENTORY, UPGRADES, EMPLOYEES, LOANS, RESEARCH, MARKET, BRANCHES
+from loan_ledger import product_rate
 from typing import Optional, Any
 import config # Import config
 
@@ -33,14 +41,32 @@ class ToolTip:
             self.tooltip = None
 
 class TycoonGUI:
-    def __init__(self, game_state: GameState, controller: Optional[Any] = None):
-        """Initialize the GUI with a GameState instance and optional controller reference."""
+    def __init__(self, game_state: GameState, controller: Optional[Any] = None, lag_log: Optional[str] = None):
+        """
+        Initialize the GUI with a GameState instance and optional controller reference.
+        `lag_log` is a file the lag monitor's summary line is appended to periodically.
+        """
         self.game = game_state
         self.controller_ref = controller
+        self.business_map = BusinessMap(game_state) # Kept between map windows so unchanged rooms are not re-rendered
+        self.map_canvas: Optional[BusinessMapCanvas] = None # The live map while its window is open
+        # Undo steps are shared with the controller so both interfaces see the same history
+        self.history = controller.history if controller is not None else UndoHistory(GameEngine(game_state))
+        # Each status widget group is redrawn only when the bus reports a change to what it shows
+        self.bus = controller.bus if controller is not None else None
+        self._pending_update: Optional[str] = None # Tk "after" id of a throttled status update
+        if self.bus is not None:
+            self.bus.subscribe(lambda changes: self._render_money(), MONEY)
+            self.bus.subscribe(lambda changes: self._render_reputation(), REPUTATION)
+            self.bus.subscribe(lambda changes: self._render_details(), DAY, INVENTORY, UPGRADES, EMPLOYEES, LOANS, RESEARCH)
         self.root = tk.Tk()
         self.root.title("Business Tycoon Adventure")
         self.root.geometry("900x700") # Increased window size
         self.root.configure(bg="#f0f0f0") # Light grey background
+        # Handlers and dialog opens are timed and a heartbeat measures mainloop stalls (F3 shows the numbers)
+        self.lag_monitor = LagMonitor(self.root)
+        self.lag_log = lag_log
+        self._lag_overlay: Optional[tk.Label] = None
 
         # --- Style Configuration ---
         self.style = ttk.Style(self.root)
@@ -114,11 +140,16 @@ class TycoonGUI:
         self.setup_ui()
 
     def setup_keyboard_shortcuts(self):
-        self.root.bind("<Control-s>", lambda e: self.save_game())
-        self.root.bind("<Control-q>", lambda e: self.quit_game())
-        self.root.bind("<F1>", lambda e: self.show_help())
-        self.root.bind("<F2>", lambda e: self.show_business_map())
-
+        timed = self.lag_monitor.wrap
+        self.root.bind("<Control-s>", timed("Save Game", lambda e: self.save_game()))
+        self.root.bind("<Control-q>", timed("Quit", lambda e: self.quit_game()))
+        self.root.bind("<F1>", timed("Help", lambda e: self.show_help()))
+        self.root.bind("<F2>", timed("Show Map", lambda e: self.show_business_map()))
+        self.root.bind("<F3>", lambda e: self.toggle_lag_overlay())
+        self.root.bind("<Control-z>", timed("Undo", lambda e: self.undo()))
+        self.root.bind("<Control-y>", timed("Redo", lambda e: self.redo()))
+
+    @phased(DIALOG)
     def show_help(self, event=None):
         help_text = """
 Keyboard Shortcuts:
@@ -127,6 +158,7 @@ Ctrl+S: Save Game
 Ctrl+Q: Quit Game
 F1: Show Help
 F2: Show Business Map
+F3: Show/Hide Responsiveness Monitor
 
 Game Tips:
 ---------
@@ -169,75 +201,63 @@ Game Tips:
         dialog.bind("<Return>", lambda e: close_button.invoke())
         dialog.focus_set()
 
+    @phased(DIALOG)
     def show_business_map(self, event=None):
+        """Open the live business map, or raise it if it is already open. It stays open while you play."""
+        if self.map_canvas is not None:
+            self.map_canvas.winfo_toplevel().lift()
+            return
         dialog = tk.Toplevel(self.root)
-        dialog.title("Business Map Overview") # Updated title
-        dialog.geometry("480x550") # Adjusted size
+        dialog.title("Business Map")
         dialog.transient(self.root)
-        dialog.grab_set()
         dialog.configure(bg="#f0f0f0")
 
         style = ttk.Style(dialog)
         if "clam" in style.theme_names(): style.theme_use("clam")
-        style.configure("Dialog.TLabel", background="#f0f0f0", font=("Courier", 11)) # Courier for map
         style.configure("Dialog.TButton", font=("Segoe UI", 10, "bold"), padding=5)
         style.configure("Dialog.TFrame", background="#f0f0f0")
 
         main_dialog_frame = ttk.Frame(dialog, padding=15, style="Dialog.TFrame")
         main_dialog_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Create map instance with current game state
-        game_state_dict = {
-            'day': self.game.day,
-            'money': self.game.money,
-            'reputation': self.game.reputation,
-            'loan': self.game.loan,
-            'inventory': self.game.inventory,
-            'storage_capacity': self.game.storage_capacity,
-            'employees': self.game.employees,
-            'upgrades': self.game.upgrades
-        }
-        map_instance = BusinessMap(game_state_dict)
-        
-        map_frame = ttk.Frame(main_dialog_frame, borderwidth=1, relief="sunken", style="Dialog.TFrame")
-        map_frame.pack(fill=tk.BOTH, expand=True, pady=(0,10))
-
-        map_label = ttk.Label(map_frame, text=map_instance.get_map_with_status(), 
-                            style="Dialog.TLabel", justify=tk.LEFT, padding=10)
-        map_label.pack(fill=tk.BOTH, expand=True)
-        
-        close_button = ttk.Button(main_dialog_frame, text="Close", command=dialog.destroy, style="Dialog.TButton")
+
+        self.map_canvas = BusinessMapCanvas(main_dialog_frame, self.business_map, borderwidth=1, relief="sunken")
+        self.map_canvas.pack(fill=tk.BOTH, expand=True)
+        # Model changes schedule a map redraw (coalesced per frame) for as long as the map is open
+        subscription = self.bus.subscribe(lambda changes: self.map_canvas.request_redraw(),
+                                          DAY, MONEY, REPUTATION, LOANS, INVENTORY, UPGRADES, EMPLOYEES,
+                                          RESEARCH, MARKET, BRANCHES) if self.bus is not None else None
+
+        def close():
+            if subscription is not None:
+                self.bus.unsubscribe(subscription)
+            self.map_canvas = None
+            dialog.destroy()
+
+        close_button = ttk.Button(main_dialog_frame, text="Close", command=close, style="Dialog.TButton")
         close_button.pack(pady=(10,0))
+        dialog.protocol("WM_DELETE_WINDOW", close)
 
         # Key bindings
         dialog.bind("<Escape>", lambda e: close_button.invoke())
-        dialog.bind("<Return>", lambda e: close_button.invoke())
         dialog.focus_set()
 
     # Method to show generic messages, similar to CLIView
-    def show_message(self, message: str, message_type: str = "info") -> None:
-        """Show a message to the user using a messagebox."""
-        # Sanitize Colorama codes for GUI display
-        clean_message = message.replace(Fore.GREEN, "").replace(Fore.RED, "").replace(Fore.YELLOW, "").replace(Fore.CYAN, "").replace(Style.RESET_ALL, "")
-        
-        if message_type == "success":
-            messagebox.showinfo("Success", clean_message)
-        elif message_type == "error":
-            messagebox.showerror("Error", clean_message)
+    def show_message(self, message: str, message_type: str = "info", delay: float = 0.0) -> None:
+        """Add a message to the notification feed. Never blocks, so `delay` is ignored."""
+        self.notifications.add(message, message_type)
+
+    def alert(self, parent: Any, message: str, message_type: str = "error") -> None:
+        """Modal message over `parent`, for dialog input problems the feed behind the dialog would hide."""
+        if message_type == "error":
+            messagebox.showerror("Error", message, parent=parent)
         elif message_type == "warning":
-            messagebox.showwarning("Warning", clean_message)
-        else: # info and other types
-            messagebox.showinfo("Information", clean_message)
-
-    def display_market_message(self, message: str) -> None:
-        """Display market trend message (could be a status bar update or temp label in GUI)."""
-        # For now, use the generic show_message. Can be enhanced later.
-        # Sanitize Colorama codes for GUI display
-        clean_message = message.replace(Fore.GREEN, "").replace(Fore.RED, "").replace(Fore.YELLOW, "").replace(Style.RESET_ALL, "")
-        message_type = "info"
-        if "booming" in clean_message.lower(): message_type = "success"
-        if "decline" in clean_message.lower(): message_type = "error"
-        self.show_message(f"Market Update: {clean_message}", message_type)
+            messagebox.showwarning("Warning", message, parent=parent)
+        else:
+            messagebox.showinfo("Information", message, parent=parent)
+
+    def display_market_message(self, message: str, message_type: str = "info") -> None:
+        """Display market trend message in the notification feed."""
+        self.show_message(f"Market Update: {message}", message_type)
 
     def setup_ui(self):
         # Create a Canvas widget that will contain the main_frame and be scrollable
@@ -338,18 +358,24 @@ Game Tips:
         action_definitions = [
             {"text": "Buy Supplies", "command": self.buy_supplies, "tooltip": "Purchase supplies to sell for profit"},
             {"text": "Work", "command": self.work, "tooltip": "Sell supplies to earn money"},
+            {"text": "Bulk Work", "command": self.work_batch, "tooltip": "Use many supply units in one work order"},
             {"text": "Manage Employees", "command": self.manage_employees, "tooltip": "Hire or fire employees"},
             {"text": f"Upgrades ({config.UPGRADE_SPECS['automation']['name']}, etc.)", "command": self.handle_upgrades_dialog, "tooltip": "Purchase business improvements"},
             {"text": "Loans", "command": self.handle_loans_dialog, "tooltip": "Take or pay back loans"},
             {"text": "Rest", "command": self.rest, "tooltip": "Rest to improve reputation"},
             {"text": f"Research ({config.RESEARCH_PROJECTS_SPECS[next(iter(config.RESEARCH_PROJECTS_SPECS))]['name']}, etc.)", "command": self.handle_research_dialog, "tooltip": "Manage R&D projects"}, # Updated text for Research
+            {"text": "Wait Days", "command": self.wait_days, "tooltip": "Skip ahead several idle days"},
+            {"text": "Branches", "command": self.handle_branches_dialog, "tooltip": "Open new business locations"},
+            {"text": "Undo", "command": self.undo, "tooltip": "Undo the last action (Ctrl+Z)"},
+            {"text": "Redo", "command": self.redo, "tooltip": "Redo the last undone action (Ctrl+Y)"},
             {"text": "Save Game", "command": self.save_game, "tooltip": "Save your progress (Ctrl+S)"},
             {"text": "Quit", "command": self.quit_game, "tooltip": "Exit the game (Ctrl+Q)"}
         ]
 
         row, col = 0, 0
         for i, action_spec in enumerate(action_definitions):
-            btn = ttk.Button(actions_frame, text=action_spec["text"], command=action_spec["command"], style="Modern.TButton")
+            command = self.lag_monitor.wrap(action_spec["text"].split(" (")[0], action_spec["command"])
+            btn = ttk.Button(actions_frame, text=action_spec["text"], command=command, style="Modern.TButton")
             btn.grid(row=row, column=col, padx=14, pady=10, sticky="ew")
             ToolTip(btn, action_spec["tooltip"])
             col += 1
@@ -365,27 +391,54 @@ Game Tips:
             map_btn_row = row 
             map_btn_col = col
 
-        map_btn = ttk.Button(actions_frame, text="Show Map", command=self.show_business_map, style="Modern.TButton")
+        map_btn = ttk.Button(actions_frame, text="Show Map", command=self.lag_monitor.wrap("Show Map", self.show_business_map), style="Modern.TButton")
         map_btn.grid(row=map_btn_row, column=map_btn_col, padx=14, pady=10, sticky="ew")
         ToolTip(map_btn, "View business layout (F2)")
 
+        # Notification feed: results and news land here instead of in modal message boxes
+        notifications_frame = ttk.LabelFrame(main_scrollable_frame, text="Notifications", padding="12 8 12 8", style="Card.TLabelframe")
+        notifications_frame.grid(row=2, column=0, columnspan=2, sticky="nsew", pady=(0, 18))
+        self.notifications = NotificationFeed(notifications_frame)
+        self.notifications.pack(fill="both", expand=True)
+
         # Configure grid weights within main_scrollable_frame
         main_scrollable_frame.columnconfigure(0, weight=1)
         main_scrollable_frame.columnconfigure(1, weight=1)
         # actions_frame grid weights are already set correctly for its internal columns
 
         # Update initial status
-        self.update_status()
+        self._render_all()
 
+    @phased(RENDER)
     def update_status(self):
-        # Update progress bars
+        """Deliver pending model changes to the widgets that show them, at most once per VIEW_UPDATE_MIN_INTERVAL."""
+        if self.bus is None:
+            self._render_all()
+            return
+        if not self.bus.flush() and self._pending_update is None:
+            delay_ms = max(1, int(self.bus.seconds_until_flush() * 1000))
+            self._pending_update = self.root.after(delay_ms, self._deferred_update)
+
+    def _deferred_update(self):
+        self._pending_update = None
+        self.update_status()
+
+    def _render_all(self):
+        self._render_money()
+        self._render_reputation()
+        self._render_details()
+        if self.map_canvas is not None:
+            self.map_canvas.request_redraw()
+
+    def _render_money(self):
         money_percent = (self.game.money / 1000) * 100 if self.game.money < 1000 else 100
         self.money_progress['value'] = money_percent
         self.money_label['text'] = f"${self.game.money}"
         if money_percent < 33: self.money_progress.configure(style="Red.Horizontal.TProgressbar")
         elif money_percent < 66: self.money_progress.configure(style="Yellow.Horizontal.TProgressbar")
         else: self.money_progress.configure(style="Green.Horizontal.TProgressbar")
-        
+
+    def _render_reputation(self):
         rep_percent = self.game.reputation
         self.rep_progress['value'] = rep_percent
         self.rep_label['text'] = str(self.game.reputation)
@@ -393,6 +446,7 @@ Game Tips:
         elif rep_percent < 66: self.rep_progress.configure(style="Yellow.Horizontal.TProgressbar")
         else: self.rep_progress.configure(style="Green.Horizontal.TProgressbar")
 
+    def _render_details(self):
         # Update inventory display
         self.inventory_text.config(state='normal')
         self.inventory_text.delete(1.0, tk.END)
@@ -415,15 +469,15 @@ Game Tips:
             inventory_text_content += f"    └ Smart Automation Bonus: {((self.game.upgrades['automation_efficiency'] - 1) * 100):.0f}%\n"
 
         if self.game.employees:
-             inventory_text_content += f"\nEmployees: {len(self.game.employees)}/{config.MAX_EMPLOYEES}\n"
+             staff = self.game.employees.summary()
+             inventory_text_content += f"\nEmployees: {staff['count']}/{config.MAX_EMPLOYEES} (payroll ${staff['daily_payroll']}/day)\n"
         if self.game.loan > 0:
             inventory_text_content += f"Loan: ${self.game.loan}\n"
 
-        if self.game.active_research_project and self.controller_ref:
-            event_mngr = self.controller_ref.event_manager
+        if self.game.active_research_project:
             active_proj_spec = config.RESEARCH_PROJECTS_SPECS.get(self.game.active_research_project)
             if active_proj_spec:
-                progress = event_mngr.research_progress
+                progress = self.game.research_progress
                 duration = active_proj_spec['duration']
                 progress_percent = (progress / duration) * 100 if duration > 0 else 0
                 inventory_text_content += f"\nActive Research: {active_proj_spec['name']} ({progress}/{duration} - {progress_percent:.0f}%)\n"
@@ -431,6 +485,7 @@ Game Tips:
         self.inventory_text.insert(1.0, inventory_text_content)
         self.inventory_text.config(state='disabled')
 
+    @phased(DIALOG)
     def buy_supplies(self):
         dialog = tk.Toplevel(self.root)
         dialog.title("Buy Supplies")
@@ -468,13 +523,13 @@ Game Tips:
         def calculate_and_set_max(*args):
             selected_supply_display = supply_var.get()
             if not selected_supply_display:
-                self.show_message("Please select a supply type first.", "warning")
+                self.alert(dialog, "Please select a supply type first.", "warning")
                 return
 
             supply_type_key = selected_supply_display.lower().replace(' ', '_')
             
             if supply_type_key not in self.game.prices:
-                self.show_message("Invalid supply type selected for max calculation.", "error")
+                self.alert(dialog, "Invalid supply type selected for max calculation.", "error")
                 return
 
             price_per_unit = self.game.prices[supply_type_key]
@@ -522,13 +577,13 @@ Game Tips:
             try:
                 amount = int(amount_var.get())
                 if not supply_type_key or supply_type_key not in self.game.prices:
-                    messagebox.showerror("Error", "Please select a valid supply type.")
+                    self.alert(dialog, "Please select a valid supply type.", "error")
                     return
                 
                 # GameState.buy_supplies handles the logic for cost, money, storage checks
-                if self.game.buy_supplies(supply_type_key, amount):
+                if self.history.perform("Buy supplies", lambda: self.game.buy_supplies(supply_type_key, amount)):
                     cost = amount * self.game.prices[supply_type_key] # For display message only
-                    messagebox.showinfo("Success", f"Bought {amount} {supply_type_key.replace('_',' ').title()} for ${cost}.")
+                    self.show_message(f"Bought {amount} {supply_type_key.replace('_',' ').title()} for ${cost}.", "success")
                     self.update_status()
                     dialog.destroy()
                 else:
@@ -539,16 +594,16 @@ Game Tips:
                     available_storage = self.game.storage_capacity - current_storage_used
 
                     if self.game.money < cost and available_storage < amount:
-                        messagebox.showerror("Error", "Not enough money AND storage space!")
+                        self.alert(dialog, "Not enough money AND storage space!", "error")
                     elif self.game.money < cost:
-                        messagebox.showerror("Error", "Not enough money!")
+                        self.alert(dialog, "Not enough money!", "error")
                     elif available_storage < amount:
-                        messagebox.showerror("Error", "Not enough storage space!")
+                        self.alert(dialog, "Not enough storage space!", "error")
                     else:
-                        messagebox.showerror("Error", "Could not complete purchase. Unknown reason.")
+                        self.alert(dialog, "Could not complete purchase. Unknown reason.", "error")
 
             except ValueError:
-                messagebox.showerror("Error", "Please enter a valid amount for supplies.")
+                self.alert(dialog, "Please enter a valid amount for supplies.", "error")
         
         button_frame = ttk.Frame(main_dialog_frame, style="Dialog.TFrame")
         button_frame.pack(pady=(15,0), fill="x")
@@ -567,8 +622,10 @@ Game Tips:
         # Ensure one of the input fields gets focus initially
         supply_combo.focus_set()
 
+    @phased(ACTION)
     def work(self):
         if sum(self.game.inventory.values()) > 0:
+            self.history.record("Work")
             result = self.game.work()
             self.update_status()
             
@@ -580,10 +637,32 @@ Game Tips:
             self.rep_label.config(foreground="red")
             self.root.after(1000, lambda: self.rep_label.config(foreground="black"))
             
-            messagebox.showinfo("Work Result", f"You earned ${result}!")
+            last_work = self.game.last_work
+            self.show_message(f"You earned ${result}! Supplies used cost ${last_work.get('cogs', 0)} (margin {last_work.get('margin', 0.0) * 100:.0f}%).", "success")
         else:
-            messagebox.showerror("Error", "You need supplies to work!")
+            self.show_message("You need supplies to work!", "error")
+
+    @phased(ACTION)
+    def work_batch(self):
+        """Ask how many supply units to use and run them as one bulk work order."""
+        total_supplies = sum(self.game.inventory.values())
+        if total_supplies <= 0:
+            self.show_message("You need supplies to work!", "error")
+            return
+        units = simpledialog.askinteger("Bulk Work", f"How many supply units should this order use? (1-{total_supplies})",
+                                        parent=self.root, minvalue=1, maxvalue=total_supplies, initialvalue=total_supplies)
+        if not units:
+            return
+        self.history.record("Bulk work order")
+        result = self.game.work_batch(units)
+        self.update_status()
+        self.money_label.config(foreground="green")
+        self.root.after(1000, lambda: self.money_label.config(foreground="black"))
+        self.show_message(f"Bulk order used {result['units']} units and earned ${result['income']}! "
+                          f"Supplies used cost ${result['cogs']} (margin {result['margin'] * 100:.0f}%), "
+                          f"reputation -{result['reputation_loss']}, salaries ${result['payroll']}.", "success")
 
+    @phased(DIALOG)
     def manage_employees(self):
         dialog = tk.Toplevel(self.root)
         dialog.title("Manage Employees")
@@ -601,29 +680,30 @@ Game Tips:
         main_dialog_frame = ttk.Frame(dialog, padding=15, style="Dialog.TFrame")
         main_dialog_frame.pack(fill="both", expand=True)
 
-        ttk.Label(main_dialog_frame, text=f"Current employees: {len(self.game.employees)}", style="Dialog.TLabel").pack(pady=5, anchor="w")
+        staff = self.game.employees.summary()
+        ttk.Label(main_dialog_frame, text=f"Current employees: {staff['count']} (payroll ${staff['daily_payroll']}/day)", style="Dialog.TLabel").pack(pady=5, anchor="w")
         ttk.Label(main_dialog_frame, text=f"Daily cost per employee: ${config.EMPLOYEE_DAILY_SALARY}", style="Dialog.TLabel").pack(pady=5, anchor="w")
         ttk.Label(main_dialog_frame, text=f"Productivity boost per employee: 40%", style="Dialog.TLabel").pack(pady=(5,10), anchor="w")
         
         def hire():
-            if self.game.hire_employee():
-                messagebox.showinfo("Success", "New employee hired!")
+            if self.history.perform("Hire employee", self.game.hire_employee):
+                self.show_message("New employee hired!", "success")
                 self.update_status()
                 dialog.destroy()
             else:
                 # Check for max employees specifically
                 if len(self.game.employees) >= config.MAX_EMPLOYEES:
-                    messagebox.showerror("Error", f"Cannot hire more than {config.MAX_EMPLOYEES} employees.")
+                    self.alert(dialog, f"Cannot hire more than {config.MAX_EMPLOYEES} employees.", "error")
                 else:
-                    messagebox.showerror("Error", "Not enough money to hire!")
+                    self.alert(dialog, "Not enough money to hire!", "error")
         
         def fire():
-            if self.game.fire_employee():
-                messagebox.showinfo("Notice", "Employee fired.")
+            if self.history.perform("Fire employee", self.game.fire_employee):
+                self.show_message("Employee fired.", "info")
                 self.update_status()
                 dialog.destroy()
             else:
-                messagebox.showerror("Error", "No employees to fire!")
+                self.alert(dialog, "No employees to fire!", "error")
         
         button_frame = ttk.Frame(main_dialog_frame, style="Dialog.TFrame")
         button_frame.pack(pady=(15,5), fill="x") # Adjusted padding
@@ -642,6 +722,7 @@ Game Tips:
         dialog.bind("<Return>", lambda e: hire_button.invoke())
         dialog.focus_set() # Set focus to the dialog itself
 
+    @phased(DIALOG)
     def handle_upgrades_dialog(self):
         dialog = tk.Toplevel(self.root)
         dialog.title("Business Upgrades")
@@ -719,7 +800,8 @@ Game Tips:
             def make_upgrade_handler(key_to_upgrade):
                 def handler():
                     # Logic now uses GameState.purchase_upgrade which uses config
-                    if self.game.purchase_upgrade(key_to_upgrade):
+                    if self.history.perform(f"Buy {config.UPGRADE_SPECS[key_to_upgrade]['name']}",
+                                            lambda: self.game.purchase_upgrade(key_to_upgrade)):
                         self.show_message(f"{config.UPGRADE_SPECS[key_to_upgrade]['name']} upgraded/purchased!", "success")
                         self.update_status()
                         dialog.destroy()
@@ -729,12 +811,12 @@ Game Tips:
                         spec_check = config.UPGRADE_SPECS[key_to_upgrade]
                         cost_check = spec_check['cost'] if spec_check['max_level'] == 1 else spec_check['cost_per_level']
                         if self.game.money < cost_check:
-                            self.show_message("Not enough money!", "error")
+                            self.alert(dialog, "Not enough money!", "error")
                         elif (spec_check['max_level'] == 1 and current_val) or \
                              (spec_check['max_level'] > 1 and current_val >= spec_check['max_level']):
-                            self.show_message("Already at maximum or purchased!", "warning")
+                            self.alert(dialog, "Already at maximum or purchased!", "warning")
                         else: # General fail, should be rare
-                             self.show_message("Upgrade failed for an unknown reason.", "error")
+                             self.alert(dialog, "Upgrade failed for an unknown reason.", "error")
                 return handler
             
             purchase_button = ttk.Button(frame, text=button_text, state=button_state, 
@@ -749,10 +831,11 @@ Game Tips:
         # <Return> is not bound globally due to multiple start buttons.
         dialog.focus_set()
 
+    @phased(DIALOG)
     def handle_loans_dialog(self):
         dialog = tk.Toplevel(self.root)
         dialog.title("Manage Loans")
-        dialog.geometry("380x450") # Adjusted for potentially more text
+        dialog.geometry("380x540") # Adjusted for potentially more text
         dialog.transient(self.root)
         dialog.grab_set()
         dialog.configure(bg="#f0f0f0")
@@ -773,8 +856,8 @@ Game Tips:
         ttk.Label(main_dialog_frame, text=f"(Daily rate: {daily_interest_rate_val:.4f}%)", style="Dialog.TLabel").pack(pady=(0,5), anchor="w")
         
         if self.game.loan > 0:
-            daily_cost = int(self.game.loan * daily_interest_rate_val)
-            ttk.Label(main_dialog_frame, text=f"Approx. daily interest cost: ${daily_cost}", style="Dialog.TLabel").pack(pady=5, anchor="w")
+            daily_cost = self.game.loans.daily_interest()
+            ttk.Label(main_dialog_frame, text=f"Approx. daily interest cost: ${daily_cost} ({len(self.game.loans.active_loan_ids())} active loans)", style="Dialog.TLabel").pack(pady=5, anchor="w")
         
         income_potential = self.game.get_income_potential()
         safe_max_loan_to_take = self.game.get_safe_loan_amount()
@@ -788,6 +871,21 @@ Game Tips:
         elif max_loan_player_can_take <= 0:
              ttk.Label(main_dialog_frame, text="Maximum loan limit reached.", foreground="orange", font=("Segoe UI", 10, "italic"), style="Dialog.TLabel").pack(pady=(10,5), anchor="w")
 
+        product_names = {product["name"]: key for key, product in config.LOAN_PRODUCTS.items()}
+        product_var = tk.StringVar(value=config.LOAN_PRODUCTS[config.DEFAULT_LOAN_PRODUCT]["name"])
+        ttk.Label(main_dialog_frame, text="Loan type:", style="Dialog.TLabel").pack(pady=(10,5), anchor="w")
+        product_combo = ttk.Combobox(main_dialog_frame, textvariable=product_var, width=27, state="readonly")
+        product_combo['values'] = list(product_names.keys())
+        product_combo.pack(pady=5, fill="x")
+        product_info_label = ttk.Label(main_dialog_frame, style="Dialog.TLabel", wraplength=340)
+        product_info_label.pack(pady=(0,5), anchor="w")
+
+        def show_product_info(*args):
+            key = product_names[product_var.get()]
+            product_info_label.config(text=f"{product_rate(key) * 100:.1f}% annual - {config.LOAN_PRODUCTS[key]['description']}")
+        product_combo.bind("<<ComboboxSelected>>", show_product_info)
+        show_product_info()
+
         amount_var = tk.StringVar()
         ttk.Label(main_dialog_frame, text="Amount:", style="Dialog.TLabel").pack(pady=(10,5), anchor="w")
         amount_entry = ttk.Entry(main_dialog_frame, textvariable=amount_var, style="Dialog.TEntry", width=27)
@@ -812,53 +910,80 @@ Game Tips:
                 current_safe_max = self.game.get_safe_loan_amount() # Re-check at time of action
                 if income_potential > 0 and amount > current_safe_max and amount <= (config.MAX_LOAN_TOTAL - self.game.loan) :
                     if not messagebox.askyesno("Warning", 
-                                            f"This loan (${amount}) exceeds the recommended safe amount of ${current_safe_max} based on your income.\nAre you sure you want to proceed?"):
+                                            f"This loan (${amount}) exceeds the recommended safe amount of ${current_safe_max} based on your income.\nAre you sure you want to proceed?",
+                                            parent=dialog):
                         return
-                if self.game.take_loan(amount):
-                    messagebox.showinfo("Success", f"Loan of ${amount} received!")
+                if self.history.perform(f"Take {product_var.get()}", lambda: self.game.take_loan(amount, product_names[product_var.get()])):
+                    self.show_message(f"{product_var.get()} of ${amount} received!", "success")
                     self.update_status()
                     dialog.destroy()
                 else:
                     max_loan_possible = config.MAX_LOAN_TOTAL - self.game.loan
                     if amount <= 0:
-                        messagebox.showerror("Error", "Loan amount must be positive.")
+                        self.alert(dialog, "Loan amount must be positive.", "error")
                     elif amount > max_loan_possible:
-                        messagebox.showerror("Error", f"Cannot take loan. Amount exceeds maximum possible additional loan of ${max_loan_possible}.")
+                        self.alert(dialog, f"Cannot take loan. Amount exceeds maximum possible additional loan of ${max_loan_possible}.", "error")
                     else: 
-                        messagebox.showerror("Error", "Failed to process loan. Ensure amount is positive and within limits.")
+                        self.alert(dialog, "Failed to process loan. Ensure amount is positive and within limits.", "error")
             except ValueError:
-                messagebox.showerror("Error", "Please enter a valid amount")
+                self.alert(dialog, "Please enter a valid amount", "error")
         
+        def preview_loan():
+            if not self.controller_ref:
+                self.alert(dialog, "Controller not available for previews.", "error")
+                return
+            try:
+                amount = int(amount_var.get())
+            except ValueError:
+                self.alert(dialog, "Please enter a valid amount", "error")
+                return
+            product_key = product_names[product_var.get()]
+            days = config.LOAN_PREVIEW_DAYS
+            engine = self.controller_ref.engine
+            with_loan = engine.preview(days, lambda state: state.take_loan(amount, product_key))
+            if not with_loan["action_result"]:
+                self.alert(dialog, "This loan could not be taken. Check the amount and your loan limit.", "error")
+                return
+            without_loan = engine.preview(days)
+            messagebox.showinfo("Loan Preview",
+                                f"If you take this {product_var.get()} of ${amount} and wait {days} days:\n"
+                                f"Money: ${with_loan['money']} (${without_loan['money']} without the loan)\n"
+                                f"Loan balance: ${with_loan['loan']}\n"
+                                f"Reputation: {with_loan['reputation']}", parent=dialog)
+
         def pay_loan():
             try:
                 amount = int(amount_var.get())
-                if self.game.repay_loan(amount):
-                    messagebox.showinfo("Success", f"Paid ${amount} towards loan!")
+                if self.history.perform("Repay loan", lambda: self.game.repay_loan(amount)):
+                    self.show_message(f"Paid ${amount} towards loan!", "success")
                     self.update_status()
                     dialog.destroy()
                 else:
                     if amount <=0:
-                        messagebox.showerror("Error", "Repayment amount must be positive.")
+                        self.alert(dialog, "Repayment amount must be positive.", "error")
                     elif amount > self.game.money:
-                        messagebox.showerror("Error", "Not enough money to make this repayment.")
+                        self.alert(dialog, "Not enough money to make this repayment.", "error")
                     elif amount > self.game.loan:
-                        messagebox.showerror("Error", "Repayment exceeds outstanding loan amount.")
+                        self.alert(dialog, "Repayment exceeds outstanding loan amount.", "error")
                     else:
-                        messagebox.showerror("Error", "Not enough money or amount exceeds loan!")
+                        self.alert(dialog, "Not enough money or amount exceeds loan!", "error")
             except ValueError:
-                messagebox.showerror("Error", "Please enter a valid amount")
+                self.alert(dialog, "Please enter a valid amount", "error")
         
         button_frame = ttk.Frame(main_dialog_frame, style="Dialog.TFrame")
         button_frame.pack(pady=(15,5), fill="x")
 
         take_loan_button = ttk.Button(button_frame, text="Take Loan", command=take_loan, style="Dialog.TButton")
         take_loan_button.pack(side=tk.LEFT, expand=True, padx=5, pady=5)
+        preview_button = ttk.Button(button_frame, text="Preview", command=preview_loan, style="Dialog.TButton")
+        preview_button.pack(side=tk.LEFT, expand=True, padx=5, pady=5)
         pay_loan_button = ttk.Button(button_frame, text="Pay Loan", command=pay_loan, style="Dialog.TButton")
         pay_loan_button.pack(side=tk.LEFT, expand=True, padx=5, pady=5)
         
         # Disable take_loan_button if at max total loan
         if max_loan_player_can_take <= 0:
             take_loan_button.config(state=tk.DISABLED)
+            preview_button.config(state=tk.DISABLED)
         # Disable pay_loan_button if no loan or no money to pay
         if self.game.loan <= 0 or self.game.money <= 0:
             pay_loan_button.config(state=tk.DISABLED)
@@ -872,7 +997,9 @@ Game Tips:
 
         amount_entry.focus_set()
 
+    @phased(ACTION)
     def rest(self):
+        self.history.record("Rest")
         self.game.rest()
         self.update_status()
         
@@ -880,17 +1007,81 @@ Game Tips:
         self.rep_label.config(foreground="green")
         self.root.after(1000, lambda: self.rep_label.config(foreground="black"))
         
-        messagebox.showinfo("Rest", "You rested and improved your reputation.")
+        self.show_message("You rested and improved your reputation.", "success")
 
+    @phased(ACTION)
+    def wait_days(self):
+        """Ask for a number of days and skip ahead through the controller's engine."""
+        if not self.controller_ref:
+            self.show_message("Controller not available for waiting.", "error")
+            return
+        days = simpledialog.askinteger("Wait Days", "How many days would you like to wait?",
+                                       parent=self.root, minvalue=1, maxvalue=365)
+        if not days:
+            return
+        self.history.record(f"Wait {days} day(s)")
+        summary = self.controller_ref.engine.advance_days(days)
+        self.update_status()
+
+        # One summary dialog instead of a messagebox per event
+        details = "\n".join(message.text() for message in summary["messages"])
+        text = f"You waited {summary['days']} day(s). It is now Day {self.game.day}."
+        if details:
+            text += f"\n\n{details}"
+        self.show_message(text, "info")
+
+    @phased(DIALOG)
+    def handle_branches_dialog(self):
+        """Show company branch totals and offer to open a new branch."""
+        company = self.game.company
+        totals = company.totals
+        text = f"Branches: {len(company)}"
+        if len(company) > 0:
+            text += (f"\nStock: {totals['units']}/{totals['storage_capacity']}"
+                     f"\nStaff: {totals['employees']} (payroll ${totals['payroll']}/day)"
+                     f"\nAverage reputation: {company.reputation:.0f}"
+                     f"\nLifetime net: ${totals['lifetime_net']}")
+        if not messagebox.askyesno("Branches", f"{text}\n\nOpen a new branch for ${config.BRANCH_OPEN_COST}?"):
+            return
+        branch = self.history.perform("Open branch", self.game.open_branch)
+        if branch:
+            self.update_status()
+            self.show_message(f"Opened {branch.name}! It restocks and works on its own each day.", "success")
+        else:
+            self.show_message(f"You need ${config.BRANCH_OPEN_COST} to open a branch!", "error")
+
+    @phased(ACTION)
+    def undo(self):
+        label = self.history.undo()
+        if label is None:
+            self.show_message("Nothing to undo.", "warning")
+            return
+        self.update_status()
+        self.show_message(f"Undid: {label}", "info")
+
+    @phased(ACTION)
+    def redo(self):
+        label = self.history.redo()
+        if label is None:
+            self.show_message("Nothing to redo.", "warning")
+            return
+        self.update_status()
+        self.show_message(f"Redid: {label}", "info")
+
+    @phased(ACTION)
     def save_game(self):
         result = self.game.save_game()
-        messagebox.showinfo("Save Game", "Game saved successfully!")
+        if result:
+            self.show_message("Game saved successfully!", "success")
+        else:
+            self.show_message("Could not save the game.", "error")
 
     def quit_game(self):
         if messagebox.askyesno("Quit", "Do you want to save before quitting?"):
             self.save_game()
         self.root.destroy()
 
+    @phased(DIALOG)
     def handle_research_dialog(self):
         """Open a dialog to manage research projects."""
         if not self.controller_ref: # Should not happen if initialized correctly
@@ -920,12 +1111,12 @@ Game Tips:
         # Display Active Research
         active_research_frame = ttk.LabelFrame(main_dialog_frame, text="Active Project", padding=10, style="Dialog.TLabelframe")
         active_research_frame.pack(pady=10, fill="x")
-        if event_manager.active_research:
-            active_project_spec = config.RESEARCH_PROJECTS_SPECS.get(event_manager.active_research)
+        if self.game.active_research_project:
+            active_project_spec = config.RESEARCH_PROJECTS_SPECS.get(self.game.active_research_project)
             if active_project_spec:
-                progress_percent = (event_manager.research_progress / active_project_spec['duration']) * 100 if active_project_spec['duration'] > 0 else 0
+                progress_percent = (self.game.research_progress / active_project_spec['duration']) * 100 if active_project_spec['duration'] > 0 else 0
                 ttk.Label(active_research_frame, 
-                          text=f"{active_project_spec['name']} ({event_manager.research_progress}/{active_project_spec['duration']} days - {progress_percent:.0f}% complete)", 
+                          text=f"{active_project_spec['name']} ({self.game.research_progress}/{active_project_spec['duration']} days - {progress_percent:.0f}% complete)", 
                           style="Dialog.TLabel", font=("Segoe UI", 10, "italic")).pack(anchor="w")
         else:
             ttk.Label(active_research_frame, text="No active research project.", style="Dialog.TLabel", font=("Segoe UI", 10, "italic")).pack(anchor="w")
@@ -957,7 +1148,7 @@ Game Tips:
             if key in self.game.completed_research:
                 status_text = "(Completed)"
                 button_state = tk.DISABLED
-            elif key == event_manager.active_research:
+            elif key == self.game.active_research_project:
                 status_text = "(In Progress)"
                 button_state = tk.DISABLED
             
@@ -969,17 +1160,16 @@ Game Tips:
 
             def make_start_research_handler(p_key, p_cost, p_name, p_duration):
                 def handler():
-                    if event_manager.active_research is not None:
-                        self.show_message(f"Another research '{event_manager.research_projects[event_manager.active_research]['name']}' is already active.", "warning")
+                    if self.game.active_research_project is not None:
+                        self.alert(dialog, f"Another research '{event_manager.research_projects_data[self.game.active_research_project]['name']}' is already active.", "warning")
                         return
                     if self.game.money < p_cost:
-                        self.show_message(f"Not enough money to start '{p_name}'. Cost: ${p_cost}", "error")
+                        self.alert(dialog, f"Not enough money to start '{p_name}'. Cost: ${p_cost}", "error")
                         return
                     
-                    self.game.money -= p_cost
-                    event_manager.active_research = p_key
-                    self.game.active_research_project = p_key
-                    event_manager.research_progress = 0
+                    if not self.history.perform(f"Research {p_name}", lambda: self.game.start_research(p_key)):
+                        self.alert(dialog, f"Could not start '{p_name}'.", "error")
+                        return
                     self.show_message(f"Research started for '{p_name}'! It will take {p_duration} days.", "success")
                     self.update_status() # Update main UI
                     dialog.destroy() # Close research dialog
@@ -999,5 +1189,27 @@ Game Tips:
         # <Return> not bound globally due to multiple start buttons.
         dialog.focus_set()
 
+    def toggle_lag_overlay(self):
+        """Show or hide the one-line lag monitor readout in the bottom-right corner."""
+        if self._lag_overlay is not None:
+            self._lag_overlay.destroy()
+            self._lag_overlay = None
+            return
+        self._lag_overlay = tk.Label(self.root, text=self.lag_monitor.summary_line(), font=("Consolas", 9),
+                                     bg="#263238", fg="#eceff1", padx=6, pady=2)
+        self._lag_overlay.place(relx=1.0, rely=1.0, anchor="se")
+
+    def _refresh_lag_readouts(self):
+        line = self.lag_monitor.summary_line()
+        if self._lag_overlay is not None:
+            self._lag_overlay.config(text=line)
+            self._lag_overlay.lift()
+        if self.lag_log:
+            with open(self.lag_log, "a") as f:
+                f.write(f"{time.strftime('%H:%M:%S')} {line}\n")
+        self.root.after(config.GUI_LAG_OVERLAY_REFRESH_MS, self._refresh_lag_readouts)
+
     def run(self):
+        self.lag_monitor.start()
+        self.root.after(config.GUI_LAG_OVERLAY_REFRESH_MS, self._refresh_lag_readouts)
         self.root.mainloop() 
\ No newline at end of file
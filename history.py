@@ -0,0 +1,121 @@
+"""
+history.py
+
+Undo/redo history for a GameEngine (its GameState and EventManager).
+
+Each step is a snapshot taken with GameState.fork() and EventManager.fork(),
+plus the random module state and the engine's market data for the day.
+GameState forks share their inventory, roster, ledgers and other large
+structures with the live game until the game writes to one of them, so a
+snapshot costs its attribute dict plus copies of only the fields the next
+action changes. Hundreds of steps stay cheap.
+
+Undo and redo restore the snapshot into the live objects in place, so views,
+the controller and the engine keep working with the same GameState and
+EventManager instances.
+"""
+
+import random
+from collections import deque
+from typing import Dict, Any, Callable, List, Optional, Tuple
+import numpy as np
+import config
+
+from engine import GameEngine
+
+
+def _pack_random_state() -> Tuple[Any, np.ndarray, Any]:
+    # The Mersenne Twister state is 625 Python ints (~20 KiB); as uint32 it is 2.5 KiB
+    version, internal, gauss_next = random.getstate()
+    return version, np.array(internal, dtype=np.uint32), gauss_next
+
+
+def _unpack_random_state(packed: Tuple[Any, np.ndarray, Any]) -> None:
+    version, internal, gauss_next = packed
+    random.setstate((version, tuple(int(word) for word in internal), gauss_next))
+
+
+class UndoHistory:
+    """Bounded undo and redo stacks of game snapshots."""
+
+    def __init__(self, engine: GameEngine, limit: Optional[int] = None):
+        self.engine = engine
+        self.limit = limit if limit is not None else config.UNDO_HISTORY_LIMIT
+        self._undo: deque = deque(maxlen=self.limit) # Oldest steps fall off the far end
+        self._redo: List[Dict[str, Any]] = []
+
+    def _capture(self, label: str) -> Dict[str, Any]:
+        return {
+            "label": label,
+            "state": self.engine.game_state.fork(),
+            "events": self.engine.event_manager.fork(),
+            "random_state": _pack_random_state(),
+            "market_data": dict(self.engine.market_data),
+        }
+
+    def _restore(self, snapshot: Dict[str, Any]) -> None:
+        # Workers ticking branches hold the live branches; hand them back before the state is replaced,
+        # since the snapshot taken for the opposite stack shares that company
+        self.engine.branch_scheduler.close(self.engine.game_state.company)
+        self.engine.game_state.restore(snapshot["state"])
+        self.engine.event_manager.restore(snapshot["events"])
+        _unpack_random_state(snapshot["random_state"])
+        self.engine.market_data = dict(snapshot["market_data"])
+
+    def record(self, label: str) -> None:
+        """Remember the current game before an action labelled `label`. Clears the redo stack."""
+        self._undo.append(self._capture(label))
+        self._redo.clear()
+
+    def begin(self, label: str) -> Dict[str, Any]:
+        """Snapshot the game before an action labelled `label`; pass the result to commit() once it ran."""
+        return self._capture(label)
+
+    def commit(self, snapshot: Dict[str, Any]) -> bool:
+        """Record a snapshot from begin() as an undo step only if the game state changed since. Clears the redo stack."""
+        if not self.engine.game_state.differs_from(snapshot["state"]):
+            return False
+        self._undo.append(snapshot)
+        self._redo.clear()
+        return True
+
+    def perform(self, label: str, action: Callable[[], Any]) -> Any:
+        """Run `action` and record an undo step for it only if it returns a truthy result."""
+        snapshot = self._capture(label)
+        result = action()
+        if result:
+            self._undo.append(snapshot)
+            self._redo.clear()
+        return result
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> Optional[str]:
+        """Go back to before the last recorded action and return its label (None if there is nothing to undo)."""
+        if not self._undo:
+            return None
+        snapshot = self._undo.pop()
+        self._redo.append(self._capture(snapshot["label"]))
+        self._restore(snapshot)
+        return snapshot["label"]
+
+    def redo(self) -> Optional[str]:
+        """Re-apply the last undone action and return its label (None if there is nothing to redo)."""
+        if not self._redo:
+            return None
+        snapshot = self._redo.pop()
+        self._undo.append(self._capture(snapshot["label"]))
+        self._restore(snapshot)
+        return snapshot["label"]
+
+    def clear(self) -> None:
+        """Forget every step (e.g. after loading a saved game)."""
+        self._undo.clear()
+        self._redo.clear()
+
+    def __len__(self) -> int:
+        return len(self._undo)
@@ -0,0 +1,140 @@
+"""
+inventory.py
+
+Lot-tracked supply inventory used by GameState.
+
+Every purchase is stored as a lot [quantity, unit_cost, day] in a per-type
+deque, oldest lot first. Consumption takes units from the oldest lots (FIFO)
+and touches only the lots it empties plus one partial lot, so bulk
+consumption is O(lots touched). The cost of goods sold (COGS) is either the
+FIFO cost of those lots or the running average cost of the type
+(config.INVENTORY_COSTING_METHOD). Because lots are in purchase-day order,
+spoilage just drops lots from the front of the deque.
+
+LotInventory is a read-only Mapping of supply type -> unit count, so code
+that only reads counts (inventory["basic_supplies"], inventory.values(), ...)
+works unchanged.
+"""
+
+from collections import deque
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional
+import config
+
+COSTING_METHODS = ("fifo", "average")
+
+
+class LotInventory(Mapping):
+    """Per-type deques of purchase lots with FIFO or average-cost accounting."""
+
+    def __init__(self, supply_types: Iterable[str], costing_method: Optional[str] = None):
+        self.costing_method = costing_method or config.INVENTORY_COSTING_METHOD
+        if self.costing_method not in COSTING_METHODS:
+            raise ValueError(f"Unknown costing method '{self.costing_method}'.")
+        self._lots: Dict[str, deque] = {supply_type: deque() for supply_type in supply_types}
+        self._counts: Dict[str, int] = {supply_type: 0 for supply_type in self._lots}
+        self._cost_basis: Dict[str, int] = {supply_type: 0 for supply_type in self._lots}
+
+    # --- Mapping interface (unit counts) ---
+    def __getitem__(self, supply_type: str) -> int:
+        return self._counts[supply_type]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._counts)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def total_units(self) -> int:
+        return sum(self._counts.values())
+
+    def cost_basis(self, supply_type: str) -> int:
+        """Total purchase cost of the units of supply_type still in stock."""
+        return self._cost_basis[supply_type]
+
+    def lot_count(self, supply_type: str) -> int:
+        return len(self._lots[supply_type])
+
+    # --- Stock movements ---
+    def add(self, supply_type: str, quantity: int, unit_cost: int, day: int) -> None:
+        """Add a purchase lot. Buying again on the same day at the same price extends the last lot."""
+        if quantity <= 0:
+            return
+        lots = self._lots[supply_type]
+        if lots and lots[-1][1] == unit_cost and lots[-1][2] == day:
+            lots[-1][0] += quantity
+        else:
+            lots.append([quantity, unit_cost, day])
+        self._counts[supply_type] += quantity
+        self._cost_basis[supply_type] += quantity * unit_cost
+
+    def _take(self, supply_type: str, quantity: int) -> int:
+        """Remove quantity units from the oldest lots and return their FIFO cost."""
+        lots = self._lots[supply_type]
+        cost = 0
+        remaining = quantity
+        while remaining > 0:
+            lot = lots[0]
+            used = min(remaining, lot[0])
+            cost += used * lot[1]
+            remaining -= used
+            lot[0] -= used
+            if lot[0] == 0:
+                lots.popleft()
+        return cost
+
+    def consume(self, supply_type: str, quantity: int = 1) -> int:
+        """Consume up to quantity units (oldest first) and return their cost of goods sold."""
+        quantity = min(quantity, self._counts[supply_type])
+        if quantity <= 0:
+            return 0
+        fifo_cost = self._take(supply_type, quantity)
+        if self.costing_method == "average":
+            # Spread the remaining cost basis evenly; the last unit out takes any rounding remainder
+            cost = self._cost_basis[supply_type] * quantity // self._counts[supply_type]
+        else:
+            cost = fifo_cost
+        self._counts[supply_type] -= quantity
+        self._cost_basis[supply_type] -= cost
+        if self._counts[supply_type] == 0:
+            self._cost_basis[supply_type] = 0
+        return cost
+
+    def expire(self, supply_type: str, purchased_before_day: int) -> int:
+        """Drop every lot of supply_type bought before the given day (spoilage); returns units removed."""
+        lots = self._lots[supply_type]
+        removed = 0
+        while lots and lots[0][2] < purchased_before_day:
+            removed += lots[0][0]
+            if self.costing_method == "fifo":
+                self._cost_basis[supply_type] -= lots[0][0] * lots[0][1]
+            lots.popleft()
+        if removed and self.costing_method == "average":
+            self._cost_basis[supply_type] -= self._cost_basis[supply_type] * removed // self._counts[supply_type]
+        self._counts[supply_type] -= removed
+        if self._counts[supply_type] == 0:
+            self._cost_basis[supply_type] = 0
+        return removed
+
+    # --- Persistence ---
+    def to_dict(self) -> Dict[str, List[List[int]]]:
+        return {supply_type: [list(lot) for lot in lots] for supply_type, lots in self._lots.items()}
+
+    @classmethod
+    def from_dict(cls, lots_by_type: Dict[str, List[List[int]]], supply_types: Iterable[str]) -> "LotInventory":
+        inventory = cls(supply_types)
+        for supply_type, lots in lots_by_type.items():
+            for quantity, unit_cost, day in lots:
+                inventory.add(supply_type, quantity, unit_cost, day)
+        return inventory
+
+    @classmethod
+    def from_counts(cls, counts: Dict[str, int], unit_costs: Dict[str, int], day: int) -> "LotInventory":
+        """Build an inventory from plain unit counts (older saves), costed at unit_costs."""
+        inventory = cls(counts.keys())
+        for supply_type, quantity in counts.items():
+            inventory.add(supply_type, quantity, unit_costs.get(supply_type, 0), day)
+        return inventory
+
+    def __repr__(self) -> str:
+        return f"LotInventory({self._counts})"
@@ -0,0 +1,99 @@
+"""
+lag_monitor.py
+
+Event-loop responsiveness monitor for TycoonGUI.
+
+Three measurements, each kept over the last GUI_LATENCY_WINDOW samples:
+
+- heartbeat lag: a Tk `after` callback is scheduled every
+  GUI_HEARTBEAT_INTERVAL_MS; how late it fires is how long the mainloop was
+  busy (a synchronous handler, dialog build or modal message box).
+- handler time: wall time of every wrapped command handler and dialog open.
+- input to redraw: from the start of a handler until an `after_idle`
+  callback queued when it returns runs. Tk runs idle callbacks in order, so by
+  then the redraws the handler caused have been painted.
+
+stats() returns p50/p99/max per measurement; the GUI shows a one-line overlay
+(toggled with F3) and can append the same line to a log file periodically.
+"""
+
+import time
+from collections import deque
+from typing import Dict, Any, Callable, Deque, Optional
+import numpy as np
+import config
+
+
+def _summary(samples: Deque[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+    values = np.fromiter(samples, dtype=float, count=len(samples))
+    p50, p99 = np.percentile(values, [50, 99])
+    return {"count": len(samples), "p50": float(p50), "p99": float(p99), "max": float(values.max())}
+
+
+class LagMonitor:
+    """Heartbeat lateness, handler timings and input-to-redraw latency for a Tk root (all in milliseconds)."""
+
+    def __init__(self, root: Any, interval_ms: Optional[int] = None, window: Optional[int] = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.root = root
+        self.interval_ms = interval_ms if interval_ms is not None else config.GUI_HEARTBEAT_INTERVAL_MS
+        self.window = window if window is not None else config.GUI_LATENCY_WINDOW
+        self.clock = clock
+        self.heartbeat_lag: Deque[float] = deque(maxlen=self.window)
+        self.input_to_redraw: Deque[float] = deque(maxlen=self.window)
+        self.handler_times: Dict[str, Deque[float]] = {}
+        self._expected: Optional[float] = None
+        self._after_id: Optional[str] = None
+
+    # --- Heartbeat ---
+    def start(self) -> None:
+        if self._after_id is None:
+            self._schedule()
+
+    def stop(self) -> None:
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule(self) -> None:
+        self._expected = self.clock() + self.interval_ms / 1000
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+
+    def _beat(self) -> None:
+        self.heartbeat_lag.append(max(0.0, (self.clock() - self._expected) * 1000))
+        self._schedule()
+
+    # --- Handlers ---
+    def wrap(self, name: str, handler: Callable) -> Callable:
+        """Return `handler` timed under `name` (use for button commands and key bindings)."""
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            return self.time_handler(name, handler, *args, **kwargs)
+        return timed
+
+    def time_handler(self, name: str, handler: Callable, *args: Any, **kwargs: Any) -> Any:
+        started = self.clock()
+        try:
+            return handler(*args, **kwargs)
+        finally:
+            self.handler_times.setdefault(name, deque(maxlen=self.window)).append((self.clock() - started) * 1000)
+            self.root.after_idle(lambda: self.input_to_redraw.append((self.clock() - started) * 1000))
+
+    # --- Reporting ---
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "heartbeat_lag": _summary(self.heartbeat_lag),
+            "input_to_redraw": _summary(self.input_to_redraw),
+            "handlers": {name: _summary(samples) for name, samples in self.handler_times.items()},
+        }
+
+    def summary_line(self) -> str:
+        stats = self.stats()
+        lag, redraw = stats["heartbeat_lag"], stats["input_to_redraw"]
+        line = (f"lag p50 {lag['p50']:.0f} ms, p99 {lag['p99']:.0f} ms | "
+                f"input->redraw p50 {redraw['p50']:.0f} ms, p99 {redraw['p99']:.0f} ms")
+        if stats["handlers"]:
+            slowest, timing = max(stats["handlers"].items(), key=lambda item: item[1]["p99"])
+            line += f" | slowest: {slowest} p99 {timing['p99']:.0f} ms"
+        return line
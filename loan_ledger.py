@@ -0,0 +1,350 @@
+"""
+loan_ledger.py
+
+Multi-loan ledger used by GameState.
+
+Every loan has its own balance, annual rate, term and payment interval,
+stored in parallel NumPy arrays. Daily interest for all loans accrues in one
+vectorized pass (or in closed form over skipped days), which also rebuilds
+a Fenwick tree over the balances in place. The tree keeps outstanding-balance
+queries at O(log n) and finds where a repayment runs out by binary lifting.
+Loan ids are stable; closed loans are compacted out of the arrays once they
+make up half of the slots, so hundreds of credit lines stay cheap to tick.
+
+Loan products and their terms are configured in config.LOAN_PRODUCTS.
+"""
+
+import math
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+import config
+
+
+def product_rate(product_key: str) -> float:
+    """Annual interest rate for a loan product at the selected difficulty."""
+    difficulty = config.DIFFICULTY_LEVELS.get(config.SELECTED_DIFFICULTY, {})
+    return (config.ANNUAL_LOAN_INTEREST_RATE
+            * difficulty.get("loan_interest_modifier", 1.0)
+            * config.LOAN_PRODUCTS[product_key]["rate_multiplier"])
+
+
+def installment_amount(principal: int, annual_rate: float, term_days: int, interval_days: int) -> int:
+    """Level payment that amortizes principal over term_days with payments every interval_days."""
+    payments = max(1, term_days // interval_days)
+    period_rate = (1 + annual_rate / 365) ** interval_days - 1
+    if period_rate <= 0:
+        return math.ceil(principal / payments)
+    return math.ceil(principal * period_rate / (1 - (1 + period_rate) ** -payments))
+
+
+class LoanLedger:
+    """Parallel arrays of loans plus a Fenwick tree over their balances."""
+
+    def __init__(self, capacity: int = 8):
+        self.count = 0 # Slots in use, oldest loan first; closed loans keep their slot until compacted
+        self.total_outstanding = 0
+        self.products: List[str] = []
+        self.next_id = 0
+        self._slots: Dict[int, int] = {} # loan id -> slot
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        old_count = self.count
+        def grow(old: Optional[np.ndarray], dtype: Any) -> np.ndarray:
+            arr = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                arr[:old_count] = old[:old_count]
+            return arr
+        self.ids = grow(getattr(self, "ids", None), np.int64)
+        self.balance = grow(getattr(self, "balance", None), np.int64)
+        self.rate = grow(getattr(self, "rate", None), np.float64)
+        self.start_day = grow(getattr(self, "start_day", None), np.int64)
+        self.term_days = grow(getattr(self, "term_days", None), np.int64)
+        self.interval_days = grow(getattr(self, "interval_days", None), np.int64)
+        self.installment = grow(getattr(self, "installment", None), np.int64)
+        self.capacity = capacity
+        self._tree = np.zeros(capacity + 1, dtype=np.int64)
+        self._prefix = np.zeros(capacity + 1, dtype=np.int64)
+        self._rebuild_tree()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, loan_id: int) -> bool:
+        return loan_id in self._slots
+
+    def _compact(self) -> None:
+        """Drop closed loans, keeping open ones oldest first, and shrink the arrays to fit."""
+        n = self.count
+        keep = np.flatnonzero(self.balance[:n] > 0)
+        if keep.size == n:
+            return
+        for arr in (self.ids, self.balance, self.rate, self.start_day, self.term_days, self.interval_days, self.installment):
+            arr[:keep.size] = arr[keep]
+            arr[keep.size:n] = 0
+        self.products = [self.products[slot] for slot in keep.tolist()]
+        self.count = keep.size
+        self._slots = {loan_id: slot for slot, loan_id in enumerate(self.ids[:self.count].tolist())}
+        capacity = self.capacity
+        while capacity > 8 and capacity >= 4 * self.count:
+            capacity //= 2
+        if capacity != self.capacity:
+            self._allocate(capacity)
+        else:
+            self._rebuild_tree()
+
+    def _compact_if_sparse(self) -> None:
+        """Compact once at least half of the used slots hold closed loans."""
+        if self.count >= 8 and 2 * np.count_nonzero(self.balance[:self.count]) <= self.count:
+            self._compact()
+
+    # --- Fenwick tree (1-indexed) over balances ---
+    def _rebuild_tree(self) -> None:
+        """Rebuild the tree in place from a prefix sum, in O(capacity) after a vectorized balance update."""
+        prefix = self._prefix
+        np.cumsum(self.balance, out=prefix[1:])
+        idx = np.arange(1, self.capacity + 1)
+        np.subtract(prefix[1:], prefix[idx - (idx & -idx)], out=self._tree[1:])
+
+    def _tree_add(self, slot: int, delta: int) -> None:
+        i = slot + 1
+        while i <= self.capacity:
+            self._tree[i] += delta
+            i += i & -i
+
+    def outstanding_through(self, loan_id: int) -> int:
+        """Sum of balances of the open loans up to and including loan_id (oldest first) in O(log n)."""
+        total = 0
+        i = min(self._slots[loan_id] + 1, self.capacity)
+        while i > 0:
+            total += int(self._tree[i])
+            i -= i & -i
+        return total
+
+    def _first_slot_covering(self, amount: int) -> int:
+        """Smallest slot whose prefix balance reaches amount (binary lifting, O(log n))."""
+        position = 0
+        remaining = amount
+        step = 1 << (self.capacity.bit_length() - 1)
+        while step:
+            nxt = position + step
+            if nxt <= self.capacity and self._tree[nxt] < remaining:
+                position = nxt
+                remaining -= int(self._tree[nxt])
+            step >>= 1
+        return position # 0-based slot where the prefix sum first reaches amount
+
+    def _set_balance(self, slot: int, new_balance: int) -> None:
+        delta = new_balance - int(self.balance[slot])
+        if delta:
+            self.balance[slot] = new_balance
+            self._tree_add(slot, delta)
+            self.total_outstanding += delta
+
+    # --- Loans ---
+    def add_loan(self, amount: int, product_key: str, day: int, annual_rate: Optional[float] = None,
+                 loan_id: Optional[int] = None) -> int:
+        """Open a new loan and return its id."""
+        if self.count == self.capacity:
+            self._compact()
+            if self.count == self.capacity:
+                self._allocate(self.capacity * 2)
+        product = config.LOAN_PRODUCTS[product_key]
+        loan_id = self.next_id if loan_id is None else loan_id
+        self.next_id = max(self.next_id, loan_id + 1)
+        slot = self.count
+        self.count += 1
+        self._slots[loan_id] = slot
+        self.ids[slot] = loan_id
+        self.products.append(product_key)
+        self.rate[slot] = annual_rate if annual_rate is not None else product_rate(product_key)
+        self.start_day[slot] = day
+        self.term_days[slot] = product["term_days"]
+        self.interval_days[slot] = product["payment_interval_days"]
+        self.installment[slot] = 0
+        if product["payment_interval_days"] > 0:
+            self.installment[slot] = installment_amount(amount, self.rate[slot], product["term_days"],
+                                                        product["payment_interval_days"])
+        self._set_balance(slot, amount)
+        return loan_id
+
+    def outstanding(self, loan_id: int) -> int:
+        """Balance of a loan (0 once it is repaid and compacted away)."""
+        slot = self._slots.get(loan_id)
+        return int(self.balance[slot]) if slot is not None else 0
+
+    def product(self, loan_id: int) -> str:
+        return self.products[self._slots[loan_id]]
+
+    def annual_rate(self, loan_id: int) -> float:
+        return float(self.rate[self._slots[loan_id]])
+
+    def active_loan_ids(self) -> List[int]:
+        n = self.count
+        return self.ids[:n][self.balance[:n] > 0].tolist()
+
+    def next_due_day(self, loan_id: int, day: int) -> Optional[int]:
+        """Next payment day strictly after `day` for a scheduled loan (None for credit lines and closed loans)."""
+        slot = self._slots.get(loan_id)
+        if slot is None:
+            return None
+        interval = int(self.interval_days[slot])
+        if interval <= 0:
+            return None
+        start = int(self.start_day[slot])
+        end = start + int(self.term_days[slot])
+        due = start + ((day - start) // interval + 1) * interval
+        return min(due, end) if day < end else None
+
+    def payment_due(self, loan_id: int, day: int) -> int:
+        """Amount due on a payment day: the installment, or the full balance at the end of the term."""
+        slot = self._slots.get(loan_id)
+        if slot is None:
+            return 0
+        balance = int(self.balance[slot])
+        if day >= int(self.start_day[slot] + self.term_days[slot]):
+            return balance
+        return min(balance, int(self.installment[slot]))
+
+    def pay_loan(self, loan_id: int, amount: int) -> int:
+        """Pay up to amount toward one loan; returns the amount applied."""
+        slot = self._slots.get(loan_id)
+        if slot is None:
+            return 0
+        paid = max(0, min(amount, int(self.balance[slot])))
+        self._set_balance(slot, int(self.balance[slot]) - paid)
+        return paid
+
+    def repay(self, amount: int) -> List[Tuple[int, int]]:
+        """
+        Allocate a repayment across loans oldest first. The slot where the money runs
+        out is found with one O(log n) binary-lifting search over the tree; every open
+        loan before it is paid off, at O(log n) per loan closed. Returns
+        (loan_id, amount_paid) pairs.
+        """
+        amount = min(amount, self.total_outstanding)
+        if amount <= 0:
+            return []
+        last = self._first_slot_covering(amount)
+        allocations: List[Tuple[int, int]] = []
+        # Closed slots are at most half of the used ones (see _compact_if_sparse), so this scan stays proportional to open loans
+        for slot in np.flatnonzero(self.balance[:last] > 0).tolist():
+            paid = int(self.balance[slot])
+            self._set_balance(slot, 0)
+            allocations.append((int(self.ids[slot]), paid))
+            amount -= paid
+        paid = min(amount, int(self.balance[last]))
+        if paid > 0:
+            self._set_balance(last, int(self.balance[last]) - paid)
+            allocations.append((int(self.ids[last]), paid))
+        return allocations
+
+    # --- Interest ---
+    def accrue_daily(self) -> int:
+        """
+        Add one day of interest to every loan in one vectorized pass; returns total interest.
+        Every open balance changes, so the tree is rebuilt in place in the same O(n) pass
+        (closed loans are compacted away first, which keeps n close to the open loans).
+        """
+        self._compact_if_sparse()
+        n = self.count
+        if n == 0 or self.total_outstanding <= 0:
+            return 0
+        balance = self.balance[:n]
+        # Same expression as the original single loan: int(loan * rate / 365), capitalized
+        interest = (balance * self.rate[:n] / 365).astype(np.int64)
+        total = int(interest.sum())
+        if total:
+            balance += interest
+            self.total_outstanding += total
+            self._rebuild_tree()
+        return total
+
+    def accrue_days(self, days: int) -> int:
+        """
+        Add `days` days of interest in closed form; equal to calling accrue_daily() `days` times.
+        A loan's daily interest only changes when its balance crosses a multiple of 365/rate,
+        so each loop iteration jumps every loan over a whole run of equal-interest days.
+        """
+        self._compact_if_sparse()
+        n = self.count
+        if n == 0 or days <= 0 or self.total_outstanding <= 0:
+            return 0
+        balance = self.balance[:n]
+        rate = self.rate[:n]
+        before = int(balance.sum())
+        remaining = np.full(n, days, dtype=np.int64)
+        while True:
+            daily = (balance * rate / 365).astype(np.int64)
+            idx = np.flatnonzero((remaining > 0) & (daily > 0))
+            if idx.size == 0:
+                break
+            b, r, d = balance[idx], rate[idx], daily[idx]
+            run = np.maximum(1, np.ceil(((d + 1) * 365 / r - b) / d)).astype(np.int64)
+            # Correct the estimate for float rounding so the truncation matches per-day accrual
+            while True:
+                too_long = (run > 1) & (((b + d * (run - 1)) * r / 365).astype(np.int64) != d)
+                if not too_long.any():
+                    break
+                run[too_long] -= 1
+            while True:
+                too_short = ((b + d * run) * r / 365).astype(np.int64) == d
+                if not too_short.any():
+                    break
+                run[too_short] += 1
+            steps = np.minimum(run, remaining[idx])
+            balance[idx] = b + d * steps
+            remaining[idx] -= steps
+        total = int(balance.sum()) - before
+        if total:
+            self.total_outstanding += total
+            self._rebuild_tree()
+        return total
+
+    def daily_interest(self) -> int:
+        """Interest all loans would accrue today, without applying it."""
+        n = self.count
+        return int((self.balance[:n] * self.rate[:n] / 365).astype(np.int64).sum()) if n else 0
+
+    def amortization_schedule(self, loan_id: int, day: int) -> List[Dict[str, Any]]:
+        """Projected remaining payments for a scheduled loan from `day`, assuming each one is paid in full."""
+        slot = self._slots[loan_id]
+        term_end = int(self.start_day[slot] + self.term_days[slot])
+        rate = float(self.rate[slot])
+        balance = self.outstanding(loan_id)
+        schedule: List[Dict[str, Any]] = []
+        due = self.next_due_day(loan_id, day)
+        while due is not None and balance > 0:
+            interest = 0
+            for _ in range(due - day):
+                daily = int(balance * rate / 365)
+                balance += daily
+                interest += daily
+            payment = balance if due >= term_end else min(balance, int(self.installment[slot]))
+            balance -= payment
+            schedule.append({"day": due, "payment": payment, "interest": interest,
+                             "principal": payment - interest, "balance": balance})
+            day = due
+            due = self.next_due_day(loan_id, day)
+        return schedule
+
+    # --- Persistence ---
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Open loans, oldest first; closed loans are not saved."""
+        return [
+            {"id": int(self.ids[i]), "product": self.products[i], "balance": int(self.balance[i]), "rate": float(self.rate[i]),
+             "start_day": int(self.start_day[i]), "installment": int(self.installment[i])}
+            for i in range(self.count) if self.balance[i] > 0
+        ]
+
+    @classmethod
+    def from_list(cls, loans: List[Dict[str, Any]]) -> "LoanLedger":
+        """Rebuild a ledger from to_list() output; older saves without ids number loans by position."""
+        ledger = cls(max(8, len(loans)))
+        for index, loan in enumerate(loans):
+            if loan["balance"] <= 0:
+                continue
+            loan_id = ledger.add_loan(loan["balance"], loan["product"], loan["start_day"], loan["rate"], loan.get("id", index))
+            slot = ledger._slots[loan_id]
+            ledger.installment[slot] = loan.get("installment", ledger.installment[slot])
+        return ledger
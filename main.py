@@ -1,33 +1,106 @@
-import sys
+import argparse
 from colorama import init
 
 from game_state import GameState
 from view import CLIView
 from controller import GameController
-from gui_interface import TycoonGUI
+from profiling import Profiler
+from day_summary import VERBOSITY_LEVELS, FULL
+import config
 
 # Initialize colorama for colored text
 init()
 
-def main():
-    """Main entry point for the game."""
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Business Tycoon Adventure")
+    parser.add_argument("--gui", action="store_true", help="Play with the graphical interface")
+    parser.add_argument("--script", metavar="PLAN", help="Play a JSON plan file non-interactively (see scripted_view.py)")
+    parser.add_argument("--transcript", metavar="PATH", help="With --script, write the JSON transcript here")
+    parser.add_argument("--diff-screen", action="store_true",
+                        help="CLI: keep the status and menu at the top of the screen and repaint only changed lines")
+    parser.add_argument("--verbosity", choices=VERBOSITY_LEVELS,
+                        help="CLI: 'summary' or 'quiet' aggregate auto work/rest and waited days into summary lines")
+    parser.add_argument("--simulate", metavar="DAYS", type=int, help="Run DAYS idle days headlessly and print the result")
+    parser.add_argument("--seed", type=int, help="With --simulate, seed the simulation")
+    parser.add_argument("--profile", metavar="PREFIX",
+                        help="Profile the session: write PREFIX.pstats and phase-annotated collapsed stacks to PREFIX.folded")
+    parser.add_argument("--lag-log", metavar="PATH", help="With --gui, append the responsiveness monitor's readout to PATH every second")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="Trace allocations and print, by subsystem, the memory the session left behind (see memory_report.py)")
+    return parser.parse_args()
+
+def run(args: argparse.Namespace) -> None:
+    if args.script:
+        # Scripted run: the real controller, answered from the plan, no terminal I/O
+        from scripted_view import ScriptError, load_plan, run_plan
+        try:
+            document = run_plan(load_plan(args.script), args.transcript)
+        except ScriptError as error:
+            print(f"Script error: {error}")
+            return
+        final = document["final"]
+        print(f"Played {document['days']} days in {document['elapsed_seconds']:.2f}s: "
+              f"Day {final['day']}, ${final['money']}, reputation {final['reputation']}.")
+        return
+
     # Create the game state (Model)
     game_state = GameState()
-    
+
+    if args.simulate is not None:
+        # Headless run of the day loop with no player actions
+        from engine import GameEngine
+        GameEngine(game_state, seed=args.seed).simulate(args.simulate)
+        print(f"Simulated {args.simulate} days: Day {game_state.day}, ${game_state.money}, reputation {game_state.reputation}.")
+        return
+
     # Check if GUI mode is requested
-    if len(sys.argv) > 1 and sys.argv[1] == "--gui":
+    if args.gui:
         # Use GUI interface
+        from gui_interface import TycoonGUI
         # Create controller first if GUI needs it for initialization or direct calls
-        controller = GameController(game_state, None) # Temporarily None for view, will be GUI
-        gui = TycoonGUI(game_state, controller) 
+        controller = GameController(game_state, None, verbosity=FULL) # Temporarily None for view, will be GUI
+        gui = TycoonGUI(game_state, controller, lag_log=args.lag_log)
         controller.view = gui # Assign GUI as the view for the controller
         gui.run()
     else:
         # Use CLI interface with MVC pattern
-        view = CLIView()
-        controller = GameController(game_state, view)
+        view = CLIView(diff=args.diff_screen or config.CLI_DIFF_SCREEN)
+        controller = GameController(game_state, view, verbosity=args.verbosity)
         view.set_controller_reference(controller)
         controller.start_game()
 
+def main():
+    """Main entry point for the game."""
+    args = parse_args()
+    if args.memory_report:
+        from memory_report import MemoryTracker
+        tracker = MemoryTracker()
+        tracker.start()
+        tracker.checkpoint("start")
+        try:
+            run_profiled(args)
+        finally:
+            tracker.checkpoint("after") # What outlives the session
+            tracker.stop()
+            print(tracker.report())
+    else:
+        run_profiled(args)
+
+def run_profiled(args: argparse.Namespace) -> None:
+    if not args.profile:
+        run(args)
+        return
+    profiler = Profiler(args.profile)
+    profiler.start()
+    try:
+        run(args)
+    finally:
+        pstats_path, folded_path = profiler.stop()
+        print(f"Profile written to {pstats_path} and {folded_path}.")
+        totals = profiler.phase_totals()
+        samples = sum(totals.values())
+        for name, count in totals.most_common():
+            print(f"  {name:10} {count / samples:6.1%} of {samples} samples")
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
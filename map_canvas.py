@@ -0,0 +1,160 @@
+"""
+map_canvas.py
+
+Live business map for TycoonGUI, drawn on a Tk Canvas.
+
+BusinessMapCanvas lays out the rooms of a BusinessMap (see business_map.py)
+as persistent canvas items: a frame, title and text per room, fill bars for
+storage and research, and a sprite per employee slot. The items are created
+once. A redraw asks the BusinessMap which rooms changed (by cell version),
+updates only those rooms, and for each item calls itemconfigure/coords only
+when its options or coordinates actually differ from what is on screen.
+Change notifications are coalesced into at most one redraw per
+GUI_MAP_FRAME_MS, so the map can stay open during long runs at little cost.
+"""
+
+import tkinter as tk
+from typing import Dict, Any, List, Optional, Tuple
+from colorama import Fore, Style
+from business_map import BusinessMap, Position, TITLE
+import config
+
+ROOM_WIDTH = 150
+ROOM_HEIGHT = 112
+GAP = 12
+HEADER_HEIGHT = 56
+BAR_HEIGHT = 8
+SPRITE_SIZE = 16
+
+# Tk colors for the CLI colors rooms are rendered with
+ROOM_COLORS = {
+    Fore.CYAN: "#00838f",
+    Fore.GREEN: "#2e7d32",
+    Fore.RED: "#c62828",
+    Fore.YELLOW: "#ef6c00",
+    Fore.MAGENTA: "#6a1b9a",
+    Style.DIM: "#9e9e9e",
+}
+EMPTY_SLOT_COLOR = "#e0e0e0"
+
+
+class BusinessMapCanvas(tk.Canvas):
+    """Canvas view of a BusinessMap that updates only the items whose state changed."""
+
+    def __init__(self, parent: Any, business_map: BusinessMap, frame_ms: Optional[int] = None, **kwargs: Any):
+        self.map = business_map
+        self.frame_ms = frame_ms if frame_ms is not None else config.GUI_MAP_FRAME_MS
+        columns = max((len(row) for row in business_map.layout), default=0)
+        width = max(GAP + columns * (ROOM_WIDTH + GAP), 360)
+        height = HEADER_HEIGHT + len(business_map.layout) * (ROOM_HEIGHT + GAP)
+        kwargs.setdefault("bg", "#ffffff")
+        super().__init__(parent, width=width, height=height, highlightthickness=0, **kwargs)
+        self._items: Dict[Position, Dict[str, Any]] = {}
+        self._drawn_versions: Dict[Position, int] = {}
+        self._shown: Dict[Any, Any] = {} # item id (or ("coords", id)) -> last options (or coords) sent to Tk
+        self._redraw_after: Optional[str] = None
+        self.item_updates = 0 # itemconfigure/coords calls made so far, for profiling
+
+        self.create_text(width // 2, 16, text=TITLE, font=("Segoe UI", 13, "bold"), fill=ROOM_COLORS[Fore.CYAN])
+        self._header = self.create_text(width // 2, 38, text="", font=("Segoe UI", 10))
+        for position, room in business_map.rooms.items():
+            if room.kind:
+                self._items[position] = self._create_room(position, room.kind)
+        self._redraw()
+
+    def _create_room(self, position: Position, kind: str) -> Dict[str, Any]:
+        row, column = position
+        x = GAP + column * (ROOM_WIDTH + GAP)
+        y = HEADER_HEIGHT + row * (ROOM_HEIGHT + GAP)
+        items: Dict[str, Any] = {
+            "origin": (x, y),
+            "frame": self.create_rectangle(x, y, x + ROOM_WIDTH, y + ROOM_HEIGHT, width=2),
+            "title": self.create_text(x + 8, y + 6, anchor="nw", font=("Segoe UI", 10, "bold")),
+            # Employee rooms draw sprites under the title and keep the text for an overflow count
+            "body": self.create_text(x + 8, y + (ROOM_HEIGHT - 26 if kind == "employees" else 26), anchor="nw",
+                                     font=("Segoe UI", 9), width=ROOM_WIDTH - 16),
+        }
+        if kind in ("storage", "research"):
+            bar_y = y + ROOM_HEIGHT - BAR_HEIGHT - 10
+            items["bar_back"] = self.create_rectangle(x + 8, bar_y, x + ROOM_WIDTH - 8, bar_y + BAR_HEIGHT,
+                                                      fill=EMPTY_SLOT_COLOR, outline="")
+            items["bar"] = self.create_rectangle(x + 8, bar_y, x + 8, bar_y + BAR_HEIGHT, outline="")
+        elif kind == "employees":
+            per_line = max(1, (ROOM_WIDTH - 16) // (SPRITE_SIZE + 6))
+            sprites = []
+            for slot in range(self.map.employee_slots):
+                sprite_x = x + 8 + (slot % per_line) * (SPRITE_SIZE + 6)
+                sprite_y = y + 28 + (slot // per_line) * (SPRITE_SIZE * 2)
+                head = self.create_oval(sprite_x + 4, sprite_y, sprite_x + SPRITE_SIZE - 4, sprite_y + 8, outline="")
+                body = self.create_rectangle(sprite_x + 1, sprite_y + 9, sprite_x + SPRITE_SIZE - 1,
+                                             sprite_y + SPRITE_SIZE + 4, outline="")
+                sprites.append((head, body))
+            items["sprites"] = sprites
+        return items
+
+    # --- Redraws ---
+    def request_redraw(self) -> None:
+        """Redraw on the next frame, however many changes arrive before then."""
+        if self._redraw_after is None:
+            self._redraw_after = self.after(self.frame_ms, self._redraw)
+
+    def destroy(self) -> None:
+        if self._redraw_after is not None:
+            self.after_cancel(self._redraw_after)
+            self._redraw_after = None
+        super().destroy()
+
+    def _redraw(self) -> None:
+        self._redraw_after = None
+        self.map.refresh()
+        state = self.map.game_state
+        self._configure(self._header, text=f"Day {state.day}    Money ${state.money}    "
+                                           f"Reputation {state.reputation}    Loan ${state.loan}")
+        for position, items in self._items.items():
+            room = self.map.rooms[position]
+            if self._drawn_versions.get(position) != room.version:
+                self._drawn_versions[position] = room.version
+                self._update_room(room.kind, room.key, room.lines, ROOM_COLORS.get(room.color, ROOM_COLORS[Fore.CYAN]), items)
+
+    def _update_room(self, kind: str, key: Tuple[Any, ...], lines: List[str], color: str, items: Dict[str, Any]) -> None:
+        self._configure(items["frame"], outline=color)
+        self._configure(items["title"], text=lines[0] if lines else "", fill=color)
+        body = lines[1:]
+        if kind == "employees":
+            count, = key
+            body = [f"x{count}"] if count > self.map.employee_slots else []
+            for slot, (head, torso) in enumerate(items["sprites"]):
+                fill = color if slot < count else EMPTY_SLOT_COLOR
+                self._configure(head, fill=fill)
+                self._configure(torso, fill=fill)
+        elif kind == "storage":
+            used, capacity = key
+            self._set_bar(items, used / capacity if capacity else 1.0, color)
+        elif kind == "research":
+            project, progress = key
+            spec = config.RESEARCH_PROJECTS_SPECS.get(project) if project else None
+            self._set_bar(items, progress / spec["duration"] if spec and spec["duration"] else 0.0, color)
+        self._configure(items["body"], text="\n".join(body))
+
+    def _set_bar(self, items: Dict[str, Any], fraction: float, color: str) -> None:
+        x, y = items["origin"]
+        bar_y = y + ROOM_HEIGHT - BAR_HEIGHT - 10
+        filled = int((ROOM_WIDTH - 16) * max(0.0, min(1.0, fraction)))
+        self._coords(items["bar"], x + 8, bar_y, x + 8 + filled, bar_y + BAR_HEIGHT)
+        self._configure(items["bar"], fill=color)
+
+    def _configure(self, item: int, **options: Any) -> None:
+        """itemconfigure `item`, skipping the call when nothing differs from what is on screen."""
+        shown = self._shown.setdefault(item, {})
+        changed = {name: value for name, value in options.items() if shown.get(name) != value}
+        if changed:
+            shown.update(changed)
+            self.itemconfigure(item, **changed)
+            self.item_updates += 1
+
+    def _coords(self, item: int, *coords: int) -> None:
+        key = ("coords", item)
+        if self._shown.get(key) != coords:
+            self._shown[key] = coords
+            self.coords(item, *coords)
+            self.item_updates += 1
@@ -0,0 +1,151 @@
+"""
+market_trajectory.py
+
+Pre-generated market randomness for fast-forward and batch runs.
+
+A MarketTrajectory holds, per simulated day, every random number
+EventManager.update_market and get_random_event would otherwise draw one at a
+time: the market random-walk step, the special-event roll, competitor action
+rolls and the rolls used to build the random event itself. Days are generated
+lazily in blocks from (seed, block index), so the same seed always yields the
+same market path no matter how far ahead it is consumed.
+
+Trajectories can be saved to and loaded from .npz files so different policies
+can be compared on identical market paths (common random numbers).
+"""
+
+from typing import Dict, List
+import numpy as np
+import config
+
+# Uniform rolls reserved per day for building a random event (event kind, amount, sub-event, spare)
+EVENT_ROLLS_PER_DAY = 4
+
+
+class MarketTrajectory:
+    """Per-seed NumPy buffers of daily market rolls, generated in blocks."""
+
+    FIELDS = (
+        "market_step",             # random-walk step in MARKET_TREND_DAILY_FLUCTUATION_RANGE
+        "special_event_roll",      # compared against SPECIAL_EVENT_CHANCE
+        "competitor_act_roll",     # compared against COMPETITOR_ACTION_CHANCE
+        "competitor_pick_roll",    # which competitor acts
+        "competitor_action_roll",  # which action a random-strategy competitor takes
+    )
+
+    def __init__(self, seed: int, block_days: int = config.MARKET_TRAJECTORY_BLOCK_DAYS):
+        self.seed = int(seed)
+        self.block_days = int(block_days)
+        self.days = 0
+        self.capacity = 0
+        self.arrays: Dict[str, np.ndarray] = {field: np.empty(0) for field in self.FIELDS}
+        self.event_rolls = np.empty((0, EVENT_ROLLS_PER_DAY))
+
+    def _allocate(self, capacity: int) -> None:
+        """Grow the buffers to `capacity` days, keeping the generated ones (doubling keeps ensure() linear)."""
+        days = self.days
+        def grow(old: np.ndarray) -> np.ndarray:
+            arr = np.empty((capacity,) + old.shape[1:])
+            arr[:days] = old[:days]
+            return arr
+        self.arrays = {field: grow(arr) for field, arr in self.arrays.items()}
+        self.event_rolls = grow(self.event_rolls)
+        self.capacity = capacity
+
+    def _generate_block(self, block_index: int) -> None:
+        """Append one block of days generated from (seed, block_index)."""
+        rng = np.random.default_rng([self.seed, block_index])
+        n = self.block_days
+        start = self.days
+        if start + n > self.capacity:
+            self._allocate(max(start + n, 2 * self.capacity))
+        low, high = config.MARKET_TREND_DAILY_FLUCTUATION_RANGE
+        block = {
+            "market_step": rng.uniform(low, high, n),
+            "special_event_roll": rng.random(n),
+            "competitor_act_roll": rng.random(n),
+            "competitor_pick_roll": rng.random(n),
+            "competitor_action_roll": rng.random(n),
+        }
+        for field in self.FIELDS:
+            self.arrays[field][start:start + n] = block[field]
+        self.event_rolls[start:start + n] = rng.random((n, EVENT_ROLLS_PER_DAY))
+        self.days += n
+
+    def ensure(self, days: int) -> None:
+        """Make sure at least `days` days are generated."""
+        while self.days < days:
+            self._generate_block(self.days // self.block_days)
+
+    def slice(self, field: str, start: int, count: int) -> np.ndarray:
+        """Return `count` days of one field starting at day index `start` (a view, no copy)."""
+        self.ensure(start + count)
+        return self.arrays[field][start:start + count]
+
+    def value(self, field: str, day_index: int) -> float:
+        """Return one field for one day index."""
+        self.ensure(day_index + 1)
+        return float(self.arrays[field][day_index])
+
+    def event_rng(self, day_index: int) -> "DayRolls":
+        """Return a random-like source that replays the event rolls of one day."""
+        self.ensure(day_index + 1)
+        return DayRolls(self.event_rolls[day_index])
+
+    # --- Persistence ---
+    def save(self, path: str) -> None:
+        """Save the generated days to an .npz file."""
+        days = self.days
+        np.savez_compressed(path, seed=self.seed, block_days=self.block_days, event_rolls=self.event_rolls[:days],
+                            **{field: arr[:days] for field, arr in self.arrays.items()})
+
+    @classmethod
+    def load(cls, path: str) -> "MarketTrajectory":
+        """Load a trajectory saved with save(); further days continue the same seed."""
+        with np.load(path) as data:
+            trajectory = cls(int(data["seed"]), int(data["block_days"]))
+            for field in cls.FIELDS:
+                trajectory.arrays[field] = data[field]
+            trajectory.event_rolls = data["event_rolls"]
+        trajectory.days = trajectory.capacity = len(trajectory.arrays["market_step"])
+        return trajectory
+
+
+class DayRolls:
+    """Minimal stand-in for the random module that replays a fixed row of uniform rolls."""
+
+    def __init__(self, rolls: np.ndarray):
+        self.rolls: List[float] = rolls.tolist()
+        self.position = 0
+
+    def random(self) -> float:
+        # Wrap around rather than fail if an event ever needs more rolls than reserved
+        u = self.rolls[self.position % len(self.rolls)]
+        self.position += 1
+        return u
+
+    def randint(self, a: int, b: int) -> int:
+        return a + min(int(self.random() * (b - a + 1)), b - a)
+
+
+_trajectory_cache: Dict[int, MarketTrajectory] = {}
+
+def shared_trajectory(seed: int) -> MarketTrajectory:
+    """Return the in-process trajectory for seed, so experiments in one run share market paths."""
+    if seed not in _trajectory_cache:
+        _trajectory_cache[seed] = MarketTrajectory(seed)
+    return _trajectory_cache[seed]
+
+
+def load_or_generate(path: str, seed: int, days: int) -> MarketTrajectory:
+    """Load a stored trajectory from path, or generate `days` days for seed and store them there."""
+    try:
+        trajectory = MarketTrajectory.load(path)
+        if trajectory.seed != seed:
+            raise ValueError(f"Trajectory at {path} was generated for seed {trajectory.seed}, not {seed}.")
+    except FileNotFoundError:
+        trajectory = MarketTrajectory(seed)
+    if trajectory.days < days:
+        trajectory.ensure(days)
+        trajectory.save(path)
+    return trajectory
@@ -0,0 +1,260 @@
+"""
+memory_report.py
+
+Opt-in memory accounting by subsystem, built on tracemalloc snapshots.
+
+Every traced allocation is charged to the innermost frame of its traceback
+that lies in one of this game's modules, so memory allocated by the standard
+library, NumPy or Tk on behalf of the game counts towards the game code that
+asked for it. Modules map to subsystems (model, events, controller, CLI view,
+GUI); save/load and data-file code is charged to persistence whichever module
+it lives in. Allocations made outside the game (interpreter start-up, other
+libraries) are reported as "other", and the report warns about any project
+module missing from MODULE_SUBSYSTEMS, whose allocations would land there too.
+
+MemoryTracker takes labelled checkpoints and reports each subsystem's size at
+every checkpoint. A subsystem is flagged as growing when it grew at every
+checkpoint after the first, and by more than MEMORY_GROWTH_FLAG_KIB overall.
+Its biggest new allocation sites come with the flag.
+
+    python memory_report.py --days 20000 --checkpoints 5
+    python memory_report.py --sessions 50 --days 1000
+    python main.py --memory-report ...      # any CLI, GUI or scripted session
+"""
+
+import argparse
+import inspect
+import os
+import sys
+import tracemalloc
+from typing import Dict, Any, Callable, List, Optional, Tuple
+import config
+
+# Subsystems
+MODEL = "model"
+EVENTS = "events"
+CONTROLLER = "controller"
+CLI_VIEW = "cli view"
+GUI = "gui"
+PERSISTENCE = "persistence"
+TOOLING = "tooling" # Profiling, scenario and memory tooling itself
+OTHER = "other"
+SUBSYSTEMS = (MODEL, EVENTS, CONTROLLER, CLI_VIEW, GUI, PERSISTENCE, TOOLING, OTHER)
+
+MODULE_SUBSYSTEMS = {
+    "game_state.py": MODEL, "inventory.py": MODEL, "workforce.py": MODEL, "loan_ledger.py": MODEL,
+    "company.py": MODEL, "work_rules.py": MODEL, "scheduler.py": MODEL, "observation.py": MODEL, "config.py": MODEL,
+    "game_events.py": EVENTS, "event_sampler.py": EVENTS, "event_messages.py": EVENTS, "competitors.py": EVENTS, "market_trajectory.py": EVENTS,
+    "controller.py": CONTROLLER, "engine.py": CONTROLLER, "history.py": CONTROLLER, "event_bus.py": CONTROLLER,
+    "main.py": CONTROLLER, "day_summary.py": CONTROLLER,
+    "view.py": CLI_VIEW, "scripted_view.py": CLI_VIEW, "screen_writer.py": CLI_VIEW, "ui_helpers.py": CLI_VIEW,
+    "gui_interface.py": GUI, "business_map.py": GUI, "lag_monitor.py": GUI,
+    "notification_feed.py": GUI, "map_canvas.py": GUI,
+    "profiling.py": TOOLING, "scenarios.py": TOOLING, "memory_report.py": TOOLING,
+}
+
+# (module, qualified function name) pairs charged to PERSISTENCE instead of their module's subsystem
+PERSISTENCE_FUNCTIONS = (
+    ("game_state", "GameState.to_dict"), ("game_state", "GameState.save_game"), ("game_state", "GameState.load_game"),
+    ("market_trajectory", "MarketTrajectory.save"), ("market_trajectory", "MarketTrajectory.load"),
+    ("market_trajectory", "load_or_generate"), ("event_sampler", "EventTable.from_file"),
+    ("scripted_view", "load_plan"), ("scripted_view", "run_plan"),
+)
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+Totals = Dict[str, int] # Subsystem -> bytes
+
+
+def unmapped_modules() -> List[str]:
+    """Project modules under PACKAGE_DIR with no MODULE_SUBSYSTEMS entry (their allocations count as "other")."""
+    return sorted(name for name in os.listdir(PACKAGE_DIR)
+                  if name.endswith(".py") and name not in MODULE_SUBSYSTEMS)
+
+
+def _persistence_ranges() -> Dict[str, List[Tuple[int, int]]]:
+    """Line ranges of the persistence functions, keyed by module file name."""
+    ranges: Dict[str, List[Tuple[int, int]]] = {}
+    for module_name, qualified_name in PERSISTENCE_FUNCTIONS:
+        target: Any = __import__(module_name)
+        for part in qualified_name.split("."):
+            target = getattr(target, part)
+        target = inspect.unwrap(getattr(target, "__func__", target))
+        lines, first = inspect.getsourcelines(target)
+        ranges.setdefault(module_name + ".py", []).append((first, first + len(lines) - 1))
+    return ranges
+
+
+class SubsystemClassifier:
+    """Maps a tracemalloc traceback to the subsystem that owns the allocation."""
+
+    def __init__(self):
+        self.persistence_ranges = _persistence_ranges()
+        self._cache: Dict[Tuple[str, int], Optional[str]] = {}
+
+    def _frame_subsystem(self, filename: str, lineno: int) -> Optional[str]:
+        key = (filename, lineno)
+        if key not in self._cache:
+            subsystem = None
+            if os.path.dirname(os.path.abspath(filename)) == PACKAGE_DIR:
+                name = os.path.basename(filename)
+                subsystem = MODULE_SUBSYSTEMS.get(name)
+                if any(first <= lineno <= last for first, last in self.persistence_ranges.get(name, ())):
+                    subsystem = PERSISTENCE
+            self._cache[key] = subsystem
+        return self._cache[key]
+
+    def classify(self, traceback: tracemalloc.Traceback) -> str:
+        for frame in reversed(traceback): # Innermost frame last
+            subsystem = self._frame_subsystem(frame.filename, frame.lineno)
+            if subsystem is not None:
+                return subsystem
+        return OTHER
+
+
+class MemoryTracker:
+    """Labelled tracemalloc checkpoints with per-subsystem totals and growth flags."""
+
+    def __init__(self, frames: Optional[int] = None, flag_kib: Optional[int] = None):
+        self.frames = frames if frames is not None else config.MEMORY_TRACE_FRAMES
+        self.flag_kib = flag_kib if flag_kib is not None else config.MEMORY_GROWTH_FLAG_KIB
+        self.classifier = SubsystemClassifier()
+        self.checkpoints: List[Tuple[str, Totals]] = []
+        self._first: Optional[tracemalloc.Snapshot] = None
+        self._last: Optional[tracemalloc.Snapshot] = None
+        self._started_tracing = False
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def totals(self, snapshot: tracemalloc.Snapshot) -> Totals:
+        totals = dict.fromkeys(SUBSYSTEMS, 0)
+        for trace in snapshot.traces:
+            totals[self.classifier.classify(trace.traceback)] += trace.size
+        return totals
+
+    def checkpoint(self, label: str) -> Totals:
+        """Snapshot traced memory now and record it under `label`."""
+        snapshot = self._snapshot()
+        if self._first is None:
+            self._first = snapshot
+        self._last = snapshot
+        totals = self.totals(snapshot)
+        self.checkpoints.append((label, totals))
+        return totals
+
+    def growth(self) -> Totals:
+        """Bytes each subsystem gained between the first and the last checkpoint."""
+        if len(self.checkpoints) < 2:
+            return dict.fromkeys(SUBSYSTEMS, 0)
+        first, last = self.checkpoints[0][1], self.checkpoints[-1][1]
+        return {subsystem: last[subsystem] - first[subsystem] for subsystem in SUBSYSTEMS}
+
+    def flagged(self) -> List[str]:
+        """Subsystems that grew at every checkpoint and by more than flag_kib overall."""
+        flagged = []
+        for subsystem, grown in self.growth().items():
+            sizes = [totals[subsystem] for _, totals in self.checkpoints]
+            if grown > self.flag_kib * 1024 and all(later > earlier for earlier, later in zip(sizes, sizes[1:])):
+                flagged.append(subsystem)
+        return flagged
+
+    def top_growth(self, subsystem: str, limit: int = 5) -> List[tracemalloc.StatisticDiff]:
+        """The allocation sites of `subsystem` that grew most between the first and last checkpoint."""
+        if self._first is None or self._last is None:
+            return []
+        diffs = self._last.compare_to(self._first, "traceback")
+        owned = [diff for diff in diffs if diff.size_diff > 0 and self.classifier.classify(diff.traceback) == subsystem]
+        return owned[:limit]
+
+    def report(self) -> str:
+        labels = [label for label, _ in self.checkpoints]
+        width = max([12] + [len(label) for label in labels])
+        lines = ["subsystem    " + "".join(f"{label:>{width}}" for label in labels) + f"{'growth':>{width}}"]
+        growth = self.growth()
+        for subsystem in SUBSYSTEMS:
+            sizes = "".join(f"{totals[subsystem] // 1024:>{width - 4}} KiB" for _, totals in self.checkpoints)
+            lines.append(f"{subsystem:12} {sizes}{growth[subsystem] // 1024:>+{width - 4}} KiB")
+        for subsystem in self.flagged():
+            lines.append(f"GROWING: {subsystem} gained {growth[subsystem] // 1024} KiB and grew at every checkpoint. Top sites:")
+            for diff in self.top_growth(subsystem):
+                site = _owning_frame(diff.traceback)
+                lines.append(f"  {diff.size_diff // 1024:+8} KiB {diff.count_diff:+8} blocks  {site}")
+        unmapped = unmapped_modules()
+        if unmapped:
+            lines.append(f"WARNING: {', '.join(unmapped)} not in MODULE_SUBSYSTEMS; their allocations are reported as {OTHER}.")
+        return "\n".join(lines)
+
+
+def _owning_frame(traceback: tracemalloc.Traceback) -> str:
+    """The allocating line, plus the game line it was charged to when those differ."""
+    frames = list(traceback)
+    site = f"{frames[-1].filename}:{frames[-1].lineno}"
+    for depth, frame in enumerate(reversed(frames)):
+        if os.path.dirname(os.path.abspath(frame.filename)) == PACKAGE_DIR:
+            owner = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            return owner if depth == 0 else f"{site} via {owner}"
+    return site
+
+
+def track_sessions(tracker: MemoryTracker, sessions: int, days: int, checkpoints: int,
+                   daily_policy: Optional[Callable[[Any], None]] = None, seed: int = 0) -> List[Any]:
+    """
+    Run `sessions` independent headless games side by side for `days` days each,
+    taking `checkpoints` checkpoints after the initial one. Returns the engines.
+    """
+    from game_state import GameState
+    from engine import GameEngine
+
+    engines = [GameEngine(GameState(), seed=seed + number) for number in range(sessions)]
+    tracker.checkpoint("day 0")
+    done = 0
+    for checkpoint in range(1, checkpoints + 1):
+        target = days * checkpoint // checkpoints
+        for engine in engines:
+            engine.simulate(target - done, daily_policy)
+        done = target
+        tracker.checkpoint(f"day {done}")
+    return engines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Report memory use by subsystem over simulated days.")
+    parser.add_argument("--sessions", type=int, default=1, help="Independent games run side by side")
+    parser.add_argument("--days", type=int, default=5000)
+    parser.add_argument("--checkpoints", type=int, default=5)
+    parser.add_argument("--policy", choices=["idle", "sandbox"], default="sandbox",
+                        help="Idle days, or the scenarios.py sandbox policy (restock, work, upgrades, branches)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    policy = None
+    if args.policy == "sandbox":
+        from scenarios import sandbox
+        policy = sandbox
+    tracker = MemoryTracker()
+    tracker.start()
+    try:
+        track_sessions(tracker, args.sessions, args.days, args.checkpoints, policy, args.seed)
+    finally:
+        tracker.stop()
+    print(tracker.report())
+    return 1 if tracker.flagged() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
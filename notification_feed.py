@@ -0,0 +1,164 @@
+"""
+notification_feed.py
+
+In-window notification log for TycoonGUI, replacing modal message boxes.
+
+NotificationLog is a ring buffer of the last NOTIFICATION_LOG_CAPACITY
+notifications. A message that matches one of the last
+NOTIFICATION_AGGREGATE_LOOKBACK entries once its numbers are masked ("You
+earned $12" / "You earned $15") is folded into that entry: the entry moves
+to the bottom, shows the latest text, a repeat count and, for money
+messages, the running total of the first dollar amount.
+
+NotificationFeed shows the log in a fixed pool of NOTIFICATION_VISIBLE_ROWS
+labels with a scrollbar. Scrolling only changes which entries the pooled
+labels show, and redraws are coalesced into one after_idle pass. Widget count
+and redraw cost stay the same however long the game runs.
+"""
+
+import re
+import time
+import tkinter as tk
+from collections import deque
+from tkinter import ttk
+from typing import Dict, Any, Deque, List, Optional
+import config
+
+SEVERITY_COLORS = {
+    "success": "#2e7d32",
+    "info": "#37474f",
+    "warning": "#ef6c00",
+    "error": "#c62828",
+    "event": "#00838f",
+}
+
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+_DOLLARS = re.compile(r"\$(-?\d+)")
+
+
+class NotificationLog:
+    """Bounded, aggregating log of (text, severity) notifications."""
+
+    def __init__(self, capacity: Optional[int] = None, lookback: Optional[int] = None):
+        self.capacity = capacity if capacity is not None else config.NOTIFICATION_LOG_CAPACITY
+        self.lookback = lookback if lookback is not None else config.NOTIFICATION_AGGREGATE_LOOKBACK
+        self.entries: Deque[Dict[str, Any]] = deque(maxlen=self.capacity)
+        self.version = 0 # Bumped on every change, so views can skip redundant redraws
+        self.total_added = 0
+
+    def add(self, text: str, severity: str = "info") -> Dict[str, Any]:
+        """Append a notification, or fold it into a recent entry with the same masked text and severity."""
+        self.total_added += 1
+        self.version += 1
+        key = (severity, _NUMBER.sub("#", text))
+        dollars = _DOLLARS.search(text)
+        amount = int(dollars.group(1)) if dollars else None
+        for back in range(1, min(self.lookback, len(self.entries)) + 1):
+            entry = self.entries[-back]
+            if entry["key"] == key:
+                del self.entries[-back]
+                entry["text"] = text
+                entry["count"] += 1
+                entry["time"] = time.time()
+                if amount is not None and entry["total"] is not None:
+                    entry["total"] += amount
+                self.entries.append(entry)
+                return entry
+        entry = {"key": key, "text": text, "severity": severity, "count": 1, "total": amount, "time": time.time()}
+        self.entries.append(entry)
+        return entry
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def window(self, first: int, rows: int) -> List[Dict[str, Any]]:
+        """Entries first .. first + rows - 1 (oldest first)."""
+        return [self.entries[index] for index in range(max(0, first), min(len(self.entries), first + rows))]
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.version += 1
+
+    @staticmethod
+    def display_text(entry: Dict[str, Any]) -> str:
+        text = entry["text"].replace("\n", "  ")
+        if entry["count"] > 1:
+            total = f", total ${entry['total']}" if entry["total"] is not None else ""
+            text += f"  (x{entry['count']}{total})"
+        return f"{time.strftime('%H:%M:%S', time.localtime(entry['time']))}  {text}"
+
+
+class NotificationFeed(ttk.Frame):
+    """Scrollable view of a NotificationLog using a fixed pool of row labels."""
+
+    def __init__(self, parent: Any, log: Optional[NotificationLog] = None, rows: Optional[int] = None, **kwargs: Any):
+        super().__init__(parent, **kwargs)
+        self.log = log if log is not None else NotificationLog()
+        self.rows = rows if rows is not None else config.NOTIFICATION_VISIBLE_ROWS
+        self.first = 0 # Index of the entry in the top row
+        self.follow = True # Stick to the newest entry until the user scrolls up
+        self._drawn_version = -1
+        self._redraw_pending = False
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        body = tk.Frame(self, bg="#ffffff")
+        body.pack(side="left", fill="both", expand=True)
+        self.labels = [tk.Label(body, anchor="w", justify="left", bg="#ffffff", font=("Segoe UI", 10))
+                       for _ in range(self.rows)]
+        for label in self.labels:
+            label.pack(fill="x", padx=6)
+            label.bind("<MouseWheel>", self._on_mousewheel)
+            label.bind("<Button-4>", lambda e: self.scroll(-1))
+            label.bind("<Button-5>", lambda e: self.scroll(1))
+        body.bind("<MouseWheel>", self._on_mousewheel)
+
+    def add(self, text: str, severity: str = "info") -> None:
+        self.log.add(text, severity)
+        self.request_redraw()
+
+    def request_redraw(self) -> None:
+        """Redraw once when Tk is next idle, however many notifications arrive before then."""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def _max_first(self) -> int:
+        return max(0, len(self.log) - self.rows)
+
+    def scroll(self, rows: int) -> None:
+        self.first = min(self._max_first(), max(0, self.first + rows))
+        self.follow = self.first == self._max_first()
+        self._drawn_version = -1
+        self.request_redraw()
+
+    def _on_mousewheel(self, event: Any) -> None:
+        self.scroll(-1 if event.delta > 0 else 1)
+
+    def _on_scrollbar(self, command: str, value: str, unit: Optional[str] = None) -> None:
+        if command == "moveto":
+            self.first = int(round(float(value) * len(self.log)))
+            self.scroll(0)
+        elif command == "scroll":
+            self.scroll(int(value) * (self.rows if unit == "pages" else 1))
+
+    def _redraw(self) -> None:
+        self._redraw_pending = False
+        if self._drawn_version == self.log.version:
+            return
+        self._drawn_version = self.log.version
+        if self.follow:
+            self.first = self._max_first()
+        self.first = min(self.first, self._max_first())
+        visible = self.log.window(self.first, self.rows)
+        for row, label in enumerate(self.labels):
+            if row < len(visible):
+                entry = visible[row]
+                label.config(text=NotificationLog.display_text(entry), fg=SEVERITY_COLORS.get(entry["severity"], SEVERITY_COLORS["info"]))
+            else:
+                label.config(text="")
+        total = len(self.log)
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
@@ -0,0 +1,169 @@
+"""
+observation.py
+
+Fixed-layout float32 encoding of the GameState for agents and analytics.
+
+The observation is a flat vector of OBSERVATION_SIZE float32 values laid out
+in the order of OBSERVATION_FIELDS. The encoder writes into a caller-supplied
+buffer (array('f'), bytearray, numpy float32 array or any writable memoryview)
+and never allocates a new vector, so it can be called every simulated day.
+
+Schema version 2 layout:
+
+    idx  field                      notes
+    0    money
+    1    reputation
+    2    day
+    3    basic_supplies             inventory count
+    4    premium_supplies           inventory count
+    5    equipment                  inventory count
+    6    automation                 1.0 if purchased, else 0.0
+    7    marketing                  upgrade level
+    8    storage                    upgrade level
+    9    automation_efficiency      research multiplier (1.0 = none)
+    10   employee_count
+    11   productivity_modifier      average per-employee event modifier
+    12   productivity_duration      days left on the longest employee event
+    13   loan
+    14   market_trend
+    15   market_demand
+    16   research_active            index into RESEARCH_KEYS, -1.0 if idle
+    17   research_progress          days of progress on the active project
+    18+  research_done:<key>        1.0 per completed project, RESEARCH_KEYS order
+
+Any change to the layout (including adding a research project to config)
+must bump OBSERVATION_SCHEMA_VERSION so trained models are not silently fed
+shifted features. Version 2 changed fields 11 and 12 from a single
+company-wide employee event to the per-employee average and longest event.
+"""
+
+from array import array
+from typing import Dict, Any, Tuple
+import config
+
+OBSERVATION_SCHEMA_VERSION = 2
+
+RESEARCH_KEYS: Tuple[str, ...] = tuple(config.RESEARCH_PROJECTS_SPECS.keys())
+
+OBSERVATION_FIELDS: Tuple[str, ...] = (
+    "money",
+    "reputation",
+    "day",
+    "basic_supplies",
+    "premium_supplies",
+    "equipment",
+    "automation",
+    "marketing",
+    "storage",
+    "automation_efficiency",
+    "employee_count",
+    "productivity_modifier",
+    "productivity_duration",
+    "loan",
+    "market_trend",
+    "market_demand",
+    "research_active",
+    "research_progress",
+) + tuple(f"research_done:{key}" for key in RESEARCH_KEYS)
+
+OBSERVATION_SIZE = len(OBSERVATION_FIELDS)
+
+# Fields that hold whole numbers in GameState; the decoder rounds these back to int
+_INTEGER_FIELDS = frozenset({
+    "money", "reputation", "day", "basic_supplies", "premium_supplies", "equipment",
+    "marketing", "storage", "employee_count", "productivity_duration", "loan",
+    "research_active", "research_progress",
+})
+_BOOLEAN_FIELDS = frozenset({"automation"}) | frozenset(f"research_done:{key}" for key in RESEARCH_KEYS)
+_RESEARCH_DONE_OFFSET = OBSERVATION_FIELDS.index(f"research_done:{RESEARCH_KEYS[0]}") if RESEARCH_KEYS else OBSERVATION_SIZE
+_RESEARCH_INDEX = {key: idx for idx, key in enumerate(RESEARCH_KEYS)}
+
+
+def _as_float_view(buffer: Any) -> memoryview:
+    """Return a float32 memoryview over buffer without copying it."""
+    view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+    if view.format != "f":
+        view = view.cast("B").cast("f")
+    if view.readonly:
+        raise ValueError("Observation buffer must be writable.")
+    if len(view) < OBSERVATION_SIZE:
+        raise ValueError(f"Observation buffer holds {len(view)} floats, need {OBSERVATION_SIZE}.")
+    return view
+
+
+def make_observation_buffer() -> array:
+    """Allocate a zeroed float32 buffer large enough for one observation."""
+    return array("f", bytes(4 * OBSERVATION_SIZE))
+
+
+class ObservationEncoder:
+    """
+    Encodes GameState into a preallocated float32 buffer.
+
+    The buffer is bound once in the constructor so each encode() call only
+    writes OBSERVATION_SIZE floats in place.
+    """
+    def __init__(self, buffer: Any = None):
+        self.buffer = buffer if buffer is not None else make_observation_buffer()
+        self.view = _as_float_view(self.buffer)
+
+    def encode(self, game_state: Any) -> memoryview:
+        """Write the observation for game_state into the bound buffer and return the view."""
+        view = self.view
+        inventory = game_state.inventory
+        upgrades = game_state.upgrades
+
+        view[0] = game_state.money
+        view[1] = game_state.reputation
+        view[2] = game_state.day
+        view[3] = inventory.get("basic_supplies", 0)
+        view[4] = inventory.get("premium_supplies", 0)
+        view[5] = inventory.get("equipment", 0)
+        view[6] = 1.0 if upgrades.get("automation") else 0.0
+        view[7] = upgrades.get("marketing", 0)
+        view[8] = upgrades.get("storage", 0)
+        view[9] = upgrades.get("automation_efficiency", 1.0)
+        view[10] = len(game_state.employees)
+        view[11] = game_state.employee_productivity_modifier
+        view[12] = game_state.employee_event_duration
+        view[13] = game_state.loan
+        view[14] = game_state.market_trend
+        view[15] = game_state.current_market_demand
+
+        active_key = game_state.active_research_project
+        view[16] = _RESEARCH_INDEX.get(active_key, -1) if active_key else -1.0
+        view[17] = game_state.research_progress
+
+        completed = game_state.completed_research
+        for key, idx in _RESEARCH_INDEX.items():
+            view[_RESEARCH_DONE_OFFSET + idx] = 1.0 if key in completed else 0.0
+        return view
+
+
+def encode_observation(game_state: Any, buffer: Any) -> memoryview:
+    """One-shot helper: encode game_state into buffer. Prefer ObservationEncoder in hot loops."""
+    return ObservationEncoder(buffer).encode(game_state)
+
+
+def decode_observation(buffer: Any) -> Dict[str, Any]:
+    """Decode an observation buffer back into a field -> value dict."""
+    view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+    if view.format != "f":
+        view = view.cast("B").cast("f")
+    if len(view) < OBSERVATION_SIZE:
+        raise ValueError(f"Observation buffer holds {len(view)} floats, need {OBSERVATION_SIZE}.")
+
+    decoded: Dict[str, Any] = {"schema_version": OBSERVATION_SCHEMA_VERSION}
+    for idx, field in enumerate(OBSERVATION_FIELDS):
+        value = view[idx]
+        if field in _BOOLEAN_FIELDS:
+            decoded[field] = value >= 0.5
+        elif field in _INTEGER_FIELDS:
+            decoded[field] = int(round(value))
+        else:
+            decoded[field] = value
+
+    active_idx = decoded["research_active"]
+    decoded["active_research_project"] = RESEARCH_KEYS[active_idx] if 0 <= active_idx < len(RESEARCH_KEYS) else None
+    decoded["completed_research"] = [key for key in RESEARCH_KEYS if decoded[f"research_done:{key}"]]
+    return decoded
@@ -0,0 +1,157 @@
+"""
+profiling.py
+
+Profiling support for game sessions and headless simulations.
+
+Profiler runs cProfile and, alongside it, a stack sampler that records the
+profiled thread's call stack every PROFILE_SAMPLE_INTERVAL seconds of CPU
+time. The sampler is a SIGPROF interval timer where the platform has one
+(handlers run between bytecodes, so samples are not biased towards calls that
+release the GIL); elsewhere, or off the main thread, a sampling thread is used
+instead. On stop it writes two files next to each other:
+
+    <prefix>.pstats   cProfile statistics (python -m pstats, snakeviz, ...)
+    <prefix>.folded   collapsed stacks, one "frame;frame;frame count" line per
+                      distinct stack (flamegraph.pl, speedscope, inferno, ...)
+
+Code marks the game phase it is in with `with phase("market"):` or the
+@phased("dialog") decorator. Phases are cheap when no profiler runs, and in
+the collapsed stacks the active phases appear as root frames
+("phase:market;...") so a flame graph groups time by phase first.
+"""
+
+import cProfile
+import functools
+import os
+import signal
+import sys
+import threading
+from collections import Counter
+from typing import Any, Callable, List, Optional, Tuple
+import config
+
+# Phases used by the engine, controller and views
+MARKET = "market"
+EVENTS = "events"
+ACTION = "action"
+BRANCHES = "branches"
+INTEREST = "interest"
+RESEARCH = "research" # Scheduled effects: research completion, event expiry, loan payments
+RENDER = "render"
+DIALOG = "dialog"
+
+_phases: List[str] = [] # Active phases of the main game thread, outermost first
+
+
+class phase:
+    """Context manager marking the enclosed code as belonging to game phase `name`."""
+
+    __slots__ = ("name",) # A plain class: about a quarter of the cost of a @contextmanager per use
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> None:
+        _phases.append(self.name)
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _phases.pop()
+
+
+def phased(name: str) -> Callable:
+    """Decorator form of phase() for whole methods (GUI dialogs and actions)."""
+    def decorate(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class Profiler:
+    """cProfile plus a phase-annotated stack sampler for the thread that starts it."""
+
+    use_signal = hasattr(signal, "setitimer") and hasattr(signal, "SIGPROF")
+
+    def __init__(self, output_prefix: str, interval: Optional[float] = None):
+        self.output_prefix = output_prefix
+        self.interval = interval if interval is not None else config.PROFILE_SAMPLE_INTERVAL
+        self.samples: Counter = Counter() # Stack tuple (root first) -> sample count
+        self._profile = cProfile.Profile()
+        self._thread_id: Optional[int] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._previous_handler: Any = None
+        self._using_signal = False
+
+    def start(self) -> None:
+        self._thread_id = threading.get_ident()
+        self._using_signal = self.use_signal and threading.current_thread() is threading.main_thread()
+        if self._using_signal:
+            self._previous_handler = signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self._stopping.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, name="profile-sampler", daemon=True)
+            self._sampler.start()
+        self._profile.enable()
+
+    def stop(self) -> Tuple[str, str]:
+        """Stop profiling and write the .pstats and .folded files. Returns their paths."""
+        self._profile.disable()
+        if self._using_signal:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler)
+        self._stopping.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        return self.write()
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _record(self, frame: Any) -> None:
+        stack = []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        stack.reverse()
+        phases = tuple(f"phase:{name}" for name in tuple(_phases))
+        self.samples[phases + tuple(stack)] += 1
+
+    def _on_signal(self, signum: int, frame: Any) -> None:
+        self._record(frame)
+
+    def _sample_loop(self) -> None:
+        while not self._stopping.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self._record(frame)
+
+    def write(self) -> Tuple[str, str]:
+        pstats_path = self.output_prefix + ".pstats"
+        folded_path = self.output_prefix + ".folded"
+        self._profile.dump_stats(pstats_path)
+        with open(folded_path, "w") as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(";".join(stack) + f" {count}\n")
+        return pstats_path, folded_path
+
+    def phase_totals(self) -> Counter:
+        """Samples per innermost active phase ("(none)" outside any phase)."""
+        totals: Counter = Counter()
+        for stack, count in self.samples.items():
+            phases = [frame for frame in stack if frame.startswith("phase:")]
+            totals[phases[-1][len("phase:"):] if phases else "(none)"] += count
+        return totals
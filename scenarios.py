@@ -0,0 +1,334 @@
+"""
+scenarios.py
+
+End-to-end scenario corpus and performance regression gate.
+
+Each scenario is a seed plus a policy. Most policies play through the real
+GameController via ScriptedView (one menu decision per call); the long
+sandbox drives GameEngine directly because the controller loop stops at the
+win condition. Every run records wall time, days per second, peak traced
+memory and a checksum of the final saved state (GameState.to_dict()).
+
+    python scenarios.py                    # run all, compare with the baseline
+    python scenarios.py --update-baseline  # run all and store a new baseline
+    python scenarios.py --only loan_heavy
+
+The gate fails (exit status 1) when a scenario's final-state checksum differs
+from the baseline, or its throughput drops more than
+config.SCENARIO_THROUGHPUT_TOLERANCE below the baseline. Checksums only
+change with game logic or balance changes; update the baseline in the same
+commit when that is intended.
+
+Throughput is compared relative to the host: each timed run is paired with
+a fixed calibration loop, and the gate compares days simulated per
+calibration loop (the median over the runs) rather than raw days/s, so one
+baseline holds on slower and faster machines alike.
+
+Before any scenario runs, check_ledgers() replays config.SCENARIO_LEDGER_CHECKS
+random loan ledgers and fails the gate if LoanLedger.accrue_days(n) differs
+from n calls of accrue_daily(), or if repay() does not pay loans off strictly
+oldest first. Both rely on float-rounding corrections that the scenario
+checksums alone would only catch by chance.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import Dict, Any, Callable, List, Optional
+import numpy as np
+
+import config
+from game_state import GameState
+from engine import GameEngine
+from scripted_view import play_plan
+from loan_ledger import LoanLedger
+
+Step = Optional[Dict[str, Any]]
+
+
+def state_checksum(game_state: GameState) -> str:
+    return hashlib.sha256(json.dumps(game_state.to_dict(), sort_keys=True).encode()).hexdigest()
+
+
+def _restock_or_work(state: GameState, supply: str = "basic_supplies") -> Step:
+    """Work while there is stock, otherwise buy as much of `supply` as possible, otherwise rest."""
+    if state.inventory.total_units() > 0:
+        return {"action": "work"}
+    if state.money >= state.prices[supply]:
+        return {"action": "buy", "supply": supply, "amount": "max"}
+    return {"action": "rest"}
+
+
+# --- Controller policies (called at each main menu) ---
+def early_rush(state: GameState) -> Step:
+    """Buy basic supplies and work them off every day, resting only when reputation runs low."""
+    if state.day > 400:
+        return None
+    if state.reputation < 20:
+        return {"action": "rest"}
+    return _restock_or_work(state)
+
+
+def loan_heavy(state: GameState) -> Step:
+    """Borrow to the limit on installment loans, bulk-work premium supplies and repay when flush."""
+    if state.day > 400:
+        return None
+    if state.reputation < 20:
+        return {"action": "rest"}
+    if state.loan > 0 and state.money > 2 * state.loan + 200:
+        return {"action": "repay", "amount": "max"}
+    if state.loan + 100 <= config.MAX_LOAN_TOTAL and state.money < 200:
+        return {"action": "loan", "product": "installment_loan", "amount": 100}
+    if state.inventory.total_units() > 0:
+        return {"action": "bulk_work", "units": "max"}
+    if state.money >= state.prices["premium_supplies"]:
+        return {"action": "buy", "supply": "premium_supplies", "amount": "max"}
+    return {"action": "rest"}
+
+
+def research_first(state: GameState) -> Step:
+    """Save up for each research project in turn before anything else, then work for profit."""
+    if state.day > 400:
+        return None
+    if state.reputation < 20:
+        return {"action": "rest"}
+    if state.active_research_project is None:
+        for project_key, spec in config.RESEARCH_PROJECTS_SPECS.items():
+            if project_key not in state.completed_research:
+                if state.money >= spec["cost"]:
+                    return {"action": "research", "project": project_key}
+                break
+    return _restock_or_work(state)
+
+
+def max_employees(state: GameState) -> Step:
+    """Keep the roster at MAX_EMPLOYEES and run bulk work orders, borrowing (then firing) to cover payroll."""
+    if state.day > 400:
+        return None
+    if state.reputation < 20:
+        return {"action": "rest"}
+    if len(state.employees) < config.MAX_EMPLOYEES and state.money >= config.EMPLOYEE_DAILY_SALARY:
+        return {"action": "hire"}
+    if state.money < config.EMPLOYEE_DAILY_SALARY and state.loan + 200 <= config.MAX_LOAN_TOTAL:
+        return {"action": "loan", "product": "credit_line", "amount": 200}
+    if state.money < state.employees.daily_payroll():
+        return {"action": "fire"} # Out of credit: shed staff rather than go bankrupt
+    if state.inventory.total_units() > 0:
+        return {"action": "bulk_work", "units": "max"}
+    if state.money >= state.prices["basic_supplies"]:
+        return {"action": "buy", "supply": "basic_supplies", "amount": "max"}
+    return {"action": "rest"}
+
+
+# --- Engine policies (called once per day; the game never ends) ---
+SANDBOX_MAX_BRANCHES = 3
+
+def sandbox(state: GameState) -> None:
+    """Restock and bulk-work every day, buy every upgrade and open branches (up to SANDBOX_MAX_BRANCHES) with spare cash."""
+    if state.inventory.total_units() == 0:
+        affordable = min(state.money // state.prices["basic_supplies"], state.storage_capacity)
+        if affordable > 0:
+            state.buy_supplies("basic_supplies", affordable)
+    if state.inventory.total_units() > 0 and state.reputation > 20:
+        state.work_batch(state.inventory.total_units())
+    else:
+        state.rest()
+    if state.money > 2000:
+        for upgrade_key in config.UPGRADE_SPECS:
+            state.purchase_upgrade(upgrade_key)
+    if state.money > 5 * config.BRANCH_OPEN_COST and len(state.company) < SANDBOX_MAX_BRANCHES:
+        state.open_branch()
+
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "early_rush": {"seed": 101, "policy": early_rush},
+    "loan_heavy": {"seed": 202, "policy": loan_heavy},
+    "research_first": {"seed": 303, "policy": research_first, "starting_money": 700},
+    "max_employees": {"seed": 404, "policy": max_employees},
+    "sandbox_10000": {"seed": 505, "daily_policy": sandbox, "days": 10000, "starting_money": 3000},
+}
+
+
+def calibrate() -> float:
+    """Wall time of one run of a fixed interpreter- and NumPy-bound loop, the unit relative throughput is measured in."""
+    started = time.perf_counter()
+    counts: Dict[int, int] = {}
+    values = np.arange(256, dtype=np.float64)
+    for i in range(config.SCENARIO_CALIBRATION_ITERATIONS):
+        counts[i & 63] = counts.get(i & 63, 0) + i % 7
+        if i % 64 == 0:
+            values = values * 0.5 + float(i & 255)
+    return time.perf_counter() - started
+
+
+def _play(scenario: Dict[str, Any]) -> GameState:
+    if "policy" in scenario:
+        plan = {key: scenario[key] for key in ("seed", "policy", "starting_money") if key in scenario}
+        game_state, _, _ = play_plan(plan)
+        return game_state
+    random.seed(scenario["seed"])
+    game_state = GameState()
+    game_state.money = scenario.get("starting_money", game_state.money)
+    daily_policy: Callable[[GameState], None] = scenario["daily_policy"]
+    GameEngine(game_state, seed=scenario["seed"]).simulate(scenario["days"], daily_policy)
+    return game_state
+
+
+def run_scenario(name: str, repeats: int = 5) -> Dict[str, Any]:
+    """
+    Run a scenario `repeats` times (best wall time counts) plus once under tracemalloc for peak memory.
+    Each timed run is paired with a calibration loop run just before it; the median of the paired
+    ratios is the host-relative throughput, so load changes during the run affect both sides alike.
+    """
+    scenario = SCENARIOS[name]
+    best = float("inf")
+    relative: List[float] = []
+    checksums = set()
+    for _ in range(repeats):
+        calibration_seconds = calibrate()
+        started = time.perf_counter()
+        game_state = _play(scenario)
+        elapsed = time.perf_counter() - started
+        best = min(best, elapsed)
+        relative.append(calibration_seconds / elapsed)
+        checksums.add(state_checksum(game_state))
+    tracemalloc.start()
+    _play(scenario)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    if len(checksums) != 1:
+        raise RuntimeError(f"Scenario '{name}' is not deterministic: {len(checksums)} different final states.")
+    days = game_state.day - config.INITIAL_DAY
+    return {
+        "days": days,
+        "wall_seconds": round(best, 6),
+        "days_per_second": round(days / best, 1) if best > 0 else None,
+        "days_per_calibration": round(days * float(np.median(relative)), 2),
+        "peak_memory_kib": peak // 1024,
+        "checksum": checksums.pop(),
+        "final_money": game_state.money,
+        "final_day": game_state.day,
+    }
+
+
+def _random_ledger(rng: random.Random) -> LoanLedger:
+    """A ledger with mixed products, rates and balances, with some loans already closed."""
+    ledger = LoanLedger()
+    for day in range(rng.randint(1, 40)):
+        # Rates of 365/k put the daily-interest steps on exact boundaries, where the rounding corrections kick in
+        rate = rng.choice([None, rng.uniform(0.01, 5.0), 365 / rng.randint(1, 5000)])
+        ledger.add_loan(rng.randint(1, 2_000_000), rng.choice(list(config.LOAN_PRODUCTS)), day, rate)
+    for loan_id in ledger.active_loan_ids():
+        if rng.random() < 0.3:
+            ledger.pay_loan(loan_id, ledger.outstanding(loan_id))
+    return ledger
+
+
+def _ledger_balances(ledger: LoanLedger) -> List[tuple]:
+    return [(loan_id, ledger.outstanding(loan_id), ledger.outstanding_through(loan_id)) for loan_id in ledger.active_loan_ids()]
+
+
+def check_ledgers(count: int, seed: int = 0) -> List[str]:
+    """Return one failure message per random ledger where accrue_days or repay broke their contract."""
+    rng = random.Random(seed)
+    failures = []
+    for case in range(count):
+        ledger = _random_ledger(rng)
+        stepped = LoanLedger.from_list(ledger.to_list())
+        days = rng.randint(1, 365)
+        closed_form = ledger.accrue_days(days)
+        daily = sum(stepped.accrue_daily() for _ in range(days))
+        if closed_form != daily or _ledger_balances(ledger) != _ledger_balances(stepped) \
+                or ledger.total_outstanding != stepped.total_outstanding:
+            failures.append(f"ledger {case}: accrue_days({days}) added {closed_form}, {days} daily accruals added {daily}")
+            continue
+
+        open_loans = [(loan_id, ledger.outstanding(loan_id)) for loan_id in ledger.active_loan_ids()]
+        amount = rng.randint(1, ledger.total_outstanding + 1000)
+        expected = []
+        left = min(amount, ledger.total_outstanding)
+        for loan_id, balance in open_loans:
+            if left <= 0:
+                break
+            expected.append((loan_id, min(left, balance)))
+            left -= balance
+        allocations = ledger.repay(amount)
+        remaining = dict(open_loans)
+        for loan_id, paid in expected:
+            remaining[loan_id] -= paid
+        if allocations != expected or any(ledger.outstanding(loan_id) != balance for loan_id, balance in remaining.items()) \
+                or ledger.total_outstanding != sum(remaining.values()):
+            failures.append(f"ledger {case}: repay({amount}) allocated {allocations}, oldest first is {expected}")
+    return failures
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    """Return one failure message per scenario that diverged or slowed down beyond `tolerance`."""
+    failures = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result["checksum"] != expected["checksum"]:
+            failures.append(f"{name}: final state diverged (checksum {result['checksum'][:12]} != {expected['checksum'][:12]})")
+        if not expected.get("days_per_calibration") or not result.get("days_per_calibration"):
+            continue # Raw days/s from another host says nothing about this one
+        floor = expected["days_per_calibration"] * (1 - tolerance)
+        if result["days_per_calibration"] < floor:
+            failures.append(f"{name}: {result['days_per_calibration']} days per calibration loop is below {floor:.2f} "
+                            f"(baseline {expected['days_per_calibration']}, tolerance {tolerance:.0%})")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the scenario corpus and compare it with the stored baseline.")
+    parser.add_argument("--only", action="append", choices=sorted(SCENARIOS), help="Run just this scenario (repeatable)")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per scenario; the fastest counts")
+    parser.add_argument("--baseline", default=config.SCENARIO_BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=config.SCENARIO_THROUGHPUT_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args()
+
+    ledger_failures = check_ledgers(config.SCENARIO_LEDGER_CHECKS)
+    for failure in ledger_failures:
+        print(f"FAIL {failure}")
+    if ledger_failures:
+        return 1
+    print(f"Loan ledger checks: {config.SCENARIO_LEDGER_CHECKS} random ledgers match day-by-day accrual and oldest-first repayment.")
+
+    results = {}
+    for name in args.only or SCENARIOS:
+        results[name] = run_scenario(name, args.repeats)
+        result = results[name]
+        print(f"{name:16} {result['days']:6} days  {result['wall_seconds']:8.3f}s  {result['days_per_second']:10.1f} days/s  "
+              f"{result['days_per_calibration']:8.2f} days/cal  {result['peak_memory_kib']:7} KiB peak  {result['checksum'][:12]}")
+
+    try:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}.")
+        return 0
+
+    failures = compare(results, baseline, args.tolerance)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+    elif not failures:
+        print("All scenarios match the baseline.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
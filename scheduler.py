@@ -0,0 +1,85 @@
+"""
+scheduler.py
+
+Priority-queue scheduler for timed game effects.
+
+Effects such as research completion, the end of an employee event or a
+temporary market boost are registered once with the day they become due and
+fire exactly on that day, instead of every subsystem polling its own counter
+each day. A daily tick costs O(effects due today), and next_due_day() lets
+callers skip straight over idle stretches.
+"""
+
+import heapq
+from typing import Dict, Any, List, Optional, Tuple
+
+
+class EffectScheduler:
+    """Min-heap of (due day, effect) entries with lazy cancellation."""
+
+    def __init__(self):
+        self._heap: List[Tuple[int, int, Dict[str, Any]]] = []
+        self._next_id = 1
+        self._cancelled: set = set()
+
+    def __len__(self) -> int:
+        return len(self._heap) - len(self._cancelled)
+
+    def schedule(self, due_day: int, kind: str, **payload: Any) -> int:
+        """Register an effect of `kind` due on `due_day` and return its id."""
+        effect_id = self._next_id
+        self._next_id += 1
+        effect = {"id": effect_id, "due_day": due_day, "kind": kind}
+        effect.update(payload)
+        # The id breaks ties so effects due the same day fire in registration order
+        heapq.heappush(self._heap, (due_day, effect_id, effect))
+        return effect_id
+
+    def cancel(self, effect_id: int) -> None:
+        """Cancel a pending effect; it is dropped when it reaches the top of the heap."""
+        if any(entry_id == effect_id for _, entry_id, _ in self._heap):
+            self._cancelled.add(effect_id)
+
+    def cancel_kind(self, kind: str) -> None:
+        """Cancel every pending effect of one kind."""
+        for _, effect_id, effect in self._heap:
+            if effect["kind"] == kind:
+                self._cancelled.add(effect_id)
+
+    def _drop_cancelled(self) -> None:
+        while self._heap and self._heap[0][1] in self._cancelled:
+            _, effect_id, _ = heapq.heappop(self._heap)
+            self._cancelled.discard(effect_id)
+
+    def next_due_day(self) -> Optional[int]:
+        """Return the day the next pending effect is due, or None if nothing is scheduled."""
+        self._drop_cancelled()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, day: int) -> List[Dict[str, Any]]:
+        """Remove and return every effect due on or before `day`, in due order."""
+        due: List[Dict[str, Any]] = []
+        while True:
+            self._drop_cancelled()
+            if not self._heap or self._heap[0][0] > day:
+                return due
+            due.append(heapq.heappop(self._heap)[2])
+
+    def pending(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return pending effects (optionally of one kind) sorted by due day."""
+        return [effect for _, effect_id, effect in sorted(self._heap)
+                if effect_id not in self._cancelled and (kind is None or effect["kind"] == kind)]
+
+    # --- Persistence ---
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Export pending effects for saving."""
+        return [dict(effect) for effect in self.pending()]
+
+    @classmethod
+    def from_list(cls, effects: List[Dict[str, Any]]) -> "EffectScheduler":
+        """Rebuild a scheduler from effects exported with to_list()."""
+        scheduler = cls()
+        for effect in effects:
+            payload = {k: v for k, v in effect.items() if k not in ("id", "due_day", "kind")}
+            scheduler.schedule(effect["due_day"], effect["kind"], **payload)
+        return scheduler
@@ -0,0 +1,97 @@
+"""
+screen_writer.py
+
+Buffered terminal output for CLIView.
+
+Printing line by line means one write (and, on a tty, one flush) per line;
+over SSH and on slow terminals those writes are most of the CLI's latency.
+ScreenWriter collects everything the view outputs between two inputs and
+writes it to the terminal in a single write, together with the next prompt.
+
+Diff mode (optional) treats the status block and main menu as a frame kept at
+the top of the screen. Each new frame repaints only the rows that changed,
+using ANSI cursor positioning, and messages and prompts scroll below it. When
+more output was written since the last frame than fits under it, the screen is
+cleared and the frame repainted in full, because scrolling has moved the rows.
+"""
+
+import re
+import shutil
+import sys
+from typing import Any, List, Optional
+
+_ANSI = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+CLEAR_TO_END_OF_LINE = "\x1b[K"
+CLEAR_TO_END_OF_SCREEN = "\x1b[J"
+
+
+def _move_to(row: int) -> str:
+    return f"\x1b[{row};1H"
+
+
+class ScreenWriter:
+    """Collects view output and writes it once per input; optionally repaints only changed frame rows."""
+
+    def __init__(self, stream: Optional[Any] = None, diff: bool = False):
+        self.stream = stream # None: sys.stdout at write time (colorama may have wrapped it)
+        self.diff = diff
+        self.writes = 0 # Terminal writes so far, for profiling
+        self._pending: List[str] = []
+        self._frame: Optional[List[str]] = None # Frame being built (diff mode)
+        self._shown_frame: List[str] = [] # Frame rows currently on screen (diff mode)
+        self._rows_below_frame = 0 # Terminal rows used under the frame since it was drawn
+
+    def write(self, text: str = "") -> None:
+        """Queue `text` as one or more output lines, like print(text)."""
+        self._pending.append(text)
+
+    def begin_frame(self) -> None:
+        """Start a new frame; frame_line() output goes into it (diff mode) or is queued as usual."""
+        if self.diff:
+            self._frame = []
+
+    def frame_line(self, text: str = "") -> None:
+        if self._frame is not None:
+            self._frame.extend(text.split("\n"))
+        else:
+            self.write(text)
+
+    def flush(self, prompt: str = "") -> None:
+        """Write everything queued (and `prompt`, left on the last line) in one write."""
+        parts: List[str] = []
+        if self._frame is not None:
+            parts.extend(self._render_frame(self._frame))
+            self._frame = None
+        if self._pending:
+            parts.append("\n".join(self._pending) + "\n")
+        parts.append(prompt)
+        if self.diff:
+            # The prompt's line is finished by the player's Enter
+            self._rows_below_frame += self._rows("\n".join(self._pending)) if self._pending else 0
+            self._rows_below_frame += self._rows(prompt) if prompt else 0
+        self._pending = []
+        text = "".join(parts)
+        if text:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write(text)
+            stream.flush()
+            self.writes += 1
+
+    def _rows(self, text: str) -> int:
+        columns = max(1, shutil.get_terminal_size().columns)
+        return sum(1 + len(_ANSI.sub("", line)) // columns for line in text.split("\n"))
+
+    def _render_frame(self, frame: List[str]) -> List[str]:
+        screen_rows = shutil.get_terminal_size().lines
+        scrolled = self._rows_below_frame + len(self._shown_frame) >= screen_rows
+        self._rows_below_frame = 0
+        previous, self._shown_frame = self._shown_frame, frame
+        if scrolled or not previous:
+            return [CLEAR_SCREEN, "\n".join(frame) + "\n"]
+        parts = [_move_to(row + 1) + line + CLEAR_TO_END_OF_LINE
+                 for row, line in enumerate(frame) if row >= len(previous) or previous[row] != line]
+        # Drop old messages and any rows of a longer previous frame
+        parts.append(_move_to(len(frame) + 1) + CLEAR_TO_END_OF_SCREEN)
+        return parts
@@ -0,0 +1,325 @@
+"""
+scripted_view.py
+
+Non-interactive view that plays the CLI game from a plan file.
+
+ScriptedView implements the View interface without any terminal I/O: every
+prompt the GameController asks is answered from the current plan step, and
+everything the controller shows is recorded in a machine-readable
+transcript. run_plan() wires it to the real GameController, so scripted runs
+exercise exactly the code path a CLI player does.
+
+A plan is a JSON object:
+
+    {
+        "seed": 7,
+        "steps": [
+            {"action": "buy", "supply": "basic_supplies", "amount": "max"},
+            {"action": "work", "until": "inventory == 0"},
+            {"action": "loan", "product": "installment_loan", "amount": 200, "if": "money < 100"},
+            {"action": "rest", "repeat": 3},
+            {"action": "wait", "days": 10}
+        ]
+    }
+
+Actions: buy (supply, amount), work, bulk_work (units), hire, fire,
+upgrade (upgrade), loan (product, amount), repay (amount), rest,
+research (project), wait (days), branch, undo, redo, save.
+Amounts may be a number or "max". A step runs once, "repeat" times, or
+until its "until" condition holds (at most "max_repeats" times); an "if"
+condition skips the step when false. Conditions compare one of CONDITION_FIELDS
+with a number, e.g. "money >= 500". When the steps run out the game is quit.
+
+An optional "starting_money" replaces the initial cash.
+
+Instead of "steps", a plan passed from Python may carry a "policy": a
+function called with the GameState at each main menu that returns the next
+step (without repeat/until/if) or None to quit. scenarios.py uses this.
+"""
+
+import json
+import operator
+import random
+import re
+import time
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
+
+from view import View
+from game_state import GameState
+import config
+
+# Main menu option chosen for each plan action
+ACTION_CHOICES = {
+    "buy": "1", "work": "2", "hire": "3", "fire": "3", "upgrade": "4", "loan": "5", "repay": "5",
+    "rest": "6", "save": "7", "research": "9", "wait": "10", "bulk_work": "11", "branch": "12",
+    "undo": "13", "redo": "14"
+}
+QUIT_CHOICE = "8"
+DEFAULT_MAX_REPEATS = 10000
+
+# Values a plan condition can test
+CONDITION_FIELDS: Dict[str, Callable[[GameState], float]] = {
+    "money": lambda state: state.money,
+    "reputation": lambda state: state.reputation,
+    "day": lambda state: state.day,
+    "loan": lambda state: state.loan,
+    "inventory": lambda state: state.inventory.total_units(),
+    "storage_capacity": lambda state: state.storage_capacity,
+    "employees": lambda state: len(state.employees),
+    "branches": lambda state: len(state.company),
+    "completed_research": lambda state: len(state.completed_research),
+}
+_OPERATORS = {">=": operator.ge, "<=": operator.le, "==": operator.eq, "!=": operator.ne, ">": operator.gt, "<": operator.lt}
+_CONDITION_PATTERN = re.compile(r"^\s*(\w+)\s*(>=|<=|==|!=|>|<)\s*(-?\d+(?:\.\d+)?)\s*$")
+_ANSI_PATTERN = re.compile(r"\x1b\[[0-9;]*m")
+
+
+class ScriptError(Exception):
+    """The plan is invalid or does not match the prompts the controller asked."""
+
+
+def parse_condition(text: str) -> Callable[[GameState], bool]:
+    match = _CONDITION_PATTERN.match(text)
+    if not match or match.group(1) not in CONDITION_FIELDS:
+        raise ScriptError(f"Invalid condition '{text}'. Use '<field> <op> <number>' with a field from {sorted(CONDITION_FIELDS)}.")
+    field, compare, value = CONDITION_FIELDS[match.group(1)], _OPERATORS[match.group(2)], float(match.group(3))
+    return lambda state: compare(field(state), value)
+
+
+def _number(step: Dict[str, Any], key: str, default: Union[str, int]) -> Union[str, int]:
+    """A step's amount, units or days: a whole number or "max"."""
+    value = step.get(key, default)
+    if value != "max" and (not isinstance(value, int) or isinstance(value, bool)):
+        raise ScriptError(f"Invalid {key} {value!r} for '{step['action']}': use a whole number or \"max\".")
+    return value
+
+
+def _step_answers(step: Dict[str, Any]) -> List[Union[str, int]]:
+    """Answers to the controller prompts that follow the main menu choice for `step`, in order."""
+    action = step["action"]
+    if action == "buy":
+        supply_keys = list(config.SUPPLY_PRICES.keys())
+        if step.get("supply") not in supply_keys:
+            raise ScriptError(f"Unknown supply '{step.get('supply')}'.")
+        return [str(supply_keys.index(step["supply"]) + 1), _number(step, "amount", "max")]
+    if action == "bulk_work":
+        return [_number(step, "units", "max")]
+    if action == "hire":
+        return ["1"]
+    if action == "fire":
+        return ["2"]
+    if action == "loan":
+        return ["1", _number(step, "amount", "max")]
+    if action == "repay":
+        return ["2", _number(step, "amount", "max")]
+    if action == "wait":
+        return [_number(step, "days", 1)]
+    if action == "branch":
+        return ["1"]
+    return []
+
+
+def _compile_step(step: Dict[str, Any], number: int) -> Dict[str, Any]:
+    if step.get("action") not in ACTION_CHOICES:
+        raise ScriptError(f"Step {number}: unknown action '{step.get('action')}'.")
+    compiled = dict(step)
+    compiled["number"] = number
+    compiled["until_check"] = parse_condition(step["until"]) if "until" in step else None
+    compiled["if_check"] = parse_condition(step["if"]) if "if" in step else None
+    compiled["answers"] = _step_answers(step) # Validates the step up front
+    return compiled
+
+
+class ScriptedView(View):
+    """View that answers the controller from a plan and records a transcript instead of printing."""
+
+    def __init__(self, plan: Dict[str, Any]):
+        self.plan = plan
+        self.policy: Optional[Callable[[GameState], Optional[Dict[str, Any]]]] = plan.get("policy")
+        self.steps = [_compile_step(step, number) for number, step in enumerate(plan.get("steps", []))]
+        self.game_state: Optional[GameState] = None
+        self.transcript: List[Dict[str, Any]] = []
+        self._step_index = 0
+        self._runs = 0 # Times the current step has run
+        self._current: Optional[Dict[str, Any]] = None
+        self._answers: List[Union[str, int]] = []
+        self._policy_decisions = 0
+
+    # --- Transcript ---
+    def _record(self, kind: str, **fields: Any) -> None:
+        entry = {"kind": kind, "day": self.game_state.day if self.game_state is not None else None}
+        entry.update(fields)
+        self.transcript.append(entry)
+
+    # --- Plan stepping ---
+    def _next_step(self) -> Optional[Dict[str, Any]]:
+        """Return the step to run next, advancing past finished and skipped steps."""
+        state = self.game_state
+        while self._step_index < len(self.steps):
+            step = self.steps[self._step_index]
+            if self._runs == 0 and step["if_check"] is not None and not step["if_check"](state):
+                self._record("skip", step=step["number"], action=step["action"])
+            elif step["until_check"] is not None:
+                if not step["until_check"](state) and self._runs < step.get("max_repeats", DEFAULT_MAX_REPEATS):
+                    return step
+            elif self._runs < step.get("repeat", 1):
+                return step
+            self._step_index += 1
+            self._runs = 0
+        return None
+
+    def _menu_choice(self) -> str:
+        if self.policy is not None:
+            decided = self.policy(self.game_state)
+            step = _compile_step(decided, self._policy_decisions) if decided is not None else None
+            self._policy_decisions += 1
+            self._runs = 0
+        else:
+            step = self._next_step()
+        if step is None:
+            self._current = None
+            self._answers = []
+            self._record("quit")
+            return QUIT_CHOICE
+        self._runs += 1
+        self._current = step
+        self._answers = list(step["answers"])
+        state = self.game_state
+        self._record("action", step=step["number"], action=step["action"], run=self._runs,
+                     money=state.money, reputation=state.reputation, loan=state.loan)
+        return ACTION_CHOICES[step["action"]]
+
+    def _pop_answer(self, prompt: str) -> Union[str, int]:
+        if not self._answers:
+            raise ScriptError(f"No planned answer for prompt '{prompt.strip()}' "
+                              f"(step {self._current['number'] if self._current else '-'}).")
+        return self._answers.pop(0)
+
+    # --- Input ---
+    def get_input(self, prompt: str, valid_options: List[str] = None) -> str:
+        if "What would you like to do" in prompt:
+            answer = self._menu_choice()
+        elif "load your saved game" in prompt:
+            answer = "y" if self.plan.get("load_save") else "n"
+        elif "save before quitting" in prompt:
+            answer = "y" if self.plan.get("save_on_quit") else "n"
+        elif " again for Day " in prompt:
+            answer = "n" # Repetition is the plan's job
+        elif valid_options == ["y", "n"]:
+            answer = "y" if (self._current or {}).get("confirm", True) else "n"
+        else:
+            answer = str(self._pop_answer(prompt))
+        if valid_options is not None and answer not in valid_options:
+            raise ScriptError(f"Planned answer '{answer}' is not one of {valid_options} for prompt '{prompt.strip()}'.")
+        self._record("prompt", prompt=_ANSI_PATTERN.sub("", prompt).strip(), answer=answer)
+        return answer
+
+    def get_number_input(self, prompt: str, min_val: int = 0, max_val: int = 1000, allow_max_str: bool = False) -> Any:
+        planned = self._pop_answer(prompt)
+        if planned == "max":
+            answer: Any = "max" if allow_max_str else max_val
+        else:
+            # A real player would be asked again; a plan is clamped into range and the transcript notes it
+            answer = min(max(int(planned), min_val), max_val)
+        self._record("prompt", prompt=_ANSI_PATTERN.sub("", prompt).strip(), answer=answer,
+                     **({"clamped_from": planned} if answer not in (planned, "max") else {}))
+        return answer
+
+    def display_upgrade_menu(self, game_state: Any) -> Optional[str]:
+        upgrade = (self._current or {}).get("upgrade")
+        if upgrade not in config.UPGRADE_SPECS:
+            raise ScriptError(f"Unknown upgrade '{upgrade}'.")
+        return upgrade
+
+    def display_research_menu(self, research_projects: Dict[str, Any], completed_research: List[str],
+                              active_project_key: Optional[str], active_project_progress: int) -> Optional[str]:
+        project = (self._current or {}).get("project")
+        if project not in research_projects:
+            raise ScriptError(f"Unknown research project '{project}'.")
+        return project
+
+    def display_loan_products(self) -> Optional[str]:
+        product = (self._current or {}).get("product", config.DEFAULT_LOAN_PRODUCT)
+        if product not in config.LOAN_PRODUCTS:
+            raise ScriptError(f"Unknown loan product '{product}'.")
+        return product
+
+    # --- Output (recorded, never printed) ---
+    def show_message(self, message: str, message_type: str = "info", delay: float = 0.0) -> None:
+        self._record("message", type=message_type, text=_ANSI_PATTERN.sub("", message))
+
+    def display_market_message(self, message: str, message_type: str = "info") -> None:
+        self._record("market", type=message_type, text=_ANSI_PATTERN.sub("", message))
+
+    def display_game_over(self, game_state: Any, is_win: bool) -> None:
+        self._record("game_over", win=is_win)
+
+    def pause(self, seconds: float) -> None:
+        pass
+
+    def display_welcome(self) -> None:
+        pass
+
+    def display_status(self, game_state: Any) -> None:
+        pass
+
+    def display_menu(self) -> None:
+        pass
+
+    def display_buy_supplies_menu(self, game_state: Any) -> None:
+        pass
+
+    def display_employee_menu(self, game_state: Any) -> None:
+        pass
+
+    def display_branch_menu(self, game_state: Any) -> None:
+        pass
+
+    def display_loan_menu(self, game_state: Any) -> None:
+        pass
+
+
+def play_plan(plan: Dict[str, Any]) -> Tuple[GameState, ScriptedView, float]:
+    """Play `plan` through a real GameController; returns the final state, the view and the wall time in seconds."""
+    from controller import GameController # Imported here: controller imports the views
+
+    seed = plan.get("seed")
+    if seed is not None:
+        random.seed(seed) # GameState draws its company seed on creation
+    game_state = GameState()
+    if "starting_money" in plan:
+        game_state.money = plan["starting_money"]
+    view = ScriptedView(plan)
+    view.game_state = game_state
+    controller = GameController(game_state, view, seed=seed)
+    started = time.perf_counter()
+    controller.start_game()
+    return game_state, view, time.perf_counter() - started
+
+
+def run_plan(plan: Dict[str, Any], transcript_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Play `plan` and return the transcript document (also written as JSON to
+    transcript_path if given).
+    """
+    game_state, view, elapsed = play_plan(plan)
+    days = game_state.day - config.INITIAL_DAY
+    document = {
+        "seed": plan.get("seed"),
+        "elapsed_seconds": round(elapsed, 6),
+        "days": days,
+        "days_per_second": round(days / elapsed, 2) if elapsed > 0 else None,
+        "final": {"day": game_state.day, "money": game_state.money, "reputation": game_state.reputation,
+                  "loan": game_state.loan, "inventory": dict(game_state.inventory),
+                  "win": game_state.is_win(), "game_over": game_state.is_game_over()},
+        "records": view.transcript,
+    }
+    if transcript_path:
+        with open(transcript_path, "w") as f:
+            json.dump(document, f, indent=2)
+    return document
+
+
+def load_plan(path: str) -> Dict[str, Any]:
+    with open(path, "r") as f:
+        return json.load(f)
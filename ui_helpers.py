@@ -46,8 +46,8 @@ def display_help() -> None:
     
     print(f"\n{Fore.YELLOW}Remember: The goal is to reach $1000 while keeping reputation above 0!{Style.RESET_ALL}")
 
-def display_business_map(game_state: Dict[str, Any]) -> None:
-    """Display an ASCII map of the business with colored CLI output."""
+def display_business_map(game_state: Any) -> None:
+    """Display an ASCII map of the business (a GameState) with colored CLI output."""
     map_instance = BusinessMap(game_state)
     print(f"\n{Fore.CYAN}Your Business Layout:{Style.RESET_ALL}")
     print(map_instance.get_cli_colored_map())
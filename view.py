@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
+from time import sleep
 from typing import Dict, Any, List, Optional
 from colorama import Fore, Style
 import config # Import config
+from loan_ledger import product_rate
+from screen_writer import ScreenWriter
+from event_bus import MONEY, REPUTATION, DAY, INVENTORY, UPGRADES, EMPLOYEES, LOANS, RESEARCH
 
 class View(ABC):
     """Abstract base class for views in MVC architecture."""
@@ -37,10 +41,14 @@ class View(ABC):
         pass
     
     @abstractmethod
-    def show_message(self, message: str, message_type: str = "info") -> None:
-        """Show a message to the user."""
+    def show_message(self, message: str, message_type: str = "info", delay: float = 0.0) -> None:
+        """Show a message to the user, optionally pausing `delay` seconds so it can be read."""
         pass
 
+    def pause(self, seconds: float) -> None:
+        """Give the player a moment to read the latest messages."""
+        sleep(seconds)
+
     @abstractmethod
     def display_research_menu(self, research_projects: Dict[str, Any], 
                               completed_research: List[str], 
@@ -55,40 +63,91 @@ class View(ABC):
         pass
 
 
+# Terminal colors by message type ("info" and unknown types are uncolored)
+MESSAGE_COLORS = {
+    "success": Fore.GREEN,
+    "error": Fore.RED,
+    "warning": Fore.YELLOW,
+    "event": Fore.CYAN,
+}
+
+
 class CLIView(View):
     """Command Line Interface View implementation."""
     
-    def __init__(self):
-        """Initialize the CLI View."""
+    def __init__(self, diff: bool = False):
+        """
+        Initialize the CLI View. Output is buffered and written once per input;
+        with `diff`, the status and menu stay at the top and only changed rows are repainted.
+        """
         from pyfiglet import figlet_format
         self.figlet_format = figlet_format
-        self.game_controller_ref: Optional[Any] = None # To access event_manager.research_progress
+        self.game_controller_ref: Optional[Any] = None # To access the EventManager if needed by view
+        self.screen = ScreenWriter(diff=diff)
+        # Status sections in display order: name -> (bus topics it renders, renderer)
+        self._status_sections = {
+            "header": (frozenset((DAY, MONEY, REPUTATION, LOANS)), self._render_header),
+            "inventory": (frozenset((INVENTORY,)), self._render_inventory),
+            "upgrades": (frozenset((UPGRADES,)), self._render_upgrades),
+            "employees": (frozenset((EMPLOYEES,)), self._render_employees),
+            "research": (frozenset((RESEARCH, DAY)), self._render_research),
+        }
+        self._section_cache: Dict[str, str] = {}
+        self._dirty_sections: set = set()
     
     def set_controller_reference(self, controller: Any) -> None:
-        """Set a reference to the game controller for accessing EventManager state if needed by view."""
+        """Set a reference to the game controller and subscribe the status sections to its event bus."""
         self.game_controller_ref = controller
+        bus = getattr(controller, "bus", None)
+        if bus is not None:
+            topics = set().union(*(section_topics for section_topics, _ in self._status_sections.values()))
+            bus.subscribe(self._on_model_changes, *topics)
     
     def display_welcome(self) -> None:
         """Display welcome message."""
-        print(self.figlet_format("Business Tycoon", font="slant"))
-        print("Welcome to Business Tycoon Adventure!")
-        print("Your goal is to reach $1000 while maintaining your reputation.")
+        self.screen.write(self.figlet_format("Business Tycoon", font="slant"))
+        self.screen.write("Welcome to Business Tycoon Adventure!")
+        self.screen.write("Your goal is to reach $1000 while maintaining your reputation.")
     
     def display_status(self, game_state: Any) -> None:
-        """Display current game status."""
-        print("\n" + "="*60)
-        print(f"{Fore.CYAN}Day {game_state.day}{Style.RESET_ALL}")
-        print(f"Money: ${game_state.money}")
-        print(f"Reputation: {game_state.reputation}")
-        
+        """Display current game status, re-rendering only the sections whose bus topics changed."""
+        bus = getattr(self.game_controller_ref, "bus", None)
+        if bus is not None:
+            bus.flush(force=True)
+        else:
+            self._section_cache.clear() # Nothing tells us what changed, so render every section
+        for name, (_, render) in self._status_sections.items():
+            if name in self._dirty_sections or name not in self._section_cache:
+                self._section_cache[name] = render(game_state)
+        self._dirty_sections.clear()
+        self.screen.begin_frame()
+        self.screen.frame_line("\n" + "="*60)
+        for name in self._status_sections:
+            if self._section_cache[name]:
+                self.screen.frame_line(self._section_cache[name])
+        self.screen.frame_line("="*60)
+
+    def _on_model_changes(self, changes: Dict[str, int]) -> None:
+        for name, (topics, _) in self._status_sections.items():
+            if topics.intersection(changes):
+                self._dirty_sections.add(name)
+
+    def _render_header(self, game_state: Any) -> str:
+        lines = [f"{Fore.CYAN}Day {game_state.day}{Style.RESET_ALL}",
+                 f"Money: ${game_state.money}",
+                 f"Reputation: {game_state.reputation}"]
         if game_state.loan > 0:
-            print(f"{Fore.RED}Loan: ${game_state.loan}{Style.RESET_ALL}")
-        
-        print("\nInventory:")
+            lines.append(f"{Fore.RED}Loan: ${game_state.loan}{Style.RESET_ALL}")
+        return "\n".join(lines)
+
+    def _render_inventory(self, game_state: Any) -> str:
+        lines = ["\nInventory:"]
         for item, amount in game_state.inventory.items():
-            print(f"  {item.replace('_', ' ').title()}: {amount}")
-        
-        print("\nUpgrades:")
+            lines.append(f"  {item.replace('_', ' ').title()}: {amount}")
+        return "\n".join(lines)
+
+    def _render_upgrades(self, game_state: Any) -> str:
+        lines = ["\nUpgrades:"]
         for upgrade_key, spec in config.UPGRADE_SPECS.items():
             level_or_status = game_state.upgrades.get(upgrade_key, False if spec["max_level"] == 1 else 0)
             display_status = ""
@@ -96,98 +155,125 @@ class CLIView(View):
                 display_status = f"{Fore.GREEN}Enabled{Style.RESET_ALL}" if level_or_status else f"{Fore.RED}Disabled{Style.RESET_ALL}"
             else: # Level-based (marketing, storage)
                 display_status = f"Level {level_or_status}/{spec['max_level']}"
-            print(f"  {spec['name']}: {display_status}")
-        
-        if game_state.employees:
-            print("\nEmployees:", len(game_state.employees))
-        
+            lines.append(f"  {spec['name']}: {display_status}")
+        return "\n".join(lines)
+
+    def _render_employees(self, game_state: Any) -> str:
+        if not game_state.employees:
+            return ""
+        staff = game_state.employees.summary()
+        return f"\nEmployees: {staff['count']} (payroll ${staff['daily_payroll']}/day, avg skill {staff['average_skill']:.2f})"
+
+    def _render_research(self, game_state: Any) -> str:
         # Display active research project
-        if game_state.active_research_project and self.game_controller_ref:
-            active_project_details = self.game_controller_ref.event_manager.research_projects.get(game_state.active_research_project)
+        if game_state.active_research_project:
+            active_project_details = config.RESEARCH_PROJECTS_SPECS.get(game_state.active_research_project)
             if active_project_details:
-                progress = self.game_controller_ref.event_manager.research_progress
+                progress = game_state.research_progress
                 duration = active_project_details['duration']
                 progress_percent = (progress / duration) * 100 if duration > 0 else 0
-                print(f"{Fore.MAGENTA}Active Research: {active_project_details['name']} ({progress}/{duration} days - {progress_percent:.0f}%){Style.RESET_ALL}")
-
-        print("="*60)
+                return f"{Fore.MAGENTA}Active Research: {active_project_details['name']} ({progress}/{duration} days - {progress_percent:.0f}%){Style.RESET_ALL}"
+        return ""
     
     def display_menu(self) -> None:
         """Display main menu options."""
-        print(f"\n{Fore.CYAN}Actions:{Style.RESET_ALL}")
-        print("[1] Buy supplies")
-        print("[2] Work (Sell supplies)")
-        print("[3] Manage employees")
-        print(f"[4] Purchase Upgrades ({Fore.YELLOW}Business Improvements{Style.RESET_ALL})")
-        print("[5] Manage loans")
-        print("[6] Rest")
-        print("[7] Save game")
-        print("[8] Quit")
-        print(f"[9] Research & Development ({Fore.MAGENTA}New Technologies{Style.RESET_ALL})")
+        self.screen.frame_line(f"\n{Fore.CYAN}Actions:{Style.RESET_ALL}")
+        self.screen.frame_line("[1] Buy supplies")
+        self.screen.frame_line("[2] Work (Sell supplies)")
+        self.screen.frame_line("[3] Manage employees")
+        self.screen.frame_line(f"[4] Purchase Upgrades ({Fore.YELLOW}Business Improvements{Style.RESET_ALL})")
+        self.screen.frame_line("[5] Manage loans")
+        self.screen.frame_line("[6] Rest")
+        self.screen.frame_line("[7] Save game")
+        self.screen.frame_line("[8] Quit")
+        self.screen.frame_line(f"[9] Research & Development ({Fore.MAGENTA}New Technologies{Style.RESET_ALL})")
+        self.screen.frame_line("[10] Wait several days")
+        self.screen.frame_line("[11] Bulk work order (use many supplies today)")
+        self.screen.frame_line("[12] Branches")
+        self.screen.frame_line("[13] Undo last day's action")
+        self.screen.frame_line("[14] Redo")
     
     def display_game_over(self, game_state: Any, is_win: bool) -> None:
         """Display game over screen."""
         if is_win:
-            print(f"\n{Fore.GREEN}" + self.figlet_format("You Won!", font="slant"))
-            print(f"Congratulations! You've reached ${game_state.money} in {game_state.day} days!{Style.RESET_ALL}")
+            self.screen.write(f"\n{Fore.GREEN}" + self.figlet_format("You Won!", font="slant"))
+            self.screen.write(f"Congratulations! You've reached ${game_state.money} in {game_state.day} days!{Style.RESET_ALL}")
         else:
-            print(f"\n{Fore.RED}" + self.figlet_format("Game Over", font="slant"))
-            print(f"Your reputation hit zero. Better luck next time!{Style.RESET_ALL}")
+            self.screen.write(f"\n{Fore.RED}" + self.figlet_format("Game Over", font="slant"))
+            self.screen.write(f"Your reputation hit zero. Better luck next time!{Style.RESET_ALL}")
+        self.screen.flush()
     
     def get_input(self, prompt: str, valid_options: List[str] = None) -> str:
         """Get user input with validation."""
         while True:
-            user_input = input(prompt).lower()
+            self.screen.flush(prompt)
+            user_input = input().lower()
             if valid_options is None or user_input in valid_options:
                 return user_input
-            print(f"\n{Fore.RED}Invalid input. Please try again.{Style.RESET_ALL}")
+            self.screen.write(f"\n{Fore.RED}Invalid input. Please try again.{Style.RESET_ALL}")
     
     def get_number_input(self, prompt: str, min_val: int = 0, max_val: int = 1000, allow_max_str: bool = False) -> Any:
         """Get numeric input with range validation, optionally allowing 'max' string."""
         while True:
-            user_input = input(prompt).lower()
+            self.screen.flush(prompt)
+            user_input = input().lower()
             if allow_max_str and user_input == "max":
                 return "max"
             try:
                 value = int(user_input)
                 if min_val <= value <= max_val:
                     return value
-                print(f"\n{Fore.RED}Please enter a number between {min_val} and {max_val} (or 'max').{Style.RESET_ALL}")
+                self.screen.write(f"\n{Fore.RED}Please enter a number between {min_val} and {max_val} (or 'max').{Style.RESET_ALL}")
             except ValueError:
-                print(f"\n{Fore.RED}Please enter a valid number (or 'max').{Style.RESET_ALL}")
+                self.screen.write(f"\n{Fore.RED}Please enter a valid number (or 'max').{Style.RESET_ALL}")
     
-    def show_message(self, message: str, message_type: str = "info") -> None:
+    def pause(self, seconds: float) -> None:
+        """Write out what the player should be reading, then wait."""
+        self.screen.flush()
+        sleep(seconds)
+
+    def show_message(self, message: str, message_type: str = "info", delay: float = 0.0) -> None:
         """Show a message to the user."""
-        if message_type == "success":
-            print(f"\n{Fore.GREEN}{message}{Style.RESET_ALL}")
-        elif message_type == "error":
-            print(f"\n{Fore.RED}{message}{Style.RESET_ALL}")
-        elif message_type == "warning":
-            print(f"\n{Fore.YELLOW}{message}{Style.RESET_ALL}")
-        else:
-            print(f"\n{message}")
+        self.screen.write("\n" + self._colored(message, message_type))
+        if delay > 0:
+            self.pause(delay)
     
     def display_buy_supplies_menu(self, game_state: Any) -> None:
         """Display menu for buying supplies."""
-        print("\nAvailable supplies:")
+        self.screen.write("\nAvailable supplies:")
         for idx, key in enumerate(config.SUPPLY_PRICES.keys()):
             name = key.replace('_',' ').title()
             price = config.SUPPLY_PRICES[key]
-            print(f"[{idx+1}] {name} (${price})")
-        print(f"[{len(config.SUPPLY_PRICES) + 1}] Back")
-        print(f"{Fore.YELLOW}Hint: When asked for amount, you can type 'max' to buy the maximum possible.{Style.RESET_ALL}")
+            self.screen.write(f"[{idx+1}] {name} (${price})")
+        self.screen.write(f"[{len(config.SUPPLY_PRICES) + 1}] Back")
+        self.screen.write(f"{Fore.YELLOW}Hint: When asked for amount, you can type 'max' to buy the maximum possible.{Style.RESET_ALL}")
     
     def display_employee_menu(self, game_state: Any) -> None:
         """Display employee management menu."""
-        print("\nEmployee Management:")
-        print(f"Current employees: {len(game_state.employees)}/{config.MAX_EMPLOYEES}")
-        print(f"[1] Hire employee (${config.EMPLOYEE_HIRE_COST if config.EMPLOYEE_HIRE_COST > 0 else 'Free'}, Salary: ${config.EMPLOYEE_DAILY_SALARY}/day)")
-        print("[2] Fire employee")
-        print("[3] Back to main menu")
+        self.screen.write("\nEmployee Management:")
+        staff = game_state.employees.summary()
+        self.screen.write(f"Current employees: {staff['count']}/{config.MAX_EMPLOYEES}")
+        if staff['count'] > 0:
+            self.screen.write(f"Daily payroll: ${staff['daily_payroll']} | Avg skill: {staff['average_skill']:.2f} | Avg morale: {staff['average_morale']:.2f}")
+        self.screen.write(f"[1] Hire employee (${config.EMPLOYEE_HIRE_COST if config.EMPLOYEE_HIRE_COST > 0 else 'Free'}, Salary: ${config.EMPLOYEE_DAILY_SALARY}/day)")
+        self.screen.write("[2] Fire employee")
+        self.screen.write("[3] Back to main menu")
     
+    def display_branch_menu(self, game_state: Any) -> None:
+        """Display company branch totals (maintained incrementally, so no per-branch walk)."""
+        company = game_state.company
+        totals = company.totals
+        self.screen.write("\nBranch Management:")
+        self.screen.write(f"Branches: {len(company)}")
+        if len(company) > 0:
+            self.screen.write(f"Stock across branches: {totals['units']}/{totals['storage_capacity']} | Staff: {totals['employees']} (payroll ${totals['payroll']}/day)")
+            self.screen.write(f"Average branch reputation: {company.reputation:.0f} | Lifetime branch net: ${totals['lifetime_net']}")
+        self.screen.write(f"[1] Open a new branch (${config.BRANCH_OPEN_COST})")
+        self.screen.write("[2] Back to main menu")
+
     def display_upgrade_menu(self, game_state: Any) -> Optional[str]:
         """Display upgrade options and return player's choice (upgrade key) or None if back."""
-        print(f"\n{Fore.CYAN}=== Business Upgrades ==={Style.RESET_ALL}")
+        self.screen.write(f"\n{Fore.CYAN}=== Business Upgrades ==={Style.RESET_ALL}")
         options = {}
         idx = 1
         # Create a list of keys to ensure order for selection
@@ -208,11 +294,11 @@ class CLIView(View):
                     status_str = f"(Lvl {current_level_or_status}/{spec['max_level']})"
                     cost_str = f"(${spec['cost_per_level']} for Lvl {current_level_or_status+1})"
 
-            print(f"[{idx}] {spec['name']} {cost_str} - {spec['description']} {status_str}")
+            self.screen.write(f"[{idx}] {spec['name']} {cost_str} - {spec['description']} {status_str}")
             options[str(idx)] = key
             idx += 1
         
-        print(f"[{idx}] Back to main menu")
+        self.screen.write(f"[{idx}] Back to main menu")
         options[str(idx)] = None # For going back
         
         valid_choices = list(options.keys())
@@ -221,46 +307,74 @@ class CLIView(View):
     
     def display_loan_menu(self, game_state: Any) -> None:
         """Display loan management menu."""
-        print("\nLoan Management:")
-        print(f"Current loan: ${game_state.loan}")
-        print(f"Annual interest rate: {game_state.loan_interest * 100}%")
-        print(f"Daily interest rate: {game_state.loan_interest / 365:.6f}%")
+        self.screen.write("\nLoan Management:")
+        self.screen.write(f"Current loan: ${game_state.loan}")
+        self.screen.write(f"Annual interest rate: {game_state.loan_interest * 100:.1f}% (credit line)")
+        self.screen.write(f"Daily interest rate: {game_state.loan_interest / 365:.6f}%")
         
         if game_state.loan > 0:
-            daily_interest = int(game_state.loan * game_state.loan_interest / 365)
-            print(f"Daily interest cost: ${daily_interest}")
+            self.screen.write(f"Daily interest cost: ${game_state.loans.daily_interest()}")
+            active_ids = game_state.loans.active_loan_ids()
+            for loan_id in active_ids[:5]:
+                product = config.LOAN_PRODUCTS[game_state.loans.product(loan_id)]
+                due_day = game_state.loans.next_due_day(loan_id, game_state.day)
+                due_str = f", next payment ${game_state.loans.payment_due(loan_id, due_day)} on day {due_day}" if due_day else ""
+                self.screen.write(f"  - {product['name']}: ${game_state.loans.outstanding(loan_id)} at {game_state.loans.annual_rate(loan_id) * 100:.1f}%{due_str}")
+            if len(active_ids) > 5:
+                self.screen.write(f"  ... and {len(active_ids) - 5} more")
         
-        print("[1] Take loan")
-        print("[2] Repay loan")
-        print("[3] Back to main menu")
+        self.screen.write("[1] Take loan")
+        self.screen.write("[2] Repay loan")
+        self.screen.write("[3] Back to main menu")
         
         # Display recommended loan amount
         income_potential = game_state.get_income_potential()
         if income_potential > 0:
             safe_max_loan = game_state.get_safe_loan_amount()
-            if safe_max_loan < (1000 - game_state.loan):
-                print(f"\n{Fore.YELLOW}Recommended maximum loan: ${safe_max_loan} (based on income){Style.RESET_ALL}")
+            if safe_max_loan < (config.MAX_LOAN_TOTAL - game_state.loan):
+                self.screen.write(f"\n{Fore.YELLOW}Recommended maximum loan: ${safe_max_loan} (based on income){Style.RESET_ALL}")
+
+    def display_loan_products(self) -> Optional[str]:
+        """Display loan products and return the chosen product key, or None to go back."""
+        self.screen.write(f"\n{Fore.CYAN}=== Loan Products ==={Style.RESET_ALL}")
+        options = {}
+        idx = 1
+        for key, product in config.LOAN_PRODUCTS.items():
+            self.screen.write(f"[{idx}] {product['name']} ({product_rate(key) * 100:.1f}% annual) - {product['description']}")
+            options[str(idx)] = key
+            idx += 1
+
+        self.screen.write(f"[{idx}] Back")
+        options[str(idx)] = None
+
+        choice_num = self.get_input("Choose a loan type: ", list(options.keys()))
+        return options[choice_num]
     
-    def display_market_message(self, message: str) -> None:
+    def display_market_message(self, message: str, message_type: str = "info") -> None:
         """Display market trend message."""
-        # Colorama codes are now expected to be part of the message from EventManager
-        print(message)
+        self.screen.write(self._colored(message, message_type))
+
+    @staticmethod
+    def _colored(message: str, message_type: str) -> str:
+        """Color a plain model message for the terminal. Only messages that are shown get formatted."""
+        color = MESSAGE_COLORS.get(message_type)
+        return f"{color}{message}{Style.RESET_ALL}" if color else message
 
     def display_research_menu(self, research_projects: Dict[str, Any], 
                               completed_research: List[str], 
                               active_project_key: Optional[str],
                               active_project_progress: int) -> Optional[str]:
         """Display research options and get player's choice."""
-        print(f"\n{Fore.CYAN}=== Research & Development ==={Style.RESET_ALL}")
+        self.screen.write(f"\n{Fore.CYAN}=== Research & Development ==={Style.RESET_ALL}")
         research_projects_config = config.RESEARCH_PROJECTS_SPECS
         if active_project_key and active_project_key in research_projects_config:
             active_project = research_projects_config[active_project_key]
             progress_percent = (active_project_progress / active_project['duration']) * 100 if active_project['duration'] > 0 else 0
-            print(f"{Fore.YELLOW}Active Research: {active_project['name']} ({active_project_progress}/{active_project['duration']} days - {progress_percent:.0f}%){Style.RESET_ALL}")
+            self.screen.write(f"{Fore.YELLOW}Active Research: {active_project['name']} ({active_project_progress}/{active_project['duration']} days - {progress_percent:.0f}%){Style.RESET_ALL}")
         else:
-            print(f"{Fore.YELLOW}No active research project.{Style.RESET_ALL}")
+            self.screen.write(f"{Fore.YELLOW}No active research project.{Style.RESET_ALL}")
         
-        print("\nAvailable Projects:")
+        self.screen.write("\nAvailable Projects:")
         options = {}
         option_idx = 1
         for key, project in research_projects_config.items():
@@ -272,13 +386,13 @@ class CLIView(View):
             else:
                 status = f"(Cost: ${project['cost']}, Duration: {project['duration']} days)"
             
-            print(f"[{option_idx}] {project['name']} {status}")
+            self.screen.write(f"[{option_idx}] {project['name']} {status}")
             if project.get('description'):
-                 print(f"    {Fore.CYAN}└─ {project['description']}{Style.RESET_ALL}")
+                 self.screen.write(f"    {Fore.CYAN}└─ {project['description']}{Style.RESET_ALL}")
             options[str(option_idx)] = key
             option_idx += 1
         
-        print(f"[{option_idx}] Back to main menu")
+        self.screen.write(f"[{option_idx}] Back to main menu")
         options[str(option_idx)] = None 
         valid_choices = list(options.keys())
         choice = self.get_input("Choose research project or go back: ", valid_choices)
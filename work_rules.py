@@ -0,0 +1,59 @@
+"""
+work_rules.py
+
+Rules for working through supply units, shared by the main location and branches.
+
+work_units() is the one place that turns a number of supply units into
+income, cost of goods and reputation loss: every unit gets its own income
+roll scaled by the given factors and by the multiplier of the supply it
+uses, supplies are consumed in SUPPLY_CONSUMPTION_ORDER, and the per-unit
+reputation loss (at least 1 after the marketing reduction) is summed and
+scaled by WORK_BATCH_REPUTATION_FACTOR. GameState.work_batch and
+company.tick_branch both call it, so the two cannot drift apart.
+"""
+
+from typing import Dict, Any, Sequence
+import numpy as np
+import config
+from inventory import LotInventory
+
+
+def marketing_reduction(marketing_level: int) -> int:
+    """Per-unit reputation loss removed by the marketing upgrade at `marketing_level`."""
+    return marketing_level * config.UPGRADE_SPECS["marketing"]["rep_loss_reduction_per_level"]
+
+
+def work_units(inventory: LotInventory, units: int, income_factors: Sequence[float], rep_loss_reduction: int,
+               rng: np.random.Generator) -> Dict[str, Any]:
+    """
+    Work through up to `units` supplies from `inventory` in one vectorized pass.
+    Returns the units worked, income, cogs, reputation loss and the supplies used per type.
+    """
+    base_incomes = rng.integers(config.BASE_WORK_INCOME_MIN, config.BASE_WORK_INCOME_MAX, size=units, endpoint=True)
+    scaled = base_incomes
+    for factor in income_factors:
+        scaled = scaled * factor
+    unit_incomes = scaled.astype(np.int64)
+
+    cogs = 0
+    supplies_used: Dict[str, int] = {}
+    multipliers = []
+    counts = []
+    remaining = units
+    for supply_type in config.SUPPLY_CONSUMPTION_ORDER:
+        used = min(remaining, inventory.get(supply_type, 0))
+        if used <= 0:
+            continue
+        cogs += inventory.consume(supply_type, used)
+        supplies_used[supply_type] = used
+        multipliers.append(config.SUPPLY_USAGE_EFFECTS[supply_type]["income_multiplier"])
+        counts.append(used)
+        remaining -= used
+        if remaining == 0:
+            break
+    units -= remaining
+    income = int((unit_incomes[:units] * np.repeat(multipliers, counts)).astype(np.int64).sum())
+
+    rep_rolls = rng.integers(config.REPUTATION_LOSS_WORK_MIN, config.REPUTATION_LOSS_WORK_MAX, size=units, endpoint=True)
+    rep_loss = max(1, round(int(np.maximum(1, rep_rolls - rep_loss_reduction).sum()) * config.WORK_BATCH_REPUTATION_FACTOR))
+    return {"units": units, "income": income, "cogs": cogs, "reputation_loss": rep_loss, "supplies_used": supplies_used}
@@ -0,0 +1,143 @@
+"""
+workforce.py
+
+Array-backed employee roster used by GameState.
+
+Each employee is one slot in a set of parallel NumPy arrays (id, salary,
+skill, morale and per-employee event state). Hiring appends to the end and
+firing swaps the last slot into the hole, so both are O(1). Daily payroll and
+productivity are computed in one vectorized pass over the active slots and
+cached until the roster changes, so views can show summaries of a large
+workforce without iterating over employees.
+"""
+
+import random
+from typing import Dict, Any, List, Optional
+import numpy as np
+import config
+
+
+class Workforce:
+    """Parallel arrays of employees with swap-remove hiring and firing."""
+
+    def __init__(self, capacity: int = 8):
+        self.count = 0
+        self._allocate(capacity)
+        self._summary: Optional[Dict[str, Any]] = None
+
+    def _allocate(self, capacity: int) -> None:
+        count = self.count
+        def grow(old: Optional[np.ndarray], dtype: Any, fill: Any = 0) -> np.ndarray:
+            arr = np.full(capacity, fill, dtype=dtype)
+            if old is not None:
+                arr[:count] = old[:count]
+            return arr
+        self.ids = grow(getattr(self, "ids", None), np.int64)
+        self.salary = grow(getattr(self, "salary", None), np.int64)
+        self.skill = grow(getattr(self, "skill", None), np.float64)
+        self.morale = grow(getattr(self, "morale", None), np.float64)
+        self.event_modifier = grow(getattr(self, "event_modifier", None), np.float64, 1.0)
+        self.event_end_day = grow(getattr(self, "event_end_day", None), np.int64, -1) # -1 = no event
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    def hire(self, salary: Optional[int] = None, skill: Optional[float] = None, morale: Optional[float] = None,
+             employee_id: Optional[int] = None) -> int:
+        """Add an employee and return their slot index."""
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        if skill is None:
+            spread = config.EMPLOYEE_SKILL_SPREAD
+            skill = config.EMPLOYEE_BASE_SKILL + (random.uniform(-spread, spread) if spread > 0 else 0.0)
+        slot = self.count
+        self.ids[slot] = employee_id if employee_id is not None else random.randint(1000, 9999)
+        self.salary[slot] = salary if salary is not None else config.EMPLOYEE_DAILY_SALARY
+        self.skill[slot] = skill
+        self.morale[slot] = morale if morale is not None else config.EMPLOYEE_BASE_MORALE
+        self.event_modifier[slot] = 1.0
+        self.event_end_day[slot] = -1
+        self.count += 1
+        self._summary = None
+        return slot
+
+    def fire(self, slot: Optional[int] = None) -> bool:
+        """Remove the employee in `slot` (the last slot if omitted) by swapping the last employee into it."""
+        if self.count == 0:
+            return False
+        last = self.count - 1
+        slot = last if slot is None else slot
+        if not 0 <= slot <= last:
+            return False
+        if slot != last:
+            for arr in (self.ids, self.salary, self.skill, self.morale, self.event_modifier, self.event_end_day):
+                arr[slot] = arr[last]
+        self.count = last
+        self._summary = None
+        return True
+
+    # --- Per-employee events ---
+    def apply_event(self, slots: Any, modifier: float, end_day: int) -> None:
+        """Give the employees in `slots` a productivity modifier until end_day."""
+        self.event_modifier[slots] = modifier
+        self.event_end_day[slots] = end_day
+        self._summary = None
+
+    def expire_events(self, day: int) -> int:
+        """Clear every employee event that has ended by `day`; returns how many expired."""
+        n = self.count
+        ended = (self.event_end_day[:n] >= 0) & (self.event_end_day[:n] <= day)
+        expired = int(ended.sum())
+        if expired:
+            self.event_modifier[:n][ended] = 1.0
+            self.event_end_day[:n][ended] = -1
+            self._summary = None
+        return expired
+
+    # --- Aggregates ---
+    def summary(self) -> Dict[str, Any]:
+        """Headcount, payroll and productivity for the whole workforce, cached until the roster changes."""
+        if self._summary is None:
+            n = self.count
+            output = self.skill[:n] * self.morale[:n] * self.event_modifier[:n]
+            self._summary = {
+                "count": n,
+                "daily_payroll": int(self.salary[:n].sum()),
+                "productivity": float(output.sum()), # Effective headcount; 1.0 per default employee
+                "average_skill": float(self.skill[:n].mean()) if n else 0.0,
+                "average_morale": float(self.morale[:n].mean()) if n else 0.0,
+                "on_event": int((self.event_end_day[:n] >= 0).sum()),
+                "average_event_modifier": float(self.event_modifier[:n].mean()) if n else 1.0,
+                "last_event_end_day": int(self.event_end_day[:n].max()) if n else -1,
+            }
+        return self._summary
+
+    def daily_payroll(self) -> int:
+        return self.summary()["daily_payroll"]
+
+    def productivity(self) -> float:
+        return self.summary()["productivity"]
+
+    # --- Persistence ---
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [
+            {"id": int(self.ids[i]), "salary": int(self.salary[i]), "skill": float(self.skill[i]),
+             "morale": float(self.morale[i]), "event_modifier": float(self.event_modifier[i]),
+             "event_end_day": int(self.event_end_day[i])}
+            for i in range(self.count)
+        ]
+
+    @classmethod
+    def from_list(cls, employees: List[Dict[str, Any]]) -> "Workforce":
+        """Rebuild a workforce from to_list() output or the older list of {"salary", "id"} dicts."""
+        workforce = cls(max(8, len(employees)))
+        for employee in employees:
+            slot = workforce.hire(employee.get("salary"), employee.get("skill", config.EMPLOYEE_BASE_SKILL),
+                                  employee.get("morale"), employee.get("id", 0))
+            workforce.event_modifier[slot] = employee.get("event_modifier", 1.0)
+            workforce.event_end_day[slot] = employee.get("event_end_day", -1)
+        return workforce